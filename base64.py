@@ -1,11 +1,14 @@
+import sys
+from array import array
+
 from binario import (
-    decimal_a_binario,
-    rellenar_a_n_bits,
-    es_binario,
-    dividir_en_bytes,
-    ascii_binario_a_texto,
-    texto_a_ascii_binario
+    bytes_a_binario,
+    binario_a_bytes,
+    bytes_a_texto,
+    texto_a_bytes,
+    limpiar_separadores_binario
 )
+from buffer_salida import BufferSalida, texto_desde, vista_bytes, vista_destino
 
 BASE64_TABLE = (
     "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
@@ -14,101 +17,549 @@ BASE64_TABLE = (
 )
 
 
+# ============================================================
+# Tablas precalculadas (se construyen una sola vez al importar)
+# ============================================================
+
+# código de carácter (0..255) -> índice Base64 (0..63), o -1 si no es válido
+_TABLA_DECODIFICAR = [-1] * 256
+for _i in range(64):
+    _TABLA_DECODIFICAR[ord(BASE64_TABLE[_i])] = _i
+
+# 12 bits (0..4095) -> 2 caracteres Base64
+_PAR_A_CHARS = [BASE64_TABLE[_n >> 6] + BASE64_TABLE[_n & 63] for _n in range(4096)]
+
+# 2 caracteres (códigos c0, c1 leídos como entero de 16 bits c0*256 + c1)
+# -> 12 bits, o -1 si alguno de los dos no es válido
+_CHARS_A_PAR = [-1] * 65536
+for _n in range(4096):
+    _CHARS_A_PAR[(ord(_PAR_A_CHARS[_n][0]) << 8) | ord(_PAR_A_CHARS[_n][1])] = _n
+
+# caracteres aceptados en un texto Base64 (incluye '=')
+_BYTES_BASE64 = (BASE64_TABLE + "=").encode("latin-1")
+
+# array('I') guarda enteros de 32 bits en el orden nativo de la máquina
+_INVERTIR_BYTES = sys.byteorder == "little"
+
+# Los datos se procesan por trozos: las listas intermedias (un entero o un
+# string por grupo) quedan acotadas y la salida se escribe en un buffer
+# reservado con su tamaño final.
+TAM_TROZO_CODIFICAR = 3 * 16 * 1024     # bytes (múltiplo de 3)
+TAM_TROZO_DECODIFICAR = 4 * 16 * 1024   # caracteres (múltiplo de 4)
+
+# espacios/saltos que se ignoran en la entrada (ver limpiar_base64)
+_ESPACIOS = b" \n\t\r"
+
+
 def _base64_indice(caracter):
-    """Busca manualmente el índice de un caracter en BASE64_TABLE."""
-    indice = 0
-    for simbolo in BASE64_TABLE:
-        if simbolo == caracter:
-            return indice
-        indice += 1
-    return -1
-
-
-def _indice_a_6_bits(indice):
-    """Convierte un número (0..63) a binario de 6 bits, manual."""
-    b = decimal_a_binario(indice)
-    return rellenar_a_n_bits(b, 6)
-
-
-def _limpiar_base64(s):
-    """Quita espacios/saltos por si vienen en el input."""
-    limpio = ""
-    for c in s:
-        if c in [' ', '\n', '\t', '\r']:
-            continue
-        limpio += c
-    return limpio
+    """Índice de un caracter en BASE64_TABLE (o -1), con la tabla de 256."""
+    codigo = ord(caracter)
+    if codigo > 255:
+        return -1
+    return _TABLA_DECODIFICAR[codigo]
 
 
-def base64_a_binario(texto_base64):
+def limpiar_base64(s):
     """
-    BASE64 -> BINARIO (de bytes, múltiplo de 8).
-    Maneja padding '=' correctamente.
+    Quita espacios/saltos por si vienen en el input.
+    Un buffer (bytes, bytearray, mmap, ...) se lee como texto latin-1.
+    """
+    s = texto_desde(s)
+    return s.replace(' ', '').replace('\n', '').replace('\t', '').replace('\r', '')
 
-    Devuelve un string binario concatenado.
+
+def _grupos_a_enteros(datos):
     """
-    s = _limpiar_base64(texto_base64)
+    Bytes (longitud múltiplo de 3) -> lista de enteros de 24 bits.
+    Se intercala un byte 0 cada 3 para leerlos de golpe como enteros de 32 bits.
+    """
+    n_grupos = len(datos) // 3
+    ancho = bytearray(4 * n_grupos)
+    ancho[1::4] = datos[0::3]
+    ancho[2::4] = datos[1::3]
+    ancho[3::4] = datos[2::3]
+
+    valores = array("I")
+    valores.frombytes(ancho)
+    if _INVERTIR_BYTES:
+        valores.byteswap()
+    return valores
+
+
+def _enteros_a_grupos(valores):
+    """Lista de enteros de 24 bits -> bytearray (3 bytes por entero)."""
+    valores = array("I", valores)
+    if _INVERTIR_BYTES:
+        valores.byteswap()
+
+    ancho = bytearray(valores.tobytes())
+    # quitar el byte alto (siempre 0) de cada entero de 32 bits
+    del ancho[0::4]
+    return ancho
+
 
-    if len(s) == 0:
+def _error_caracter_invalido(s):
+    """Busca el primer carácter fuera de la tabla y lanza el error."""
+    for c in texto_desde(s):
+        if c != "=" and _base64_indice(c) == -1:
+            raise ValueError(f"Carácter Base64 inválido: {c}")
+    raise ValueError("Base64 inválido")
+
+
+# ============================================================
+# Motor: bytes <-> Base64 por grupos de 24 bits
+# ============================================================
+
+def bytes_a_base64(datos):
+    """
+    bytes -> BASE64.
+    Acepta cualquier buffer (bytes, bytearray, memoryview, mmap) sin copiarlo.
+    Cada grupo de 3 bytes (24 bits) se convierte en un paso:
+    dos consultas a la tabla de pares (12 bits -> 2 caracteres).
+    """
+    vista = vista_bytes(datos)
+    n = len(vista)
+    if n == 0:
         return ""
 
-    if len(s) % 4 != 0:
+    salida = BufferSalida(4 * ((n + 2) // 3))
+    for trozo in _codificar_trozos(vista):
+        salida.escribir(trozo)
+    return salida.texto()
+
+
+def bytes_a_base64_into(destino, datos):
+    """
+    Igual que bytes_a_base64, pero escribe los caracteres (como bytes ASCII)
+    en destino, un bytearray/memoryview/mmap reservado por quien llama.
+    Retorna los bytes escritos: 4 * ceil(len(datos) / 3).
+    """
+    vista = vista_bytes(datos)
+    n_salida = 4 * ((len(vista) + 2) // 3)
+    salida = vista_destino(destino, n_salida)
+
+    pos = 0
+    for trozo in _codificar_trozos(vista):
+        salida[pos:pos + len(trozo)] = trozo
+        pos += len(trozo)
+    return n_salida
+
+
+def _codificar_trozos(vista):
+    """Genera el Base64 de vista (memoryview de bytes) por trozos, como bytes ASCII."""
+    n = len(vista)
+    completos = n - n % 3
+    pares = _PAR_A_CHARS
+
+    for i in range(0, completos, TAM_TROZO_CODIFICAR):
+        grupos = _grupos_a_enteros(vista[i:min(i + TAM_TROZO_CODIFICAR, completos)])
+        trozo = "".join([pares[v >> 12] + pares[v & 4095] for v in grupos])
+        yield trozo.encode("latin-1")
+
+    # último grupo incompleto: rellenar con ceros y aplicar padding
+    # 2 bytes -> 1 '='
+    # 1 byte  -> 2 '='
+    resto = bytes(vista[completos:])
+    if len(resto) == 2:
+        v = (resto[0] << 16) | (resto[1] << 8)
+        yield (pares[v >> 12] + BASE64_TABLE[(v >> 6) & 63] + "=").encode("latin-1")
+    elif len(resto) == 1:
+        v = resto[0] << 16
+        yield (pares[v >> 12] + "==").encode("latin-1")
+
+
+def _decodificar_ultimo_bloque(bloque):
+    """
+    Último bloque de 4 caracteres -> bytes (1, 2 o 3 según padding).
+    '=' se trata como 0 en bits.
+    """
+    # contar padding en este bloque (solo puede ser 0,1,2)
+    pad = bloque.count("=")
+    if pad not in (0, 1, 2):
+        raise ValueError("Base64 inválido: padding incorrecto")
+
+    valor = 0
+    for c in bloque:
+        valor <<= 6
+        if c != "=":
+            idx = _base64_indice(c)
+            if idx == -1:
+                raise ValueError(f"Carácter Base64 inválido: {c}")
+            valor |= idx
+
+    # pad=0 -> 3 bytes, pad=1 -> 2 bytes, pad=2 -> 1 byte
+    return valor.to_bytes(3, "big")[:3 - pad]
+
+
+def base64_a_bytes(texto_base64):
+    """
+    BASE64 (str o buffer de caracteres ASCII) -> bytes.
+    Maneja padding '=' con las mismas validaciones que base64_a_binario.
+    """
+    n_limpio, primer_igual, cola = _medir_base64(texto_base64)
+
+    if n_limpio == 0:
+        return b""
+
+    salida = BufferSalida(_bytes_decodificados(n_limpio, cola))
+    for trozo in _decodificar_trozos(_trozos_limpios(texto_base64), n_limpio, primer_igual):
+        salida.escribir(trozo)
+    return salida.valor()
+
+
+def base64_a_bytes_into(destino, texto_base64):
+    """
+    Igual que base64_a_bytes, pero escribe los bytes en destino, un
+    bytearray/memoryview/mmap reservado por quien llama. Retorna los bytes
+    escritos.
+
+    destino puede ser el mismo buffer que contiene el Base64 (decodificar
+    en sitio): cada trozo se lee antes de escribir su salida, que siempre
+    queda detrás de lo leído. Si hay un carácter inválido, lo ya
+    decodificado queda escrito.
+    """
+    n_limpio, primer_igual, cola = _medir_base64(texto_base64)
+    if n_limpio == 0:
+        return 0
+
+    salida = vista_destino(destino, _bytes_decodificados(n_limpio, cola))
+    pos = 0
+    for trozo in _decodificar_trozos(_trozos_limpios(texto_base64), n_limpio, primer_igual):
+        salida[pos:pos + len(trozo)] = trozo
+        pos += len(trozo)
+    return pos
+
+
+# La entrada se recorre dos veces por trozos, sin copiarla completa ni
+# convertir un buffer a str: la primera pasada mide y valida la estructura
+# (longitud, '=' fuera del último bloque) y la segunda decodifica.
+
+def _trozos_limpios(texto_base64):
+    """
+    La entrada sin espacios/saltos, por trozos: str si es un str, bytes si
+    es un buffer (se lee de a TAM_TROZO_DECODIFICAR bytes).
+    """
+    if isinstance(texto_base64, str):
+        for i in range(0, len(texto_base64), TAM_TROZO_DECODIFICAR):
+            yield limpiar_base64(texto_base64[i:i + TAM_TROZO_DECODIFICAR])
+        return
+
+    vista = vista_bytes(texto_base64)
+    for i in range(0, len(vista), TAM_TROZO_DECODIFICAR):
+        yield bytes(vista[i:i + TAM_TROZO_DECODIFICAR]).translate(None, _ESPACIOS)
+
+
+def _medir_base64(texto_base64):
+    """
+    Primera pasada: (caracteres sin espacios, índice del primer '=' o -1,
+    últimos 4 caracteres como str). Valida que la longitud sea múltiplo de 4.
+    """
+    n_limpio = 0
+    primer_igual = -1
+    cola = ""
+    for trozo in _trozos_limpios(texto_base64):
+        if primer_igual == -1:
+            j = trozo.find("=" if isinstance(trozo, str) else b"=")
+            if j != -1:
+                primer_igual = n_limpio + j
+        n_limpio += len(trozo)
+        cola = (cola + texto_desde(trozo[-4:]))[-4:]
+
+    if n_limpio % 4 != 0:
         raise ValueError("Base64 inválido: la longitud debe ser múltiplo de 4")
+    return n_limpio, primer_igual, cola
+
+
+def _bytes_decodificados(n_limpio, cola):
+    """
+    Tamaño de salida de un Base64 de n_limpio caracteres (múltiplo de 4, no
+    vacío) que termina en cola: 3 bytes por bloque menos el padding (un
+    padding inválido se reporta al decodificar el último bloque).
+    """
+    return n_limpio // 4 * 3 - min(cola[-4:].count("="), 2)
+
+
+def _decodificar_bloques(s):
+    """
+    Base64 ya limpio (str, longitud múltiplo de 4, no vacío) -> bytes.
+    El último bloque es el único que puede llevar '='.
+    """
+    salida = BufferSalida(_bytes_decodificados(len(s), s[-4:]))
+    for trozo in _decodificar_trozos([s], len(s), s.find("=")):
+        salida.escribir(trozo)
+    return salida.valor()
 
-    # Validación básica de '=': solo permitido al final (máximo 2)
-    padding_total = 0
-    if s.endswith("=="):
-        padding_total = 2
-    elif s.endswith("="):
-        padding_total = 1
 
+def _decodificar_trozos(trozos, n_limpio, primer_igual):
+    """
+    Genera los bytes de un Base64 sin espacios que llega en trozos (str o
+    bytes, de cualquier largo) y suma n_limpio caracteres (ver _medir_base64).
+    """
     # Si hay '=', debe estar solo en el último bloque
-    if "=" in s[:-4]:
+    if primer_igual != -1 and primer_igual < n_limpio - 4:
         raise ValueError("Base64 inválido: '=' solo puede aparecer en el último bloque")
 
-    salida = ""
+    restantes = n_limpio - 4   # caracteres del cuerpo aún sin decodificar
+    pendiente = ""
+    for trozo in trozos:
+        pendiente = pendiente + trozo if pendiente else trozo
+        inicio = 0
+        while restantes and len(pendiente) - inicio >= 4:
+            k = min(len(pendiente) - inicio, restantes, TAM_TROZO_DECODIFICAR) // 4 * 4
+            yield _decodificar_cuerpo(pendiente[inicio:inicio + k])
+            inicio += k
+            restantes -= k
+        pendiente = pendiente[inicio:]
+
+    # lo que queda es el último bloque (4 caracteres)
+    yield _decodificar_ultimo_bloque(texto_desde(pendiente))
+
+
+def _decodificar_cuerpo(cuerpo):
+    """
+    Bloques completos sin '=' (str o bytes) -> bytearray.
+    Cada par de caracteres se lee como entero de 16 bits y se traduce a
+    12 bits con la tabla de pares.
+    """
+    crudo = cuerpo
+    if isinstance(cuerpo, str):
+        try:
+            crudo = cuerpo.encode("latin-1")
+        except UnicodeEncodeError:
+            _error_caracter_invalido(cuerpo)
+
+    codigos = array("H")
+    codigos.frombytes(crudo)
+    if _INVERTIR_BYTES:
+        codigos.byteswap()
+
+    mitades = list(map(_CHARS_A_PAR.__getitem__, codigos))
+    if -1 in mitades:
+        _error_caracter_invalido(cuerpo)
 
-    i = 0
-    while i < len(s):
-        bloque = s[i:i+4]
-        i += 4
+    # 2 mitades de 12 bits -> grupo de 24 bits
+    it = iter(mitades)
+    valores = [(alta << 12) | baja for alta, baja in zip(it, it)]
+    return _enteros_a_grupos(valores)
 
-        # contar padding en este bloque (solo puede ser 0,1,2)
-        pad = 0
-        for c in bloque:
-            if c == "=":
-                pad += 1
 
-        if pad not in (0, 1, 2):
-            raise ValueError("Base64 inválido: padding incorrecto")
+# ============================================================
+# Streaming: codificar / decodificar por partes
+# ============================================================
 
-        # convertir 4 chars -> 24 bits (6 bits c/u). '=' se trata como 0 en bits.
-        bits24 = ""
-        for c in bloque:
-            if c == "=":
-                bits24 += "000000"
+TAM_BLOQUE_FLUJO = 3 * 64 * 1024   # múltiplo de 3 para no dejar sobrante
+
+
+class Base64Encoder:
+    """
+    Codificador Base64 incremental.
+    Entre llamadas solo guarda el sobrante (máximo 2 bytes) que no alcanza
+    para un grupo de 3.
+
+    enc = Base64Encoder()
+    salida = enc.update(b"Ho") + enc.update(b"la") + enc.finalize()
+    """
+
+    def __init__(self):
+        self._sobrante = b""
+        self._terminado = False
+
+    def update(self, datos):
+        """Agrega bytes y devuelve el Base64 de los grupos completos."""
+        if self._terminado:
+            raise ValueError("El codificador ya fue finalizado")
+
+        if self._sobrante:
+            datos = self._sobrante + bytes(datos)
+        else:
+            datos = vista_bytes(datos)
+
+        completos = len(datos) - len(datos) % 3
+        self._sobrante = bytes(datos[completos:])
+        return bytes_a_base64(datos[:completos])
+
+    def finalize(self):
+        """Codifica el sobrante con su padding y cierra el codificador."""
+        if self._terminado:
+            raise ValueError("El codificador ya fue finalizado")
+
+        self._terminado = True
+        salida = bytes_a_base64(self._sobrante)
+        self._sobrante = b""
+        return salida
+
+
+class Base64Decoder:
+    """
+    Decodificador Base64 incremental.
+    Entre llamadas solo guarda el sobrante (máximo 3 caracteres) que no
+    alcanza para un bloque de 4. Los espacios/saltos se ignoran aunque
+    caigan entre dos partes.
+
+    Los errores indican la posición global (en caracteres de entrada,
+    contando espacios) donde ocurren.
+    """
+
+    def __init__(self):
+        self._sobrante = ""
+        self._pos_sobrante = []   # posición global de cada carácter sobrante
+        self._leidos = 0          # caracteres de entrada consumidos
+        self._con_padding = False  # ya se decodificó el bloque con '='
+        self._terminado = False
+
+    def _error(self, mensaje, posicion):
+        raise ValueError(f"{mensaje} (posición {posicion})")
+
+    def update(self, texto_base64):
+        """Agrega texto Base64 y devuelve los bytes de los bloques completos."""
+        if self._terminado:
+            raise ValueError("El decodificador ya fue finalizado")
+
+        texto_base64 = texto_desde(texto_base64)
+        base = self._leidos
+        self._leidos += len(texto_base64)
+
+        limpio = limpiar_base64(texto_base64)
+        if not limpio:
+            return b""
+
+        def posicion(i):
+            # índice en sobrante+limpio -> posición global en la entrada
+            if i < len(self._sobrante):
+                return self._pos_sobrante[i]
+            return base + _indice_crudo(texto_base64, i - len(self._sobrante))
+
+        if self._con_padding:
+            self._error("Base64 inválido: '=' solo puede aparecer en el último bloque",
+                        posicion(len(self._sobrante)))
+
+        # validar caracteres apenas llegan
+        invalidos = _caracteres_invalidos(limpio)
+        if invalidos:
+            c = invalidos[0]
+            self._error(f"Carácter Base64 inválido: {c}",
+                        posicion(len(self._sobrante) + limpio.index(c)))
+
+        s = self._sobrante + limpio
+
+        # con '=' el bloque que lo contiene debe ser el último
+        igual = s.find("=")
+        if igual != -1:
+            fin = igual - igual % 4 + 4
+            if len(s) > fin:
+                self._error("Base64 inválido: '=' solo puede aparecer en el último bloque",
+                            posicion(fin))
+            if len(s) < fin:
+                completos = fin - 4
             else:
-                idx = _base64_indice(c)
-                if idx == -1:
-                    raise ValueError(f"Carácter Base64 inválido: {c}")
-                bits24 += _indice_a_6_bits(idx)
+                completos = fin
+                self._con_padding = True
+        else:
+            completos = len(s) - len(s) % 4
+
+        # posiciones del sobrante: los que ya venían de antes conservan la
+        # suya; los nuevos son los últimos caracteres no-espacio de esta parte
+        previos = self._pos_sobrante[completos:]
+        posiciones = previos + [base + j for j in
+                                _indices_finales(texto_base64, len(s) - completos - len(previos))]
+        try:
+            salida = _decodificar_bloques(s[:completos]) if completos else b""
+        except ValueError as e:
+            # solo puede fallar el padding del último bloque
+            self._error(str(e), posicion(completos - 4))
+
+        self._sobrante = s[completos:]
+        self._pos_sobrante = posiciones
+        return salida
+
+    def finalize(self):
+        """Verifica que no quede un bloque incompleto y cierra el decodificador."""
+        if self._terminado:
+            raise ValueError("El decodificador ya fue finalizado")
+
+        self._terminado = True
+        if self._sobrante:
+            self._error("Base64 inválido: la longitud debe ser múltiplo de 4", self._leidos)
+        return b""
+
+
+def _indices_finales(texto, k):
+    """
+    Índices en texto de sus últimos k caracteres que no son espacio/salto,
+    en orden. Recorre desde el final: el costo no depende del largo de texto.
+    """
+    indices = []
+    i = len(texto) - 1
+    while len(indices) < k:
+        if texto[i] not in ' \n\t\r':
+            indices.append(i)
+        i -= 1
+    indices.reverse()
+    return indices
+
+
+def _indice_crudo(texto, indice_limpio):
+    """Índice en texto del carácter número indice_limpio (sin contar espacios/saltos)."""
+    vistos = 0
+    for i, c in enumerate(texto):
+        if c in ' \n\t\r':
+            continue
+        if vistos == indice_limpio:
+            return i
+        vistos += 1
+    return len(texto)
+
 
-        # cortar bits inválidos según padding:
-        # pad=0 -> 24 bits (3 bytes)
-        # pad=1 -> 16 bits (2 bytes)
-        # pad=2 -> 8 bits  (1 byte)
-        if pad == 0:
-            salida += bits24
-        elif pad == 1:
-            salida += bits24[:16]
-        else:  # pad == 2
-            salida += bits24[:8]
+def _caracteres_invalidos(s):
+    """Caracteres de s que no son Base64 ni '=' (vacío si todo es válido)."""
+    try:
+        crudo = s.encode("latin-1")
+    except UnicodeEncodeError:
+        return [c for c in s if ord(c) > 255]
+    sobra = crudo.translate(None, _BYTES_BASE64)
+    return sobra.decode("latin-1")
 
-    # Aseguramos múltiplo de 8 para bytes
-    if len(salida) % 8 != 0:
-        raise ValueError("Error interno: binario resultante no es múltiplo de 8")
 
-    return salida
+def codificar_flujo_base64(entrada, salida, tam_bloque=TAM_BLOQUE_FLUJO):
+    """
+    Lee bytes de entrada (archivo binario, socket.makefile('rb'), ...)
+    y escribe su Base64 en salida (archivo de texto) con memoria constante.
+    """
+    enc = Base64Encoder()
+    while True:
+        datos = entrada.read(tam_bloque)
+        if not datos:
+            break
+        salida.write(enc.update(datos))
+    salida.write(enc.finalize())
+
+
+def decodificar_flujo_base64(entrada, salida, tam_bloque=4 * 64 * 1024):
+    """
+    Lee texto Base64 de entrada y escribe los bytes en salida
+    (archivo binario) con memoria constante.
+    """
+    dec = Base64Decoder()
+    while True:
+        texto = entrada.read(tam_bloque)
+        if not texto:
+            break
+        salida.write(dec.update(texto))
+    dec.finalize()
+
+
+# ============================================================
+# API de strings binarios (adaptadores sobre el motor)
+# ============================================================
+
+def base64_a_binario(texto_base64):
+    """
+    BASE64 -> BINARIO (de bytes, múltiplo de 8).
+    Maneja padding '=' correctamente.
+
+    Devuelve un string binario concatenado.
+    """
+    return bytes_a_binario(base64_a_bytes(texto_base64))
 
 
 def binario_a_base64(binario):
@@ -118,86 +569,31 @@ def binario_a_base64(binario):
     Acepta binario con espacios/saltos; los ignora.
     """
     # limpiar binario (permitir separadores)
-    compacto = ""
-    for c in binario:
-        if c in ['0', '1']:
-            compacto += c
-        elif c in [' ', '\n', '\t', '\r']:
-            continue
-        else:
-            raise ValueError(f"Carácter inválido en binario: {repr(c)}")
+    compacto = limpiar_separadores_binario(binario)
 
     if len(compacto) == 0:
         return ""
 
-    if not es_binario(compacto):
-        raise ValueError("La entrada debe ser binaria (solo 0 y 1)")
-
     if len(compacto) % 8 != 0:
         raise ValueError("La longitud del binario debe ser múltiplo de 8 para convertir a Base64")
 
-    bytes_ = dividir_en_bytes(compacto)
-
-    resultado = ""
-    j = 0
-    while j < len(bytes_):
-        # tomar hasta 3 bytes (24 bits)
-        bloque_bytes = bytes_[j:j+3]
-        j += 3
-
-        n_bytes = len(bloque_bytes)
-        bits24 = "".join(bloque_bytes)
-
-        # si faltan bytes, rellenar con ceros hasta 24 bits
-        if n_bytes < 3:
-            bits24 += "0" * (8 * (3 - n_bytes))
-
-        # 24 bits -> 4 grupos de 6 bits -> índices Base64
-        grupos6 = [bits24[k:k+6] for k in range(0, 24, 6)]
-        indices = []
-        for g in grupos6:
-            # convertir 6-bit binario a decimal manualmente
-            dec = 0
-            pot = 0
-            for bit in reversed(g):
-                if bit == '1':
-                    dec += 2 ** pot
-                pot += 1
-            indices.append(dec)
-
-        # armar 4 caracteres base64
-        chars = ""
-        for idx in indices:
-            chars += BASE64_TABLE[idx]
-
-        # aplicar padding según bytes reales:
-        # 3 bytes -> 0 '='
-        # 2 bytes -> 1 '='
-        # 1 byte  -> 2 '='
-        if n_bytes == 3:
-            resultado += chars
-        elif n_bytes == 2:
-            resultado += chars[:3] + "="
-        else:  # n_bytes == 1
-            resultado += chars[:2] + "=="
-
-    return resultado
-
-
-def base64_a_ascii(texto_base64):
+    return bytes_a_base64(binario_a_bytes(compacto))
+
+
+def base64_a_ascii(texto_base64, estricto=False, codificacion="latin-1"):
     """
     BASE64 -> ASCII pasando por BINARIO (bytes).
+    estricto/codificacion: igual que binario.bytes_a_texto.
     """
-    b = base64_a_binario(texto_base64)
-    return ascii_binario_a_texto(b, acepta_espacios=False)
+    return bytes_a_texto(base64_a_bytes(texto_base64), estricto, codificacion)
 
 
-def ascii_a_base64(texto):
+def ascii_a_base64(texto, estricto=False, codificacion="latin-1"):
     """
     ASCII -> BINARIO -> BASE64 (útil para pruebas / completitud).
+    estricto/codificacion: igual que binario.texto_a_bytes.
     """
-    b = texto_a_ascii_binario(texto)  # binario concatenado
-    return binario_a_base64(b)
+    return bytes_a_base64(texto_a_bytes(texto, estricto, codificacion))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,631 @@
+# benchmarks.py
+# Mediciones de tiempo y memoria pico para las conversiones y cifrados.
+#
+# Uso:
+#   python benchmarks.py                         -> todos los casos, 10 B .. 100 MB
+#   python benchmarks.py --tamanos 10B 1KB 1MB   -> tamaños elegidos a mano
+#   python benchmarks.py --filtro base64         -> solo casos cuyo nombre contiene "base64"
+#   python benchmarks.py --json resultados.json  -> guarda los resultados
+#   python benchmarks.py --baseline base.json    -> compara y marca regresiones
+#   python benchmarks.py --rutas 1 16 128        -> comparaciones lado a lado (MB)
+#   python benchmarks.py --regresion             -> límites de memoria/tiempo con 64 MB
+#
+# Nota: la ruta de strings binarios usa 8 caracteres por byte, así que con
+# 100 MB necesita más de 1 GB de RAM solo para el string intermedio.
+
+import argparse
+import atexit
+import io
+import json
+import math
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+from binario import (
+    texto_a_ascii_binario,
+    ascii_binario_a_texto,
+    texto_a_bytes,
+    bytes_a_texto,
+    bytes_a_binario,
+)
+from base64 import (
+    base64_a_binario,
+    binario_a_base64,
+    base64_a_bytes,
+    bytes_a_base64,
+)
+from xor import xor_binario, xor_bytes
+from stream_cipher_ascii import (
+    generar_llave_dinamica_ascii,
+    KeystreamDinamico,
+    cifrar_ascii_llave_fija_a_base64,
+    descifrar_base64_con_llave_fija,
+    cifrar_ascii_llave_dinamica_a_base64,
+    descifrar_base64_con_llave_dinamica,
+    cifrar_lote_llave_fija_a_base64,
+    descifrar_lote_base64_con_llave_fija,
+    cifrar_lote_llave_dinamica_a_base64,
+    descifrar_lote_base64_con_llave_dinamica,
+    cifrar_ascii_llave_dinamica_a_base64_paralelo,
+    descifrar_base64_con_llave_dinamica_paralelo,
+    descifrar_rango_base64_con_llave_fija,
+    descifrar_rango_base64_con_llave_dinamica,
+)
+from cifrados_historicos import (
+    analisis_frecuencia_archivos,
+    analisis_frecuencia,
+    cesar_cifrar,
+    cesar_descifrar,
+    rot13,
+    vigenere_cifrar,
+    vigenere_descifrar,
+    vigenere_cifrar_flujo,
+    _es_letra_ascii,
+    _es_mayuscula,
+    _letra_a_indice,
+    _indice_a_letra,
+    _mod_26,
+)
+
+MB = 1024 * 1024
+TAMANOS_MB = [1, 16, 128]
+
+
+def generar_texto(n_bytes):
+    """Texto ASCII soportado de exactamente n_bytes caracteres."""
+    base = "Hola Mundo 123! Texto de prueba, con signos; y (parentesis).\n"
+    repeticiones = n_bytes // len(base) + 1
+    return (base * repeticiones)[:n_bytes]
+
+
+def medir(funcion, *args):
+    """
+    Ejecuta funcion(*args) dos veces:
+    - una sin tracemalloc para medir tiempo
+    - otra con tracemalloc para medir memoria pico
+    Retorna (segundos, bytes_pico).
+    """
+    inicio = time.perf_counter()
+    funcion(*args)
+    segundos = time.perf_counter() - inicio
+
+    tracemalloc.start()
+    funcion(*args)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return segundos, pico
+
+
+def imprimir_tabla(titulo, casos, tamanos_mb):
+    """
+    casos: lista de (nombre, preparar, funcion).
+    preparar(n_bytes) construye los argumentos (fuera de la medición).
+    """
+    print("\n" + titulo)
+    print(f"{'Tamaño':>8} | {'Ruta':<14} | {'Tiempo (s)':>10} | {'MB/s':>9} | {'Pico (MB)':>9}")
+    print("-" * 64)
+
+    for tam in tamanos_mb:
+        for nombre, preparar, funcion in casos:
+            args = preparar(int(tam * MB))
+            segundos, pico = medir(funcion, *args)
+            velocidad = tam / segundos if segundos > 0 else float("inf")
+            print(f"{tam:>5} MB | {nombre:<14} | {segundos:10.4f} | {velocidad:9.1f} | {pico / MB:9.1f}")
+
+
+# ============================================================
+# binario.py: strings de bits vs bytes
+# ============================================================
+
+def _ida_y_vuelta_bits(texto):
+    return ascii_binario_a_texto(texto_a_ascii_binario(texto), acepta_espacios=False)
+
+
+def _ida_y_vuelta_bytes(texto):
+    return bytes_a_texto(texto_a_bytes(texto))
+
+
+def benchmark_binario(tamanos_mb):
+    casos = [
+        ("bits", lambda n: (generar_texto(n),), _ida_y_vuelta_bits),
+        ("bytes", lambda n: (generar_texto(n),), _ida_y_vuelta_bytes),
+    ]
+    imprimir_tabla("binario.py: ASCII -> representación -> ASCII", casos, tamanos_mb)
+
+
+# ============================================================
+# base64.py: motor de tablas
+# ============================================================
+
+def benchmark_base64(tamanos_mb):
+    casos = [
+        ("bits->b64", lambda n: (bytes_a_binario(texto_a_bytes(generar_texto(n))),), binario_a_base64),
+        ("b64->bits", lambda n: (bytes_a_base64(texto_a_bytes(generar_texto(n))),), base64_a_binario),
+        ("bytes->b64", lambda n: (texto_a_bytes(generar_texto(n)),), bytes_a_base64),
+        ("b64->bytes", lambda n: (bytes_a_base64(texto_a_bytes(generar_texto(n))),), base64_a_bytes),
+    ]
+    imprimir_tabla("base64.py: codificar / decodificar", casos, tamanos_mb)
+
+
+# ============================================================
+# xor.py: XOR por enteros grandes
+# ============================================================
+
+def benchmark_xor(tamanos_mb):
+    casos = [
+        ("bits repetir", lambda n: (bytes_a_binario(texto_a_bytes(generar_texto(n))), "0100001101001100", "repetir"), xor_binario),
+        ("bytes repetir", lambda n: (texto_a_bytes(generar_texto(n)), b"CLAVE", "repetir"), xor_bytes),
+    ]
+    imprimir_tabla("xor.py: XOR con clave repetida", casos, tamanos_mb)
+
+
+# ============================================================
+# stream_cipher_ascii.py: llave dinámica en paralelo
+# ============================================================
+
+WORKERS_PARALELO = [1, 2, 4, 8]
+
+
+def benchmark_paralelo(tamanos_mb):
+    from concurrent.futures import ProcessPoolExecutor
+
+    # el pico de memoria es solo del proceso principal
+    casos = []
+    for w in WORKERS_PARALELO:
+        casos.append((
+            f"workers={w}",
+            lambda n: (generar_texto(n), "MASTERKEY", "0001"),
+            lambda m, k, nonce, w=w: cifrar_ascii_llave_dinamica_a_base64_paralelo(m, k, nonce, workers=w),
+        ))
+
+    # pool=N: un solo pool para toda la tabla (sin el arranque de procesos)
+    with ProcessPoolExecutor(max_workers=max(WORKERS_PARALELO)) as pool:
+        casos.append((
+            f"pool={max(WORKERS_PARALELO)}",
+            lambda n: (generar_texto(n), "MASTERKEY", "0001"),
+            lambda m, k, nonce: cifrar_ascii_llave_dinamica_a_base64_paralelo(m, k, nonce, executor=pool),
+        ))
+        imprimir_tabla("stream_cipher_ascii.py: llave dinámica en paralelo", casos, tamanos_mb)
+
+
+# ============================================================
+# cifrados_historicos.py: frecuencias en paralelo sobre archivos
+# ============================================================
+
+def _corpus_temporal(n_bytes, _cache={}):
+    """Crea (una vez por tamaño) un directorio con 8 archivos de texto."""
+    if n_bytes not in _cache:
+        directorio = tempfile.mkdtemp(prefix="corpus_")
+        atexit.register(shutil.rmtree, directorio, True)
+        rutas = []
+        for i in range(8):
+            ruta = os.path.join(directorio, f"parte_{i}.txt")
+            with open(ruta, "w") as f:
+                f.write(generar_texto(n_bytes // 8))
+            rutas.append(ruta)
+        _cache[n_bytes] = rutas
+    return _cache[n_bytes]
+
+
+def benchmark_frecuencia_paralela(tamanos_mb):
+    casos = []
+    for w in WORKERS_PARALELO:
+        casos.append((
+            f"workers={w}",
+            lambda n: (_corpus_temporal(n),),
+            lambda rutas, w=w: analisis_frecuencia_archivos(rutas, workers=w, tam_shard=4 * MB),
+        ))
+    imprimir_tabla("cifrados_historicos.py: análisis de frecuencia en paralelo", casos, tamanos_mb)
+
+
+# ============================================================
+# cifrados_historicos.py: costo por carácter (microbenchmarks)
+# ============================================================
+
+MUESTRA_LETRAS = "Hola Mundo, ABC xyz 123!\n"
+
+
+def _ns_por_caracter(funcion, texto, repeticiones):
+    """Mejor de 3 corridas de funcion(texto) x repeticiones, en ns por carácter."""
+    mejor = min(timeit.repeat(lambda: funcion(texto), number=repeticiones, repeat=3))
+    return mejor * 1e9 / (repeticiones * len(texto))
+
+
+def benchmark_letras():
+    print("\ncifrados_historicos.py: costo por carácter")
+    print(f"{'Función':<24} | {'ns/carácter':>11}")
+    print("-" * 38)
+
+    # helpers: una llamada por carácter de la muestra
+    helpers = [
+        ("_es_letra_ascii", lambda t: [_es_letra_ascii(c) for c in t]),
+        ("_es_mayuscula", lambda t: [_es_mayuscula(c) for c in t]),
+        ("_letra_a_indice", lambda t: [_letra_a_indice(c) for c in t if _es_letra_ascii(c)]),
+        ("_indice_a_letra", lambda t: [_indice_a_letra(i % 26, i % 2 == 0) for i in range(len(t))]),
+        ("_mod_26", lambda t: [_mod_26(i - 40) for i in range(len(t))]),
+    ]
+    for nombre, funcion in helpers:
+        print(f"{nombre:<24} | {_ns_por_caracter(funcion, MUESTRA_LETRAS, 20000):11.1f}")
+
+    # cifrados completos sobre 1 MB de texto
+    texto = generar_texto(MB)
+    cifrados = [
+        ("cesar_cifrar", lambda t: cesar_cifrar(t, 3)),
+        ("rot13", rot13),
+        ("vigenere_cifrar", lambda t: vigenere_cifrar(t, "CLAVE")),
+        ("vigenere_descifrar", lambda t: vigenere_descifrar(t, "CLAVE")),
+        ("analisis_frecuencia", analisis_frecuencia),
+    ]
+    for nombre, funcion in cifrados:
+        print(f"{nombre:<24} | {_ns_por_caracter(funcion, texto, 1):11.1f}")
+
+
+# ============================================================
+# Harness: todos los puntos de entrada, JSON y baseline
+# ============================================================
+
+TAMANOS_HARNESS = ["10B", "1KB", "100KB", "1MB", "10MB", "100MB"]
+
+# tiempo aproximado por caso y tamaño para juntar muestras de latencia
+PRESUPUESTO_SEGUNDOS = 1.0
+MIN_REPETICIONES = 3
+MAX_REPETICIONES = 1000
+
+# una regresión es un caso más de UMBRAL_REGRESION veces peor que el baseline
+UMBRAL_REGRESION = 0.10
+
+LLAVE = "CLAVE"
+CLAVE_MAESTRA = "MASTERKEY"
+NONCE = "0001"
+TAM_MENSAJE_LOTE = 64
+
+
+def parsear_tamano(texto):
+    """'10B', '1KB', '100MB' -> bytes."""
+    texto = texto.strip().upper()
+    for sufijo, factor in [("MB", MB), ("KB", 1024), ("B", 1)]:
+        if texto.endswith(sufijo):
+            return int(float(texto[:-len(sufijo)]) * factor)
+    return int(texto)
+
+
+def formatear_tamano(n_bytes):
+    if n_bytes >= MB and n_bytes % MB == 0:
+        return f"{n_bytes // MB}MB"
+    if n_bytes >= 1024 and n_bytes % 1024 == 0:
+        return f"{n_bytes // 1024}KB"
+    return f"{n_bytes}B"
+
+
+def _bits(n):
+    return bytes_a_binario(texto_a_bytes(generar_texto(n)))
+
+
+def _mensajes_lote(n):
+    texto = generar_texto(n)
+    return [texto[i:i + TAM_MENSAJE_LOTE] for i in range(0, len(texto), TAM_MENSAJE_LOTE)]
+
+
+def _nonces_lote(n):
+    return [str(i) for i in range(len(_mensajes_lote(n)))]
+
+
+def _vigenere_flujo(texto):
+    vigenere_cifrar_flujo(io.StringIO(texto), io.StringIO(), LLAVE)
+
+
+# (nombre, preparar(n) -> args, funcion). Los datos se preparan fuera de la medición.
+CASOS = [
+    # binario.py
+    ("binario.texto_a_ascii_binario", lambda n: (generar_texto(n),), texto_a_ascii_binario),
+    ("binario.ascii_binario_a_texto", lambda n: (_bits(n),), ascii_binario_a_texto),
+    # base64.py
+    ("base64.binario_a_base64", lambda n: (_bits(n),), binario_a_base64),
+    ("base64.base64_a_binario", lambda n: (bytes_a_base64(texto_a_bytes(generar_texto(n))),), base64_a_binario),
+    # xor.py
+    ("xor.xor_binario", lambda n: (_bits(n), "0100001101001100", "repetir"), xor_binario),
+    # stream_cipher_ascii.py
+    ("stream.generar_llave_dinamica_ascii", lambda n: (max(n, 1), CLAVE_MAESTRA, NONCE), generar_llave_dinamica_ascii),
+    ("stream.keystream_slice", lambda n: (KeystreamDinamico(CLAVE_MAESTRA, NONCE), n),
+     lambda ks, n: ks[10**9:10**9 + n]),
+    ("stream.cifrar_llave_fija", lambda n: (generar_texto(n), LLAVE), cifrar_ascii_llave_fija_a_base64),
+    ("stream.descifrar_llave_fija",
+     lambda n: (cifrar_ascii_llave_fija_a_base64(generar_texto(n), LLAVE), LLAVE),
+     descifrar_base64_con_llave_fija),
+    ("stream.cifrar_llave_dinamica", lambda n: (generar_texto(n), CLAVE_MAESTRA, NONCE),
+     cifrar_ascii_llave_dinamica_a_base64),
+    ("stream.descifrar_llave_dinamica",
+     lambda n: (cifrar_ascii_llave_dinamica_a_base64(generar_texto(n), CLAVE_MAESTRA, NONCE), CLAVE_MAESTRA, NONCE),
+     descifrar_base64_con_llave_dinamica),
+    ("stream.cifrar_lote_llave_fija", lambda n: (_mensajes_lote(n), LLAVE), cifrar_lote_llave_fija_a_base64),
+    ("stream.descifrar_lote_llave_fija",
+     lambda n: (cifrar_lote_llave_fija_a_base64(_mensajes_lote(n), LLAVE), LLAVE),
+     descifrar_lote_base64_con_llave_fija),
+    ("stream.cifrar_lote_llave_dinamica", lambda n: (_mensajes_lote(n), CLAVE_MAESTRA, _nonces_lote(n)),
+     cifrar_lote_llave_dinamica_a_base64),
+    ("stream.descifrar_lote_llave_dinamica",
+     lambda n: (cifrar_lote_llave_dinamica_a_base64(_mensajes_lote(n), CLAVE_MAESTRA, _nonces_lote(n)),
+                CLAVE_MAESTRA, _nonces_lote(n)),
+     descifrar_lote_base64_con_llave_dinamica),
+    ("stream.cifrar_paralelo", lambda n: (generar_texto(n), CLAVE_MAESTRA, NONCE),
+     cifrar_ascii_llave_dinamica_a_base64_paralelo),
+    ("stream.descifrar_paralelo",
+     lambda n: (cifrar_ascii_llave_dinamica_a_base64(generar_texto(n), CLAVE_MAESTRA, NONCE), CLAVE_MAESTRA, NONCE),
+     descifrar_base64_con_llave_dinamica_paralelo),
+    # rango de n bytes a partir de la mitad de un cipher de 2n bytes
+    ("stream.descifrar_rango_llave_fija",
+     lambda n: (cifrar_ascii_llave_fija_a_base64(generar_texto(2 * n), LLAVE), LLAVE, n // 2, n // 2 + n),
+     descifrar_rango_base64_con_llave_fija),
+    ("stream.descifrar_rango_llave_dinamica",
+     lambda n: (cifrar_ascii_llave_dinamica_a_base64(generar_texto(2 * n), CLAVE_MAESTRA, NONCE),
+                CLAVE_MAESTRA, NONCE, n // 2, n // 2 + n),
+     descifrar_rango_base64_con_llave_dinamica),
+    # cifrados_historicos.py
+    ("historicos.cesar_cifrar", lambda n: (generar_texto(n), 3), cesar_cifrar),
+    ("historicos.cesar_descifrar", lambda n: (cesar_cifrar(generar_texto(n), 3), 3), cesar_descifrar),
+    ("historicos.rot13", lambda n: (generar_texto(n),), rot13),
+    ("historicos.vigenere_cifrar", lambda n: (generar_texto(n), LLAVE), vigenere_cifrar),
+    ("historicos.vigenere_descifrar", lambda n: (vigenere_cifrar(generar_texto(n), LLAVE), LLAVE),
+     vigenere_descifrar),
+    ("historicos.vigenere_cifrar_flujo", lambda n: (generar_texto(n),), _vigenere_flujo),
+    ("historicos.analisis_frecuencia", lambda n: (generar_texto(n),), analisis_frecuencia),
+]
+
+
+def percentil(muestras_ordenadas, p):
+    """
+    Percentil p (0..100) por rango más cercano: el menor valor que deja al
+    menos el p% de las muestras a su izquierda (rango ceil(p/100 * n)).
+    p50 de 10 muestras es la 5ª; p99 de 100 muestras es la 99ª.
+    """
+    if not muestras_ordenadas:
+        return 0.0
+    k = max(0, min(len(muestras_ordenadas) - 1, math.ceil(p / 100 * len(muestras_ordenadas)) - 1))
+    return muestras_ordenadas[k]
+
+
+def medir_caso(funcion, args, n_bytes, con_memoria=True):
+    """
+    Repite funcion(*args) hasta PRESUPUESTO_SEGUNDOS (entre MIN y MAX
+    repeticiones; una sola si la primera ya supera el presupuesto).
+    Retorna un dict con latencias, throughput y memoria pico.
+    """
+    muestras = []
+    inicio_total = time.perf_counter()
+    while len(muestras) < MAX_REPETICIONES:
+        inicio = time.perf_counter()
+        funcion(*args)
+        muestras.append(time.perf_counter() - inicio)
+
+        transcurrido = time.perf_counter() - inicio_total
+        if transcurrido >= PRESUPUESTO_SEGUNDOS and len(muestras) >= MIN_REPETICIONES:
+            break
+        if len(muestras) == 1 and muestras[0] >= PRESUPUESTO_SEGUNDOS:
+            break
+
+    muestras.sort()
+    p50 = percentil(muestras, 50)
+
+    pico = None
+    if con_memoria:
+        tracemalloc.start()
+        funcion(*args)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "bytes": n_bytes,
+        "repeticiones": len(muestras),
+        "mb_s": (n_bytes / MB) / p50 if p50 > 0 else None,
+        "p50_ms": p50 * 1000,
+        "p90_ms": percentil(muestras, 90) * 1000,
+        "p99_ms": percentil(muestras, 99) * 1000,
+        "pico_mb": pico / MB if pico is not None else None,
+    }
+
+
+def correr_harness(tamanos, filtro=None, con_memoria=True):
+    """Corre todos los CASOS (que contengan filtro) en cada tamaño."""
+    resultados = []
+    print(f"{'Caso':<38} | {'Tamaño':>7} | {'MB/s':>9} | {'p50 ms':>9} | {'p90 ms':>9} | "
+          f"{'p99 ms':>9} | {'Pico MB':>8}")
+    print("-" * 104)
+
+    for nombre, preparar, funcion in CASOS:
+        if filtro and filtro not in nombre:
+            continue
+        for n_bytes in tamanos:
+            r = medir_caso(funcion, preparar(n_bytes), n_bytes, con_memoria)
+            r["caso"] = nombre
+            resultados.append(r)
+
+            mb_s = f"{r['mb_s']:9.1f}" if r["mb_s"] is not None else f"{'-':>9}"
+            pico = f"{r['pico_mb']:8.1f}" if r["pico_mb"] is not None else f"{'-':>8}"
+            print(f"{nombre:<38} | {formatear_tamano(n_bytes):>7} | {mb_s} | {r['p50_ms']:9.3f} | "
+                  f"{r['p90_ms']:9.3f} | {r['p99_ms']:9.3f} | {pico}")
+
+    return resultados
+
+
+def guardar_json(resultados, ruta):
+    datos = {
+        "meta": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "resultados": resultados,
+    }
+    with open(ruta, "w") as f:
+        json.dump(datos, f, indent=2)
+
+
+def comparar_con_baseline(resultados, ruta_baseline, umbral=UMBRAL_REGRESION):
+    """
+    Compara p50 y memoria pico con un JSON guardado antes.
+    Retorna la lista de regresiones (caso, tamaño, métrica, antes, ahora).
+    """
+    with open(ruta_baseline) as f:
+        base = {(r["caso"], r["bytes"]): r for r in json.load(f)["resultados"]}
+
+    regresiones = []
+    for r in resultados:
+        anterior = base.get((r["caso"], r["bytes"]))
+        if anterior is None:
+            continue
+        for metrica in ["p50_ms", "pico_mb"]:
+            antes, ahora = anterior.get(metrica), r.get(metrica)
+            if antes and ahora is not None and ahora > antes * (1 + umbral):
+                regresiones.append((r["caso"], r["bytes"], metrica, antes, ahora))
+
+    print(f"\nComparación con {ruta_baseline} (umbral {umbral:.0%})")
+    if not regresiones:
+        print("Sin regresiones")
+    for caso, n_bytes, metrica, antes, ahora in regresiones:
+        print(f"REGRESIÓN {caso} [{formatear_tamano(n_bytes)}] {metrica}: "
+              f"{antes:.3f} -> {ahora:.3f} ({ahora / antes - 1:+.0%})")
+    return regresiones
+
+
+# ============================================================
+# Regresión de memoria/tiempo con 64 MB
+# ============================================================
+# Cada ruta de salida se construye en un buffer reservado (BufferSalida):
+# la memoria pico debe quedar en unas pocas veces la entrada y el tiempo
+# debe crecer linealmente. Si una salida vuelve a armarse con += o con
+# listas de un objeto por byte/grupo, estos límites lo detectan.
+#
+# El límite de cada caso es copias * n + fijo: copias es cuántos buffers
+# del tamaño de la entrada siguen vivos en el pico (sale del código, no de
+# una medición) y fijo es la memoria de trabajo de un trozo, que no crece
+# con n. Así el mismo límite vale para --regresion 16 y para 64 MB.
+#
+# Excepción intencional: stream_cipher_ascii._juntar_texto arma el texto del
+# cifrado/descifrado de una pasada con str += (CPython lo agranda en su
+# lugar). Los límites de stream.cifrar/descifrar_llave_fija son los de esa
+# ruta: si el crecimiento en sitio deja de ocurrir, el pico sube a ~2.7x y
+# la regresión falla.
+
+TAM_REGRESION_MB = 64
+
+# (nombre, preparar(n), funcion, copias, fijo (MB), throughput mínimo en MB/s)
+LIMITES_REGRESION = [
+    # BufferSalida reservado (4/3) + el str que devuelve (4/3)
+    ("base64.bytes_a_base64", lambda n: (os.urandom(n),), bytes_a_base64, 8 / 3, 4, 2.0),
+    # bytearray reservado + bytes de valor()
+    ("base64.base64_a_bytes", lambda n: (bytes_a_base64(os.urandom(n)),), base64_a_bytes, 2, 4, 1.0),
+    ("xor.xor_bytes", lambda n: (os.urandom(n), b"CLAVE", "repetir"), xor_bytes, 2, 2, 20.0),
+    # una pasada por trozos: el pico es la salida (4/3 de la entrada al
+    # cifrar, 1x al descifrar) más unos pocos trozos de TAM_TROZO_FUSIONADO
+    ("stream.cifrar_llave_fija", lambda n: (generar_texto(n), LLAVE),
+     cifrar_ascii_llave_fija_a_base64, 4 / 3, 4, 1.0),
+    # llave tan larga como el mensaje: su copia validada (1) más la salida;
+    # el mínimo de MB/s detecta si cada trozo vuelve a copiar la llave entera
+    # (cuadrático: ~2 MB/s con 64 MB)
+    ("stream.cifrar_llave_fija_larga", lambda n: (generar_texto(n), generar_texto(n)[::-1]),
+     cifrar_ascii_llave_fija_a_base64, 4 / 3 + 1, 4, 5.0),
+    ("stream.descifrar_llave_fija",
+     lambda n: (cifrar_ascii_llave_fija_a_base64(generar_texto(n), LLAVE), LLAVE),
+     descifrar_base64_con_llave_fija, 1, 4, 1.0),
+    # por mensaje de TAM_MENSAJE_LOTE = 64 bytes (66 alineado a 3), en bytes:
+    # rango (tupla + 2 enteros + celda) ~128, mensajes/llaves/cipher
+    # empaquetados 3 * 66, Base64 completo 88, str de salida con su
+    # encabezado y celda ~145, celda de la lista de entrada 8 -> ~567 / 64
+    ("stream.cifrar_lote_llave_fija", lambda n: (_mensajes_lote(n), LLAVE),
+     cifrar_lote_llave_fija_a_base64, 9, 4, 1.0),
+    # partes + el join final; fijo: re.split de un trozo de 1 MB crea un
+    # objeto por tramo de letras/no-letras (~50 bytes por byte del trozo)
+    ("historicos.vigenere_cifrar", lambda n: (generar_texto(n), LLAVE), vigenere_cifrar, 2, 50, 2.0),
+]
+
+
+def regresion_64mb(tam_mb=TAM_REGRESION_MB):
+    """
+    Corre LIMITES_REGRESION con entradas de tam_mb MB.
+    Retorna la lista de fallas (nombre, motivo).
+    """
+    n_bytes = int(tam_mb * MB)
+    fallas = []
+
+    print(f"\nRegresión de memoria/tiempo ({tam_mb} MB)")
+    print(f"{'Caso':<32} | {'MB/s':>8} | {'mín':>6} | {'Pico/entrada':>12} | {'máx':>6}")
+    print("-" * 79)
+
+    for nombre, preparar, funcion, copias, fijo_mb, mb_s_min in LIMITES_REGRESION:
+        args = preparar(n_bytes)
+        segundos, pico = medir(funcion, *args)
+        del args
+
+        mb_s = tam_mb / segundos if segundos > 0 else float("inf")
+        factor = pico / n_bytes
+        pico_max = round(copias + fijo_mb * MB / n_bytes, 2)
+        print(f"{nombre:<32} | {mb_s:8.1f} | {mb_s_min:6.1f} | {factor:11.2f}x | {pico_max:5.2f}x")
+
+        if factor > pico_max:
+            fallas.append((nombre, f"memoria pico {factor:.2f}x > {pico_max}x"))
+        if mb_s < mb_s_min:
+            fallas.append((nombre, f"{mb_s:.1f} MB/s < {mb_s_min} MB/s"))
+
+    for nombre, motivo in fallas:
+        print(f"REGRESIÓN {nombre}: {motivo}")
+    if not fallas:
+        print("Sin regresiones")
+    return fallas
+
+
+def correr_rutas(tamanos_mb):
+    """Comparaciones lado a lado entre rutas (strings de bits vs bytes, workers, ...)."""
+    benchmark_binario(tamanos_mb)
+    benchmark_base64(tamanos_mb)
+    benchmark_xor(tamanos_mb)
+    benchmark_paralelo(tamanos_mb)
+    benchmark_frecuencia_paralela(tamanos_mb)
+    benchmark_letras()
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmarks de conversiones y cifrados")
+    parser.add_argument("--tamanos", nargs="+", default=TAMANOS_HARNESS,
+                        help="tamaños de entrada, p. ej. 10B 1KB 1MB (por defecto 10B..100MB)")
+    parser.add_argument("--filtro", help="solo casos cuyo nombre contiene este texto")
+    parser.add_argument("--json", help="guardar resultados en este archivo JSON")
+    parser.add_argument("--baseline", help="JSON previo contra el cual buscar regresiones")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_REGRESION,
+                        help="fracción de empeoramiento tolerada (0.10 = 10%%)")
+    parser.add_argument("--sin-memoria", action="store_true",
+                        help="no medir memoria pico (evita una corrida extra con tracemalloc)")
+    parser.add_argument("--rutas", nargs="*", type=float, metavar="MB",
+                        help="comparaciones lado a lado en estos tamaños (MB)")
+    parser.add_argument("--regresion", nargs="?", type=float, const=TAM_REGRESION_MB, metavar="MB",
+                        help="verificar límites de memoria/tiempo (64 MB por defecto)")
+    args = parser.parse_args(argv)
+
+    if args.regresion is not None:
+        return 1 if regresion_64mb(args.regresion) else 0
+
+    if args.rutas is not None:
+        correr_rutas(args.rutas or TAMANOS_MB)
+        return 0
+
+    tamanos = [parsear_tamano(t) for t in args.tamanos]
+    resultados = correr_harness(tamanos, args.filtro, con_memoria=not args.sin_memoria)
+
+    if args.json:
+        guardar_json(resultados, args.json)
+        print(f"\nResultados guardados en {args.json}")
+
+    if args.baseline:
+        if comparar_con_baseline(resultados, args.baseline, args.umbral):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
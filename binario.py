@@ -1,3 +1,7 @@
+import codecs
+
+from buffer_salida import BufferSalida, texto_desde, vista_bytes, vista_destino
+
 ASCII_TABLE = {
     # Mayúsculas
     'A': 65, 'B': 66, 'C': 67, 'D': 68,
@@ -40,68 +44,259 @@ ASCII_INV = {}
 for ch in ASCII_TABLE:
     ASCII_INV[ASCII_TABLE[ch]] = ch
 
+# Bytes de ASCII_TABLE: al borrarlos con translate, lo que sobra queda
+# fuera de la lista blanca (modo estricto)
+_BYTES_ESTRICTOS = bytes(sorted(ASCII_INV))
 
-def decimal_a_binario(n):
-    """Convierte un número decimal a binario (sin relleno). Manual."""
-    if n == 0:
-        return "0"
+# Codificaciones de texto <-> bytes:
+# - "latin-1": rango completo, carácter chr(n) <-> byte n (0..255)
+# - "utf-8": texto Unicode arbitrario (varios bytes por carácter)
+CODIFICACIONES = ["latin-1", "utf-8"]
 
-    bits = ""
-    while n > 0:
-        bits = str(n % 2) + bits
-        n = n // 2
+# bytes por trozo en las variantes *_into (la salida va directo al destino;
+# solo el trozo en curso ocupa memoria extra). Las entradas con protocolo de
+# buffer también se validan de a TAM_TROZO_INTO bytes, sin convertirlas a str.
+TAM_TROZO_INTO = 64 * 1024
 
-    return bits
+
+def decimal_a_binario(n):
+    """Convierte un número decimal (>= 0) a binario (sin relleno)."""
+    if n < 0:
+        raise ValueError("El número debe ser >= 0")
+    # format recorre los bits en C: lineal en la cantidad de bits
+    return format(n, "b")
 
 
 def rellenar_a_n_bits(binario, n_bits):
     """Rellena con ceros a la izquierda hasta n_bits."""
-    while len(binario) < n_bits:
-        binario = "0" + binario
-    return binario
+    if len(binario) >= n_bits:
+        return binario
+    return "0" * (n_bits - len(binario)) + binario
 
 
 def es_binario(cadena):
     """Valida si una cadena contiene solo 0 y 1."""
-    for c in cadena:
-        if c != '0' and c != '1':
-            return False
-    return True
+    # count() recorre la cadena en C; si todo es 0/1 las cuentas suman la longitud
+    return cadena.count('0') + cadena.count('1') == len(cadena)
+
+
+# Tablas para la ruta rápida (se construyen una sola vez al importar)
+
+# byte (0..255) -> string de 8 bits, y viceversa
+_BYTE_A_BITS = [rellenar_a_n_bits(decimal_a_binario(n), 8) for n in range(256)]
+_BITS_A_BYTE = {}
+for _n in range(256):
+    _BITS_A_BYTE[_BYTE_A_BITS[_n]] = _n
 
 
-def texto_a_ascii_binario_lista(texto):
+# ============================================================
+# API de bytes (bytes / bytearray / memoryview / mmap)
+# ============================================================
+# Las funciones que reciben texto también aceptan un buffer: se lee como
+# el texto ya codificado (latin-1 por defecto, o la codificacion pedida).
+
+def _validar_codificacion(codificacion):
+    if codificacion not in CODIFICACIONES:
+        raise ValueError("codificacion inválida. Usa 'latin-1' o 'utf-8'")
+
+
+def texto_a_bytes(texto, estricto=False, codificacion="latin-1"):
     """
-    ASCII -> lista de bytes binarios (strings de 8 bits), manual.
-    Ej: "Hola" -> ["01001000","01101111","01101100","01100001"]
+    Texto -> bytes.
+    - codificacion="latin-1": cada carácter es un byte (0..255)
+    - codificacion="utf-8": cualquier carácter Unicode
+    - estricto=True: solo acepta caracteres de ASCII_TABLE (lista blanca)
+    Ej: "Hola" -> b"Hola"
+    """
+    _validar_codificacion(codificacion)
+    if not isinstance(texto, str):
+        return _buffer_a_bytes(texto, estricto, codificacion)
+
+    try:
+        datos = texto.encode(codificacion)
+    except UnicodeEncodeError as e:
+        if estricto:
+            datos = None
+        else:
+            raise ValueError(f"Carácter no soportado: {repr(texto[e.start])}") from None
+
+    if estricto and (datos is None or datos.translate(None, _BYTES_ESTRICTOS)):
+        # Ruta lenta solo para reportar el primer carácter inválido
+        for caracter in texto:
+            if caracter not in ASCII_TABLE:
+                raise ValueError(f"Carácter no soportado: {repr(caracter)}")
+
+    return datos
+
+
+def _buffer_a_bytes(datos, estricto, codificacion):
+    """
+    texto_a_bytes de un buffer: el buffer ya es el texto codificado, así que
+    se valida y se copia una sola vez (sin decodificarlo a str y volver).
+    """
+    vista = vista_bytes(datos)
+    if codificacion == "utf-8":
+        _validar_utf8(vista)
+
+    datos = bytes(vista)
+    if estricto and datos.translate(None, _BYTES_ESTRICTOS):
+        # Ruta lenta solo para reportar el primer carácter inválido
+        for caracter in str(datos, codificacion):
+            if caracter not in ASCII_TABLE:
+                raise ValueError(f"Carácter no soportado: {repr(caracter)}")
+    return datos
+
+
+def _validar_utf8(vista):
+    """Verifica que vista sea UTF-8 válido, decodificando de a un trozo."""
+    decodificador = codecs.getincrementaldecoder("utf-8")()
+    for i in range(0, len(vista), TAM_TROZO_INTO):
+        # bytes de una secuencia incompleta que quedaron del trozo anterior
+        pendientes = len(decodificador.getstate()[0])
+        try:
+            decodificador.decode(vista[i:i + TAM_TROZO_INTO], i + TAM_TROZO_INTO >= len(vista))
+        except UnicodeDecodeError as e:
+            raise ValueError(f"UTF-8 inválido en el byte {i - pendientes + e.start}") from None
+
+
+def bytes_a_texto(datos, estricto=False, codificacion="latin-1"):
+    """
+    bytes -> texto.
+    Acepta cualquier buffer (bytes, bytearray, memoryview, mmap) sin copiarlo
+    aparte del texto resultante.
+    - estricto=True: cada byte debe estar en ASCII_INV (lista blanca),
+      validado de a TAM_TROZO_INTO bytes
+    - codificacion: "latin-1" (cualquier byte) o "utf-8"
+    """
+    _validar_codificacion(codificacion)
+    vista = vista_bytes(datos)
+
+    if estricto:
+        # por trozos: la única copia completa es el str de salida
+        for i in range(0, len(vista), TAM_TROZO_INTO):
+            trozo = vista[i:i + TAM_TROZO_INTO]
+            if bytes(trozo).translate(None, _BYTES_ESTRICTOS):
+                for ascii_decimal in trozo:
+                    if ascii_decimal not in ASCII_INV:
+                        raise ValueError(f"Código ASCII no soportado: {ascii_decimal}")
+
+    try:
+        return str(vista, codificacion)
+    except UnicodeDecodeError as e:
+        raise ValueError(f"UTF-8 inválido en el byte {e.start}") from None
+
+
+def bytes_a_binario(datos):
+    """
+    bytes -> binario (string de 8 bits por byte, concatenado).
+    Ej: b"H" -> "01001000"
+    """
+    vista = vista_bytes(datos)
+    if len(vista) == 0:
+        return ""
+    # int.from_bytes y format(..., 'b') son lineales para base 2
+    return format(int.from_bytes(vista, "big"), "0" + str(8 * len(vista)) + "b")
+
+
+def _validar_binario_bytes(binario):
+    """
+    Valida un binario para pasarlo a bytes. Retorna el str tal cual o un
+    memoryview del buffer (validado por trozos, sin convertirlo a str).
     """
-    resultado = []
+    if isinstance(binario, str):
+        if not es_binario(binario):
+            raise ValueError("La entrada debe ser binaria (solo 0 y 1)")
+    else:
+        binario = vista_bytes(binario)
+        for i in range(0, len(binario), TAM_TROZO_INTO):
+            if bytes(binario[i:i + TAM_TROZO_INTO]).translate(None, b"01"):
+                raise ValueError("La entrada debe ser binaria (solo 0 y 1)")
 
-    for caracter in texto:
-        if caracter not in ASCII_TABLE:
-            raise ValueError(f"Carácter no soportado: {repr(caracter)}")
+    if len(binario) % 8 != 0:
+        raise ValueError("La longitud del binario debe ser múltiplo de 8 para dividir en bytes")
+    return binario
+
+
+def binario_a_bytes(binario):
+    """
+    Binario (string o buffer de '0'/'1', múltiplo de 8) -> bytes.
+    Ej: "01001000" -> b"H"
+    """
+    binario = _validar_binario_bytes(binario)
+
+    if len(binario) == 0:
+        return b""
+
+    # int() acepta str o bytes (no memoryview)
+    if not isinstance(binario, str):
+        binario = bytes(binario)
+    return int(binario, 2).to_bytes(len(binario) // 8, "big")
 
-        ascii_decimal = ASCII_TABLE[caracter]
-        ascii_binario = decimal_a_binario(ascii_decimal)
-        ascii_binario = rellenar_a_n_bits(ascii_binario, 8)
 
-        resultado.append(ascii_binario)
+# ============================================================
+# Variantes *_into: escriben en un destino reservado
+# ============================================================
+# destino: bytearray, memoryview escribible, mmap, ... Se escribe desde su
+# posición 0 y se devuelve cuántos bytes se escribieron. Si la entrada es
+# inválida el error sale antes de escribir.
+
+def bytes_a_binario_into(destino, datos):
+    """
+    bytes -> binario como caracteres ASCII '0'/'1' (8 por byte) en destino.
+    Retorna 8 * len(datos).
+    """
+    vista = vista_bytes(datos)
+    n_salida = 8 * len(vista)
+    salida = vista_destino(destino, n_salida)
+
+    for i in range(0, len(vista), TAM_TROZO_INTO):
+        trozo = vista[i:i + TAM_TROZO_INTO]
+        bits = format(int.from_bytes(trozo, "big"), "0" + str(8 * len(trozo)) + "b")
+        salida[8 * i:8 * i + len(bits)] = bits.encode("latin-1")
+    return n_salida
+
+
+def binario_a_bytes_into(destino, binario):
+    """
+    Binario (string o buffer de '0'/'1', múltiplo de 8) -> bytes en destino.
+    Retorna len(binario) // 8.
+    """
+    binario = _validar_binario_bytes(binario)
+    n_salida = len(binario) // 8
+    salida = vista_destino(destino, n_salida)
 
-    return resultado
+    paso = 8 * TAM_TROZO_INTO
+    for j in range(0, len(binario), paso):
+        trozo = binario[j:j + paso]
+        if not isinstance(trozo, str):
+            # se copia antes de escribir: el destino puede ser el mismo buffer
+            trozo = bytes(trozo)
+        salida[j // 8:(j + len(trozo)) // 8] = int(trozo, 2).to_bytes(len(trozo) // 8, "big")
+    return n_salida
 
 
-def texto_a_ascii_binario(texto, separador=""):
+def texto_a_ascii_binario_lista(texto, estricto=False, codificacion="latin-1"):
+    """
+    ASCII -> lista de bytes binarios (strings de 8 bits), manual.
+    Ej: "Hola" -> ["01001000","01101111","01101100","01100001"]
+    estricto/codificacion: igual que texto_a_bytes.
+    """
+    return [_BYTE_A_BITS[b] for b in texto_a_bytes(texto, estricto, codificacion)]
+
+
+def texto_a_ascii_binario(texto, separador="", estricto=False, codificacion="latin-1"):
     """
     ASCII -> binario (string). Por defecto concatena.
     separador=" " devuelve bytes separados por espacio.
     """
-    lista = texto_a_ascii_binario_lista(texto)
     if separador == "":
-        return "".join(lista)
-    return separador.join(lista)
+        return bytes_a_binario(texto_a_bytes(texto, estricto, codificacion))
+    return separador.join(texto_a_ascii_binario_lista(texto, estricto, codificacion))
 
 
 def binario_a_decimal(binario):
-    """Convierte un binario (string) a decimal, manual."""
+    """Convierte un binario (string o buffer) a decimal, manual."""
+    binario = texto_desde(binario)
     if not es_binario(binario) or len(binario) == 0:
         raise ValueError("Binario inválido")
 
@@ -121,61 +316,60 @@ def dividir_en_bytes(binario):
     Divide un binario (string) en bytes de 8 bits.
     Requiere longitud múltiplo de 8.
     """
+    binario = texto_desde(binario)
     if not es_binario(binario):
         raise ValueError("La entrada debe ser binaria (solo 0 y 1)")
 
     if len(binario) % 8 != 0:
         raise ValueError("La longitud del binario debe ser múltiplo de 8 para dividir en bytes")
 
-    bytes_ = []
-    i = 0
-    while i < len(binario):
-        bytes_.append(binario[i:i+8])
-        i += 8
+    return [binario[i:i+8] for i in range(0, len(binario), 8)]
 
-    return bytes_
 
-
-def ascii_binario_lista_a_texto(lista_binarios):
+def ascii_binario_lista_a_texto(lista_binarios, estricto=False, codificacion="latin-1"):
     """
     Lista de bytes binarios (8 bits) -> ASCII, manual.
+    estricto/codificacion: igual que bytes_a_texto.
     """
-    texto = ""
+    # con una lista se reserva el tamaño exacto; un iterador se junta al final
+    tamano = len(lista_binarios) if hasattr(lista_binarios, "__len__") else None
+    datos = BufferSalida(tamano)
 
     for byte in lista_binarios:
-        if len(byte) != 8 or not es_binario(byte):
+        ascii_decimal = _BITS_A_BYTE.get(byte)
+        if ascii_decimal is None:
             raise ValueError(f"Bloque inválido (debe ser 8 bits): {byte}")
+        datos.escribir_byte(ascii_decimal)
 
-        ascii_decimal = binario_a_decimal(byte)
-
-        if ascii_decimal not in ASCII_INV:
-            raise ValueError(f"Código ASCII no soportado: {ascii_decimal}")
+    return bytes_a_texto(datos.valor(), estricto, codificacion)
 
-        texto += ASCII_INV[ascii_decimal]
 
-    return texto
-
-
-def ascii_binario_a_texto(binario, acepta_espacios=True):
+def ascii_binario_a_texto(binario, acepta_espacios=True, estricto=False, codificacion="latin-1"):
     """
     Binario (string) -> ASCII.
     - Si acepta_espacios=True, permite entradas tipo: '01001000 01101001'
     - Si no, espera todo concatenado.
+    - estricto/codificacion: igual que bytes_a_texto.
     """
     if acepta_espacios:
         # eliminar espacios y saltos
-        compacto = ""
-        for c in binario:
-            if c in ['0', '1']:
-                compacto += c
-            elif c in [' ', '\n', '\t', '\r']:
-                continue
-            else:
-                raise ValueError(f"Carácter inválido en binario: {repr(c)}")
-        binario = compacto
+        binario = limpiar_separadores_binario(binario)
+
+    return bytes_a_texto(binario_a_bytes(binario), estricto, codificacion)
 
-    lista_bytes = dividir_en_bytes(binario)
-    return ascii_binario_lista_a_texto(lista_bytes)
+
+def limpiar_separadores_binario(binario):
+    """
+    Quita espacios/saltos de un binario (string o buffer).
+    Cualquier otro carácter distinto de 0/1 es un error.
+    """
+    binario = texto_desde(binario)
+    compacto = binario.replace(' ', '').replace('\n', '').replace('\t', '').replace('\r', '')
+    if not es_binario(compacto):
+        for c in compacto:
+            if c != '0' and c != '1':
+                raise ValueError(f"Carácter inválido en binario: {repr(c)}")
+    return compacto
 
 
 if __name__ == "__main__":
@@ -0,0 +1,148 @@
+# buffer_salida.py
+# Acumulador de salida compartido por binario, base64, xor,
+# stream_cipher_ascii y cifrados_historicos.
+#
+# En lugar de ir concatenando con += (cada suma copia todo lo anterior):
+# - si el tamaño final se conoce, se reserva un bytearray de ese tamaño
+#   y cada parte se copia en su lugar;
+# - si no, las partes se guardan en una lista y se unen una sola vez.
+#
+# También tiene las funciones para recibir cualquier objeto con protocolo de
+# buffer (bytes, bytearray, memoryview, mmap, array) como entrada, y para
+# escribir en un destino reservado por quien llama (variantes *_into).
+
+
+class BufferSalida:
+    """
+    Salida en bytes que se construye por partes.
+
+    buf = BufferSalida(6)           # tamaño conocido: bytearray reservado
+    buf.escribir(b"Hol")
+    buf.escribir(b"a!!")
+    buf.valor()                     # b"Hola!!"
+
+    buf = BufferSalida()            # tamaño desconocido: lista + join
+    buf.escribir(b"01")
+    buf.texto()                     # "01"
+
+    buf = BufferSalida(texto=True)  # partes str que se unen con "".join
+    buf.escribir("Hola")
+    buf.texto()                     # "Hola"
+    """
+
+    def __init__(self, tamano=None, texto=False):
+        if texto and tamano is not None:
+            raise ValueError("Un buffer de texto no reserva tamaño")
+
+        self._tamano = tamano
+        self._es_texto = texto
+        self._pos = 0
+        if tamano is None:
+            self._partes = []
+        else:
+            if tamano < 0:
+                raise ValueError("El tamaño debe ser >= 0")
+            self._datos = bytearray(tamano)
+
+    def __len__(self):
+        return self._pos
+
+    def escribir(self, parte):
+        """Agrega bytes/bytearray/memoryview (o str si texto=True) al final."""
+        n = len(parte)
+        if self._tamano is None:
+            self._partes.append(parte)
+        else:
+            fin = self._pos + n
+            if fin > self._tamano:
+                raise ValueError("La salida excede el tamaño reservado")
+            self._datos[self._pos:fin] = parte
+        self._pos += n
+
+    def escribir_byte(self, valor):
+        """Agrega un solo byte (0..255)."""
+        if self._es_texto:
+            raise ValueError("Un buffer de texto solo acepta str")
+        if self._tamano is None:
+            self._partes.append(bytes((valor,)))
+        else:
+            if self._pos >= self._tamano:
+                raise ValueError("La salida excede el tamaño reservado")
+            self._datos[self._pos] = valor
+        self._pos += 1
+
+    def saltar(self, n):
+        """Avanza n bytes dejándolos en 0 (relleno)."""
+        if self._es_texto:
+            raise ValueError("Un buffer de texto solo acepta str")
+        if self._tamano is None:
+            self._partes.append(bytes(n))
+            self._pos += n
+        else:
+            if self._pos + n > self._tamano:
+                raise ValueError("La salida excede el tamaño reservado")
+            # el bytearray reservado ya está en ceros
+            self._pos += n
+
+    def valor(self):
+        """Bytes escritos hasta ahora (se copian una sola vez)."""
+        if self._es_texto:
+            raise ValueError("Un buffer de texto se lee con texto()")
+        if self._tamano is None:
+            return b"".join(self._partes)
+        if self._pos == self._tamano:
+            return bytes(self._datos)
+        return bytes(memoryview(self._datos)[:self._pos])
+
+    def texto(self, codificacion="latin-1"):
+        """
+        Salida como str. Los bytes se decodifican con codificacion
+        (latin-1 por defecto: byte n -> chr(n)).
+        """
+        if self._es_texto:
+            return "".join(self._partes)
+        if self._tamano is None:
+            return b"".join(self._partes).decode(codificacion)
+        # str() decodifica directo desde el buffer, sin copia intermedia
+        return str(memoryview(self._datos)[:self._pos], codificacion)
+
+
+# ============================================================
+# Entradas y destinos con protocolo de buffer
+# ============================================================
+
+def vista_bytes(datos):
+    """
+    Objeto con protocolo de buffer -> memoryview de bytes sueltos, sin
+    copiar. Un array('I') o un memoryview de otro formato se ve byte a byte.
+    """
+    vista = memoryview(datos)
+    if vista.format != "B" or vista.ndim != 1:
+        vista = vista.cast("B")
+    return vista
+
+
+def texto_desde(datos, codificacion="latin-1"):
+    """
+    str se devuelve tal cual; un buffer se lee como texto en codificacion
+    (latin-1 por defecto: byte n -> chr(n), como un archivo abierto en "rb").
+    """
+    if isinstance(datos, str):
+        return datos
+    try:
+        return str(vista_bytes(datos), codificacion)
+    except UnicodeDecodeError as e:
+        raise ValueError(f"UTF-8 inválido en el byte {e.start}") from None
+
+
+def vista_destino(destino, n_bytes):
+    """
+    memoryview escribible de destino (bytearray, memoryview, mmap, ...) que
+    se verifica con espacio para n_bytes. Se escribe desde la posición 0.
+    """
+    vista = vista_bytes(destino)
+    if vista.readonly:
+        raise ValueError("El destino debe ser escribible (bytearray, memoryview, mmap, ...)")
+    if len(vista) < n_bytes:
+        raise ValueError(f"El destino es muy pequeño: se necesitan {n_bytes} bytes y tiene {len(vista)}")
+    return vista
@@ -0,0 +1,272 @@
+# cifrado_archivos.py
+# Cifrado/descifrado de archivos completos con el stream cipher de
+# stream_cipher_ascii, sin cargar el archivo en memoria.
+#
+# El archivo de entrada se abre con mmap y se recorre por bloques grandes:
+# cada bloque se cifra con XOR (llave fija o dinámica, en la posición que le
+# toca del keystream) y se escribe a la salida como Base64 o como bytes
+# crudos. La memoria usada depende del tamaño de bloque, no del archivo.
+#
+# Un archivo cifrado con formato "base64" es idéntico a
+# cifrar_ascii_llave_*_a_base64(contenido) con el contenido leído como
+# latin-1 (1 byte = 1 carácter).
+#
+# Uso desde la terminal:
+#   python -m cifrado_archivos cifrar entrada.csv salida.b64 --llave CLAVE
+#   python -m cifrado_archivos descifrar salida.b64 entrada.csv --llave CLAVE
+#   python -m cifrado_archivos cifrar datos.bin datos.enc --clave-maestra K --nonce 0001 --formato raw
+#   python -m cifrado_archivos en-sitio datos.bin --clave-maestra K --nonce 0001
+
+import argparse
+import mmap
+import os
+import sys
+
+from base64 import Base64Decoder, bytes_a_base64
+from stream_cipher_ascii import (
+    KeystreamDinamico,
+    _aplicar_llave,
+    _llave_fija_a_bytes,
+    _ventana_llave,
+)
+
+FORMATOS = ["base64", "raw"]
+
+# bytes de mensaje por bloque (múltiplo de 3: cada bloque cierra sus grupos
+# Base64 y no queda sobrante entre bloques)
+TAM_BLOQUE_ARCHIVO = 3 * 4 * 1024 * 1024
+
+
+# ============================================================
+# Keystream por posición
+# ============================================================
+
+def _fuente_llave(llave_fija, clave_maestra, nonce, tam_archivo):
+    """
+    Devuelve una función llave(inicio, fin) -> bytes para XOR del rango
+    [inicio, fin) del mensaje (puede ser más corta: se repite).
+    Se usa llave_fija o (clave_maestra, nonce), no ambas.
+    """
+    if llave_fija is not None:
+        if clave_maestra is not None or nonce is not None:
+            raise ValueError("Usa llave_fija o clave_maestra/nonce, no ambas")
+        if len(llave_fija) == 0:
+            raise ValueError("La llave no puede ser vacía")
+
+        k_bytes = _llave_fija_a_bytes(llave_fija, max(tam_archivo, 1))
+
+        # solo la ventana del bloque: rotar la llave entera copiaría una
+        # llave del tamaño del archivo en cada bloque
+        return lambda inicio, fin: _ventana_llave(k_bytes, inicio, fin)
+
+    if clave_maestra is None or nonce is None:
+        raise ValueError("Se requiere llave_fija o clave_maestra y nonce")
+
+    ks = KeystreamDinamico(clave_maestra, nonce)
+    return ks.bytes_en
+
+
+def _validar_parametros(formato, tam_bloque):
+    if formato not in FORMATOS:
+        raise ValueError("formato inválido. Usa 'base64' o 'raw'")
+    if tam_bloque <= 0 or tam_bloque % 3 != 0:
+        raise ValueError("tam_bloque debe ser un múltiplo positivo de 3")
+
+
+def _validar_rutas(ruta_entrada, ruta_salida):
+    if os.path.exists(ruta_salida) and os.path.samefile(ruta_entrada, ruta_salida):
+        raise ValueError("La salida no puede ser el mismo archivo (usa cifrar_archivo_en_sitio)")
+
+
+def _bloques(mm, tam_bloque):
+    """Recorre un mmap en bloques [inicio, fin)."""
+    if hasattr(mmap, "MADV_SEQUENTIAL"):
+        # lectura secuencial: el sistema puede adelantar páginas y soltar las leídas
+        mm.madvise(mmap.MADV_SEQUENTIAL)
+    for inicio in range(0, len(mm), tam_bloque):
+        yield inicio, min(inicio + tam_bloque, len(mm))
+
+
+# ============================================================
+# 1) Archivo -> archivo
+# ============================================================
+
+def cifrar_archivo(ruta_entrada, ruta_salida, llave_fija=None, clave_maestra=None, nonce=None,
+                   formato="base64", tam_bloque=TAM_BLOQUE_ARCHIVO, backend=None, progreso=None):
+    """
+    Cifra el contenido de ruta_entrada y lo escribe en ruta_salida.
+
+    - llave_fija: llave ASCII (se repite), o
+    - clave_maestra + nonce: llave dinámica
+    - formato: "base64" (texto imprimible) o "raw" (bytes crudos)
+    - progreso: función opcional progreso(bytes_procesados, bytes_totales)
+
+    Retorna los bytes de mensaje procesados.
+    """
+    _validar_parametros(formato, tam_bloque)
+    _validar_rutas(ruta_entrada, ruta_salida)
+
+    tam = os.path.getsize(ruta_entrada)
+    llave = _fuente_llave(llave_fija, clave_maestra, nonce, tam)
+
+    with open(ruta_entrada, "rb") as entrada, open(ruta_salida, "wb") as salida:
+        if tam == 0:
+            return 0
+
+        with mmap.mmap(entrada.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for inicio, fin in _bloques(mm, tam_bloque):
+                c_bytes = _aplicar_llave(mm[inicio:fin], llave(inicio, fin), backend)
+                if formato == "base64":
+                    salida.write(bytes_a_base64(c_bytes).encode("latin-1"))
+                else:
+                    salida.write(c_bytes)
+                if progreso is not None:
+                    progreso(fin, tam)
+
+    return tam
+
+
+def descifrar_archivo(ruta_entrada, ruta_salida, llave_fija=None, clave_maestra=None, nonce=None,
+                      formato="base64", tam_bloque=TAM_BLOQUE_ARCHIVO, backend=None, progreso=None):
+    """
+    Descifra ruta_entrada (Base64 o raw, según formato) y escribe el
+    mensaje original en ruta_salida. Mismos parámetros que cifrar_archivo;
+    en formato "base64", tam_bloque se refiere a bytes de mensaje.
+
+    Retorna los bytes de mensaje escritos.
+    """
+    _validar_parametros(formato, tam_bloque)
+    _validar_rutas(ruta_entrada, ruta_salida)
+
+    tam = os.path.getsize(ruta_entrada)
+    # la llave fija solo se valida hasta el largo del mensaje; para Base64
+    # basta una cota superior (3 bytes por cada 4 caracteres)
+    llave = _fuente_llave(llave_fija, clave_maestra, nonce,
+                          tam if formato == "raw" else tam // 4 * 3)
+
+    escritos = 0
+    with open(ruta_entrada, "rb") as entrada, open(ruta_salida, "wb") as salida:
+        if tam == 0:
+            return 0
+
+        with mmap.mmap(entrada.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if formato == "raw":
+                for inicio, fin in _bloques(mm, tam_bloque):
+                    salida.write(_aplicar_llave(mm[inicio:fin], llave(inicio, fin), backend))
+                    escritos = fin
+                    if progreso is not None:
+                        progreso(fin, tam)
+                return escritos
+
+            # Base64: el decodificador incremental acepta saltos de línea y
+            # reporta la posición de cualquier error en el archivo
+            dec = Base64Decoder()
+            for inicio, fin in _bloques(mm, tam_bloque // 3 * 4):
+                c_bytes = dec.update(mm[inicio:fin].decode("latin-1"))
+                if c_bytes:
+                    a, b = escritos, escritos + len(c_bytes)
+                    salida.write(_aplicar_llave(c_bytes, llave(a, b), backend))
+                    escritos = b
+                if progreso is not None:
+                    progreso(fin, tam)
+            dec.finalize()
+
+    if escritos == 0:
+        # mismo error que las funciones de stream_cipher_ascii
+        if llave_fija is not None:
+            raise ValueError("Las entradas no pueden estar vacías")
+        raise ValueError("La longitud debe ser > 0")
+    return escritos
+
+
+# ============================================================
+# 2) En sitio (solo raw)
+# ============================================================
+# XOR con la misma llave es su propia inversa: la misma función cifra un
+# archivo en claro y descifra uno cifrado, sin archivo de salida.
+
+def cifrar_archivo_en_sitio(ruta, llave_fija=None, clave_maestra=None, nonce=None,
+                            tam_bloque=TAM_BLOQUE_ARCHIVO, backend=None, progreso=None):
+    """
+    Aplica el XOR del stream cipher sobre el propio archivo (formato raw).
+    Llamarla dos veces con la misma llave deja el archivo como estaba.
+
+    Retorna los bytes procesados.
+    """
+    _validar_parametros("raw", tam_bloque)
+
+    tam = os.path.getsize(ruta)
+    llave = _fuente_llave(llave_fija, clave_maestra, nonce, tam)
+    if tam == 0:
+        return 0
+
+    with open(ruta, "r+b") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE) as mm:
+        for inicio, fin in _bloques(mm, tam_bloque):
+            mm[inicio:fin] = _aplicar_llave(mm[inicio:fin], llave(inicio, fin), backend)
+            # escribir el bloque a disco para no acumular páginas modificadas
+            mm.flush()
+            if progreso is not None:
+                progreso(fin, tam)
+
+    return tam
+
+
+descifrar_archivo_en_sitio = cifrar_archivo_en_sitio
+
+
+# ============================================================
+# Línea de comandos
+# ============================================================
+
+def _imprimir_progreso(procesados, total):
+    print(f"\r{procesados / total:6.1%}  ({procesados} / {total} bytes)", end="", file=sys.stderr)
+    if procesados == total:
+        print(file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m cifrado_archivos",
+        description="Cifra/descifra archivos con el stream cipher (llave fija o dinámica) vía mmap",
+    )
+    parser.add_argument("accion", choices=["cifrar", "descifrar", "en-sitio"])
+    parser.add_argument("entrada", help="archivo de entrada (o el archivo a modificar en en-sitio)")
+    parser.add_argument("salida", nargs="?", help="archivo de salida (no se usa en en-sitio)")
+    parser.add_argument("--llave", help="llave fija ASCII")
+    parser.add_argument("--clave-maestra", help="clave maestra de la llave dinámica")
+    parser.add_argument("--nonce", help="nonce de la llave dinámica")
+    parser.add_argument("--formato", choices=FORMATOS, default="base64",
+                        help="formato del archivo cifrado (por defecto base64)")
+    parser.add_argument("--tam-bloque", type=int, default=TAM_BLOQUE_ARCHIVO,
+                        help="bytes de mensaje por bloque (múltiplo de 3)")
+    parser.add_argument("--backend", choices=["python", "numpy"], help="backend del XOR")
+    parser.add_argument("--progreso", action="store_true", help="mostrar avance en stderr")
+    args = parser.parse_args(argv)
+
+    opciones = dict(
+        llave_fija=args.llave,
+        clave_maestra=args.clave_maestra,
+        nonce=args.nonce,
+        tam_bloque=args.tam_bloque,
+        backend=args.backend,
+        progreso=_imprimir_progreso if args.progreso else None,
+    )
+
+    try:
+        if args.accion == "en-sitio":
+            if args.salida is not None:
+                parser.error("en-sitio no usa archivo de salida")
+            cifrar_archivo_en_sitio(args.entrada, **opciones)
+        else:
+            if args.salida is None:
+                parser.error("falta el archivo de salida")
+            funcion = cifrar_archivo if args.accion == "cifrar" else descifrar_archivo
+            funcion(args.entrada, args.salida, formato=args.formato, **opciones)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,56 @@
+import os
+import re
+from array import array
+from collections import Counter
+from functools import lru_cache
+from itertools import accumulate
+
 from binario import ASCII_TABLE
+from buffer_salida import BufferSalida
 
 
 # ============================================================
 # Helpers
 # ============================================================
 
+# Clasificación de letras, construida una sola vez desde ASCII_TABLE:
+# carácter -> (es_letra, es_mayuscula, indice 0..25)
+# 'A'..'Z' => 65..90  |  'a'..'z' => 97..122
+_NO_LETRA = (False, False, -1)
+_CLASIFICACION = {}
+
+# índice -> letra: posiciones 0..25 = 'A'..'Z', 26..51 = 'a'..'z'
+_INDICE_A_LETRA = [None] * 52
+
+for _ch in ASCII_TABLE:
+    _code = ASCII_TABLE[_ch]
+    if 65 <= _code <= 90:
+        _CLASIFICACION[_ch] = (True, True, _code - 65)
+        _INDICE_A_LETRA[_code - 65] = _ch
+    elif 97 <= _code <= 122:
+        _CLASIFICACION[_ch] = (True, False, _code - 97)
+        _INDICE_A_LETRA[26 + _code - 97] = _ch
+
+if None in _INDICE_A_LETRA:
+    raise ValueError("ASCII_TABLE no contiene todas las letras A-Z y a-z")
+
+
+def _clasificar(c):
+    """(es_letra, es_mayuscula, indice) de c en una sola consulta."""
+    return _CLASIFICACION.get(c, _NO_LETRA)
+
+
 def _es_letra_ascii(c):
     """
     Retorna True si c es una letra ASCII A-Z o a-z.
-    (Usa ASCII_TABLE para evitar conversiones externas.)
+    (Usa la clasificación construida desde ASCII_TABLE.)
     """
-    if c not in ASCII_TABLE:
-        return False
-    code = ASCII_TABLE[c]
-    # 'A'..'Z' => 65..90  |  'a'..'z' => 97..122
-    return (65 <= code <= 90) or (97 <= code <= 122)
+    return _CLASIFICACION.get(c, _NO_LETRA)[0]
 
 
 def _es_mayuscula(c):
     """True si c está en 'A'..'Z'."""
-    if c not in ASCII_TABLE:
-        return False
-    code = ASCII_TABLE[c]
-    return 65 <= code <= 90
+    return _CLASIFICACION.get(c, _NO_LETRA)[1]
 
 
 def _letra_a_indice(c):
@@ -30,14 +58,10 @@ def _letra_a_indice(c):
     Convierte letra a índice 0..25.
     A/a -> 0, B/b -> 1, ..., Z/z -> 25
     """
-    if not _es_letra_ascii(c):
+    es_letra, _, indice = _CLASIFICACION.get(c, _NO_LETRA)
+    if not es_letra:
         raise ValueError(f"No es letra ASCII: {repr(c)}")
-
-    code = ASCII_TABLE[c]
-    if 65 <= code <= 90:      # mayúscula
-        return code - 65
-    else:                     # minúscula 97..122
-        return code - 97
+    return indice
 
 
 def _indice_a_letra(i, mayuscula=True):
@@ -49,33 +73,63 @@ def _indice_a_letra(i, mayuscula=True):
     if i < 0 or i > 25:
         raise ValueError("Índice fuera de rango (0..25)")
 
-    code = (65 + i) if mayuscula else (97 + i)
-
-    # Conveierte código ASCII a carácter usando una tabla inversa construida desde ASCII_TABLE
-    for ch in ASCII_TABLE:
-        if ASCII_TABLE[ch] == code:
-            return ch
-
-    raise ValueError("ASCII_TABLE no contiene el carácter esperado para ese código")
+    return _INDICE_A_LETRA[i if mayuscula else 26 + i]
 
 
 def _mod_26(n):
     """
-    Módulo 26 manual que funciona con negativos.
+    Módulo 26 que funciona con negativos (el % de Python ya da 0..25).
     """
-    while n < 0:
-        n += 26
-    while n >= 26:
-        n -= 26
-    return n
+    return n % 26
 
 
 def _normalizar_desplazamiento(desplazamiento):
     """Convierte cualquier entero a rango 0..25."""
-    # Si desplazamiento es negativo o grande, lo normalizamos con mod 26 manual.
+    # Si desplazamiento es negativo o grande, lo normalizamos con mod 26.
     return _mod_26(desplazamiento)
 
 
+# ============================================================
+# Tablas de traducción por desplazamiento (César / ROT13)
+# ============================================================
+
+# desplazamiento (0..25) -> (tabla para str.translate, tabla de 256 bytes)
+# Se construyen la primera vez que se usan y se reutilizan.
+_TABLAS_CESAR = {}
+
+
+def _tabla_cesar(k):
+    """
+    Tablas de traducción para desplazar letras k posiciones (k en 0..25).
+    Se arman con los mismos helpers que el cifrado letra por letra.
+    """
+    tablas = _TABLAS_CESAR.get(k)
+    if tablas is not None:
+        return tablas
+
+    mapa = {}
+    for ch in _CLASIFICACION:
+        _, mayuscula, idx = _clasificar(ch)
+        mapa[ASCII_TABLE[ch]] = _indice_a_letra(_mod_26(idx + k), mayuscula=mayuscula)
+
+    tabla_str = str.maketrans(mapa)
+    tabla_bytes = bytearray(range(256))
+    for code in mapa:
+        tabla_bytes[code] = ASCII_TABLE[mapa[code]]
+
+    tablas = (tabla_str, bytes(tabla_bytes))
+    _TABLAS_CESAR[k] = tablas
+    return tablas
+
+
+def _traducir(mensaje, tablas):
+    """Aplica la tabla en una sola pasada (ruta de bytes si el texto es ASCII)."""
+    tabla_str, tabla_bytes = tablas
+    if mensaje.isascii():
+        return mensaje.encode("ascii").translate(tabla_bytes).decode("ascii")
+    return mensaje.translate(tabla_str)
+
+
 # ============================================================
 # 1) Cifrado César
 # ============================================================
@@ -95,18 +149,8 @@ def cesar_cifrar(mensaje, desplazamiento):
     """
     k = _normalizar_desplazamiento(desplazamiento)
 
-    resultado = ""
-    for c in mensaje:
-        if not _es_letra_ascii(c):
-            # No se cifra: se copia tal cual
-            resultado += c
-            continue
-
-        idx = _letra_a_indice(c)
-        nuevo = _mod_26(idx + k)
-        resultado += _indice_a_letra(nuevo, mayuscula=_es_mayuscula(c))
-
-    return resultado
+    # Letras -> letra desplazada; todo lo demás se copia tal cual
+    return _traducir(mensaje, _tabla_cesar(k))
 
 
 def cesar_descifrar(mensaje, desplazamiento):
@@ -145,8 +189,9 @@ def _limpiar_clave_vigenere(clave):
     indices = []
 
     for c in clave:
-        if _es_letra_ascii(c):
-            indices.append(_letra_a_indice(c))
+        es_letra, _, indice = _clasificar(c)
+        if es_letra:
+            indices.append(indice)
 
     if len(indices) == 0:
         raise ValueError("La clave Vigenère debe contener al menos una letra")
@@ -154,6 +199,88 @@ def _limpiar_clave_vigenere(clave):
     return indices
 
 
+class ClaveVigenere:
+    """
+    Clave Vigenère ya procesada: desplazamientos y una tabla de bytes
+    (de _tabla_cesar) por posición de la clave, para cifrar y descifrar.
+    Se obtiene con compilar_clave_vigenere y se puede reutilizar.
+    """
+
+    def __init__(self, clave):
+        self.clave = clave
+        self.desplazamientos = _limpiar_clave_vigenere(clave)
+        self.tablas_cifrar = [_tabla_cesar(k)[1] for k in self.desplazamientos]
+        self.tablas_descifrar = [_tabla_cesar(_mod_26(-k))[1] for k in self.desplazamientos]
+
+    def __len__(self):
+        return len(self.desplazamientos)
+
+
+@lru_cache(maxsize=256)
+def compilar_clave_vigenere(clave):
+    """Devuelve la ClaveVigenere de clave (cacheada por texto de clave)."""
+    return ClaveVigenere(clave)
+
+
+def _clave_compilada(clave):
+    if isinstance(clave, ClaveVigenere):
+        return clave
+    return compilar_clave_vigenere(clave)
+
+
+# Letras ASCII como bytes (para quitarlas/separarlas de un solo paso)
+_LETRAS_BYTES = bytes(ASCII_TABLE[ch] for ch in _CLASIFICACION)
+_NO_LETRAS_BYTES = bytes(b for b in range(256) if b not in _LETRAS_BYTES)
+_RE_NO_LETRAS = re.compile(b"([" + re.escape(_NO_LETRAS_BYTES) + b"]+)")
+
+TAM_TROZO_VIGENERE = 1024 * 1024
+
+
+def _vigenere_trozo(datos, tablas, fase):
+    """
+    Aplica Vigenère a un trozo de bytes.
+    fase: cuántas letras se consumieron antes de este trozo (mod len(clave)).
+    Retorna (bytes resultado, nueva fase).
+
+    Las letras se separan del resto; la letra j usa la posición
+    (fase + j) % n de la clave, así que cada posición de la clave se aplica
+    a un slice con paso n de las letras. Luego se vuelven a intercalar.
+    """
+    n = len(tablas)
+    letras = bytearray(datos.translate(None, _NO_LETRAS_BYTES))
+
+    for pos in range(n):
+        desde = (pos - fase) % n
+        letras[desde::n] = letras[desde::n].translate(tablas[pos])
+
+    nueva_fase = (fase + len(letras)) % n
+    if len(letras) == len(datos):
+        return bytes(letras), nueva_fase
+
+    # split con grupo: [letras, no-letras, letras, no-letras, ..., letras]
+    partes = _RE_NO_LETRAS.split(datos)
+    cortes = [0]
+    cortes.extend(accumulate(map(len, partes[0::2])))
+    partes[0::2] = [letras[a:b] for a, b in zip(cortes, cortes[1:])]
+    return b"".join(partes), nueva_fase
+
+
+def _vigenere_transformar(mensaje, tablas, fase=0, tam_trozo=TAM_TROZO_VIGENERE):
+    """
+    Aplica Vigenère a un string por trozos, llevando la fase de la clave.
+    Retorna (string resultado, fase final).
+
+    El texto pasa a UTF-8: los caracteres no ASCII quedan como bytes >= 128,
+    que no son letras y por lo tanto no se cifran ni consumen clave.
+    """
+    salida = BufferSalida(texto=True)
+    for i in range(0, len(mensaje), tam_trozo):
+        datos = mensaje[i:i + tam_trozo].encode("utf-8", "surrogatepass")
+        trozo, fase = _vigenere_trozo(datos, tablas, fase)
+        salida.escribir(trozo.decode("utf-8", "surrogatepass"))
+    return salida.texto(), fase
+
+
 def vigenere_cifrar(mensaje, clave):
     """
     Cifra un mensaje usando el cifrado Vigenère.
@@ -162,24 +289,11 @@ def vigenere_cifrar(mensaje, clave):
     - Mantiene mayúsculas/minúsculas
     - La clave se repite cíclicamente
     - Caracteres no letra no se cifran ni consumen clave
-    """
-    clave_indices = _limpiar_clave_vigenere(clave)
-    resultado = ""
-
-    pos_clave = 0  # posición dentro de la clave
-
-    for c in mensaje:
-        if not _es_letra_ascii(c):
-            resultado += c
-            continue
-
-        shift = clave_indices[pos_clave % len(clave_indices)]
-        idx = _letra_a_indice(c)
-        nuevo = _mod_26(idx + shift)
-
-        resultado += _indice_a_letra(nuevo, mayuscula=_es_mayuscula(c))
-        pos_clave += 1
 
+    clave puede ser un string o una ClaveVigenere ya compilada.
+    """
+    compilada = _clave_compilada(clave)
+    resultado, _ = _vigenere_transformar(mensaje, compilada.tablas_cifrar)
     return resultado
 
 
@@ -188,29 +302,202 @@ def vigenere_descifrar(mensaje, clave):
     Descifra un mensaje cifrado con Vigenère.
     La lógica es la misma que cifrar, pero restando el desplazamiento.
     """
-    clave_indices = _limpiar_clave_vigenere(clave)
-    resultado = ""
+    compilada = _clave_compilada(clave)
+    resultado, _ = _vigenere_transformar(mensaje, compilada.tablas_descifrar)
+    return resultado
+
+# ============================================================
+# Streaming: César / ROT13 / Vigenère sobre archivos
+# ============================================================
+# entrada: archivo de texto (con .read) o iterable de strings.
+# salida: cualquier objeto con .write (archivo de texto, io.StringIO, ...).
+# El resultado es idéntico a aplicar la función al texto completo; la
+# memoria usada depende solo de tam_trozo.
 
-    pos_clave = 0
+TAM_TROZO_FLUJO = 1024 * 1024
 
-    for c in mensaje:
-        if not _es_letra_ascii(c):
-            resultado += c
-            continue
 
-        shift = clave_indices[pos_clave % len(clave_indices)]
-        idx = _letra_a_indice(c)
-        nuevo = _mod_26(idx - shift)
+def _leer_trozos(entrada, tam_trozo):
+    """Genera los trozos de texto de un archivo o de un iterable."""
+    if hasattr(entrada, "read"):
+        while True:
+            trozo = entrada.read(tam_trozo)
+            if not trozo:
+                return
+            yield trozo
+    else:
+        for trozo in entrada:
+            yield trozo
 
-        resultado += _indice_a_letra(nuevo, mayuscula=_es_mayuscula(c))
-        pos_clave += 1
 
-    return resultado
+def _cesar_flujo(entrada, salida, k, tam_trozo):
+    tablas = _tabla_cesar(_normalizar_desplazamiento(k))
+    for trozo in _leer_trozos(entrada, tam_trozo):
+        salida.write(_traducir(trozo, tablas))
+
+
+def cesar_cifrar_flujo(entrada, salida, desplazamiento, tam_trozo=TAM_TROZO_FLUJO):
+    """César por trozos: lee de entrada y escribe en salida."""
+    _cesar_flujo(entrada, salida, desplazamiento, tam_trozo)
+
+
+def cesar_descifrar_flujo(entrada, salida, desplazamiento, tam_trozo=TAM_TROZO_FLUJO):
+    """Descifra César por trozos."""
+    _cesar_flujo(entrada, salida, -_normalizar_desplazamiento(desplazamiento), tam_trozo)
+
+
+def rot13_flujo(entrada, salida, tam_trozo=TAM_TROZO_FLUJO):
+    """ROT13 por trozos."""
+    _cesar_flujo(entrada, salida, 13, tam_trozo)
+
+
+def _vigenere_flujo(entrada, salida, tablas, tam_trozo):
+    # la fase de la clave pasa de un trozo al siguiente
+    fase = 0
+    for trozo in _leer_trozos(entrada, tam_trozo):
+        resultado, fase = _vigenere_transformar(trozo, tablas, fase, tam_trozo)
+        salida.write(resultado)
+
+
+def vigenere_cifrar_flujo(entrada, salida, clave, tam_trozo=TAM_TROZO_FLUJO):
+    """
+    Vigenère por trozos: lee de entrada y escribe en salida.
+    La posición en la clave continúa entre trozos, así que el resultado es
+    el mismo que vigenere_cifrar sobre el texto completo.
+    """
+    _vigenere_flujo(entrada, salida, _clave_compilada(clave).tablas_cifrar, tam_trozo)
+
+
+def vigenere_descifrar_flujo(entrada, salida, clave, tam_trozo=TAM_TROZO_FLUJO):
+    """Descifra Vigenère por trozos."""
+    _vigenere_flujo(entrada, salida, _clave_compilada(clave).tablas_descifrar, tam_trozo)
+
 
 # ============================================================
 # 4) Análisis de Frecuencias
 # ============================================================
 
+# Tabla de bytes que pasa A..Z a a..z (las minúsculas quedan igual)
+_A_MINUSCULA = bytearray(range(256))
+for _ch in _CLASIFICACION:
+    _, _mayuscula, _idx = _CLASIFICACION[_ch]
+    if _mayuscula:
+        _A_MINUSCULA[ASCII_TABLE[_ch]] = ASCII_TABLE[_INDICE_A_LETRA[26 + _idx]]
+_A_MINUSCULA = bytes(_A_MINUSCULA)
+
+# código de 'a'..'z' (posición i -> letra i)
+_CODIGOS_MINUSCULAS = [ASCII_TABLE[ch] for ch in _INDICE_A_LETRA[26:]]
+
+
+class FrequencyCounter:
+    """
+    Contador de frecuencias de letras sobre un arreglo fijo de enteros.
+
+    - n=1: 26 casillas (A..Z); n=2 / n=3: 26**n casillas (bigramas / trigramas)
+    - update(trozo) suma un trozo (str o bytes); los n-gramas que cruzan
+      de un trozo al siguiente se cuentan igual que en el texto completo
+    - merge(otro) suma los conteos de otro contador (p. ej. de otro proceso)
+      que contó el texto que sigue a este; los n-gramas que cruzan el borde
+      se cuentan con la cola de este y la cabeza del otro, así que con n > 1
+      el orden de los merge debe ser el del texto
+    - tabla() devuelve la misma tabla que analisis_frecuencia
+
+    Los n-gramas se forman con las letras consecutivas, saltando todo lo que
+    no es letra (igual que la clave en Vigenère).
+    """
+
+    def __init__(self, n=1):
+        if n not in (1, 2, 3):
+            raise ValueError("n debe ser 1, 2 o 3")
+        self.n = n
+        self.conteos = array("q", [0]) * (26 ** n)
+        self.total = 0
+        self._cola = b""     # últimas n-1 letras del trozo anterior
+        self._cabeza = b""   # primeras n-1 letras (para merge)
+
+    def update(self, trozo):
+        """Suma las letras de un trozo (str, bytes, bytearray o memoryview)."""
+        if isinstance(trozo, str):
+            datos = trozo.encode("utf-8", "surrogatepass")
+        else:
+            datos = bytes(trozo)
+        letras = datos.translate(_A_MINUSCULA, _NO_LETRAS_BYTES)
+
+        if self.n == 1:
+            for i, codigo in enumerate(_CODIGOS_MINUSCULAS):
+                self.conteos[i] += letras.count(codigo)
+            self.total += len(letras)
+            return self
+
+        if len(self._cabeza) < self.n - 1:
+            self._cabeza = (self._cabeza + letras)[:self.n - 1]
+        letras = self._cola + letras
+        self._cola = letras[len(letras) - (self.n - 1):]
+        self._sumar_ngramas(letras)
+        return self
+
+    def _sumar_ngramas(self, letras):
+        """Suma los n-gramas de letras (bytes 'a'..'z' consecutivos)."""
+        if len(letras) < self.n:
+            return
+
+        # cada n-grama como tupla de códigos; Counter los agrupa en C
+        desplazados = [letras[i:] for i in range(self.n)]
+        for ngrama, conteo in Counter(zip(*desplazados)).items():
+            indice = 0
+            for codigo in ngrama:
+                indice = indice * 26 + (codigo - 97)
+            self.conteos[indice] += conteo
+            self.total += conteo
+
+    def merge(self, otro):
+        """
+        Suma los conteos de otro FrequencyCounter con el mismo n, como si su
+        texto siguiera al de este.
+        """
+        if otro.n != self.n:
+            raise ValueError("Solo se pueden combinar contadores con el mismo n")
+        if self.n > 1:
+            # cola (<= n-1 letras) + cabeza (<= n-1): todo n-grama de aquí
+            # cruza el borde, ninguno lo contó antes un contador solo
+            self._sumar_ngramas(self._cola + otro._cabeza)
+            if len(self._cabeza) < self.n - 1:
+                self._cabeza = (self._cabeza + otro._cabeza)[:self.n - 1]
+            cola = self._cola + otro._cola
+            self._cola = cola[len(cola) - (self.n - 1):]
+        for i, conteo in enumerate(otro.conteos):
+            if conteo:
+                self.conteos[i] += conteo
+        self.total += otro.total
+        return self
+
+    def _etiqueta(self, indice):
+        letras = ""
+        for _ in range(self.n):
+            letras = _indice_a_letra(indice % 26, mayuscula=True) + letras
+            indice //= 26
+        return letras
+
+    def tabla(self):
+        """
+        Lista de (letra, conteo, porcentaje) de mayor a menor frecuencia.
+        Con n=1 incluye las 26 letras; con n>1 solo los n-gramas que aparecen.
+        """
+        tabla = []
+        for i, count in enumerate(self.conteos):
+            if self.n > 1 and count == 0:
+                continue
+            if self.total > 0:
+                porcentaje = (count / self.total) * 100
+            else:
+                porcentaje = 0.0
+            tabla.append((self._etiqueta(i), count, porcentaje))
+
+        # Ordenar por frecuencia descendente
+        tabla.sort(key=lambda x: x[1], reverse=True)
+        return tabla
+
+
 def analisis_frecuencia(mensaje):
     """
     Analiza la frecuencia de letras en un mensaje.
@@ -223,38 +510,96 @@ def analisis_frecuencia(mensaje):
     - lista de tuplas: (letra, conteo, porcentaje)
       ordenada de mayor a menor frecuencia
     """
-    # Inicializar conteo para A..Z
-    conteo = {}
-    for i in range(26):
-        letra = _indice_a_letra(i, mayuscula=True)
-        conteo[letra] = 0
-
-    total_letras = 0
-
-    # Contar ocurrencias
-    for c in mensaje:
-        if _es_letra_ascii(c):
-            idx = _letra_a_indice(c)
-            letra = _indice_a_letra(idx, mayuscula=True)
-            conteo[letra] += 1
-            total_letras += 1
-
-    # Construir tabla de frecuencias
-    tabla = []
-
-    for letra in conteo:
-        count = conteo[letra]
-        if total_letras > 0:
-            porcentaje = (count / total_letras) * 100
-        else:
-            porcentaje = 0.0
+    return FrequencyCounter().update(mensaje).tabla()
 
-        tabla.append((letra, count, porcentaje))
+# ============================================================
+# 5) Análisis de frecuencias en paralelo (muchos archivos)
+# ============================================================
+# Los archivos se cortan en rangos de bytes (shards) y cada shard se cuenta
+# en un proceso. Las letras A-Z/a-z son bytes ASCII que nunca aparecen
+# dentro de un carácter UTF-8 de varios bytes, así que cortar en cualquier
+# byte no cambia el conteo y no hace falta decodificar.
+
+TAM_SHARD = 16 * 1024 * 1024
+TAM_LECTURA = 1024 * 1024
+
+
+def _shards_de_archivos(rutas, tam_shard):
+    """Lista de (ruta, inicio, fin) que cubre todos los archivos."""
+    shards = []
+    for ruta in rutas:
+        tam = os.path.getsize(ruta)
+        for inicio in range(0, tam, tam_shard):
+            shards.append((ruta, inicio, min(inicio + tam_shard, tam)))
+    return shards
+
+
+def _contar_shard(shard, n=1):
+    """Trabajo de un proceso: cuenta los n-gramas del rango [inicio, fin) de un archivo."""
+    ruta, inicio, fin = shard
+    contador = FrequencyCounter(n)
+    with open(ruta, "rb") as f:
+        f.seek(inicio)
+        pendiente = fin - inicio
+        while pendiente > 0:
+            datos = f.read(min(TAM_LECTURA, pendiente))
+            if not datos:
+                break
+            contador.update(datos)
+            pendiente -= len(datos)
+    return contador, fin - inicio
+
+
+def analisis_frecuencia_archivos(rutas, workers=None, tam_shard=TAM_SHARD, progreso=None, n=1):
+    """
+    Igual que analisis_frecuencia sobre el contenido de todos los archivos,
+    repartiendo los shards en un pool de procesos.
 
-    # Ordenar por frecuencia descendente
-    tabla.sort(key=lambda x: x[1], reverse=True)
+    - rutas: lista de rutas (o una sola ruta)
+    - workers: número de procesos (None = núcleos disponibles, 1 = sin pool)
+    - progreso: función opcional progreso(bytes_procesados, bytes_totales),
+      llamada cada vez que termina un shard
+    - n: 1 letras, 2 bigramas, 3 trigramas (como FrequencyCounter); los
+      n-gramas que cruzan de un shard o archivo al siguiente también cuentan
+
+    Retorna la misma tabla que analisis_frecuencia (o FrequencyCounter(n)).
+    """
+    if isinstance(rutas, (str, os.PathLike)):
+        rutas = [rutas]
+    if tam_shard <= 0:
+        raise ValueError("tam_shard debe ser > 0")
+
+    shards = _shards_de_archivos(rutas, tam_shard)
+    total_bytes = sum(fin - inicio for _, inicio, fin in shards)
+
+    contadores = [None] * len(shards)
+    procesados = 0
+
+    def registrar(i, resultado):
+        nonlocal procesados
+        contador, n_bytes = resultado
+        contadores[i] = contador
+        procesados += n_bytes
+        if progreso is not None:
+            progreso(procesados, total_bytes)
+
+    if workers == 1 or len(shards) <= 1:
+        for i, shard in enumerate(shards):
+            registrar(i, _contar_shard(shard, n))
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            futuros = {ex.submit(_contar_shard, shard, n): i for i, shard in enumerate(shards)}
+            for futuro in as_completed(futuros):
+                registrar(futuros[futuro], futuro.result())
+
+    # merge en el orden de los shards: los n-gramas cruzan al siguiente
+    total = FrequencyCounter(n)
+    for contador in contadores:
+        total.merge(contador)
+    return total.tabla()
 
-    return tabla
 
 # ============================================================
 # Pruebas rápidas
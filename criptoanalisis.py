@@ -0,0 +1,218 @@
+# criptoanalisis.py
+# Ruptura automática de César y Vigenère a partir de frecuencias de letras.
+#
+# - César: se prueban los 26 desplazamientos con chi-cuadrado contra las
+#   frecuencias de referencia del idioma.
+# - Vigenère: se estima la longitud de la clave con el índice de coincidencia
+#   y cada columna de la clave se rompe como un César independiente.
+#
+# El histograma del texto se calcula una sola vez; para puntuar cada
+# desplazamiento solo se rota (no se vuelve a descifrar el texto).
+
+from cifrados_historicos import (
+    FrequencyCounter,
+    _A_MINUSCULA,
+    _NO_LETRAS_BYTES,
+    _letra_a_indice,
+    _indice_a_letra,
+    cesar_descifrar,
+    vigenere_descifrar,
+)
+
+# Frecuencias de referencia (% de cada letra A..Z en textos del idioma)
+FRECUENCIAS_ESPANOL = [
+    11.525, 2.215, 4.019, 5.010, 12.181, 0.692, 1.768, 0.703, 6.247,
+    0.493, 0.011, 4.967, 3.157, 6.712, 8.683, 2.510, 0.877, 6.871,
+    7.977, 4.632, 2.927, 1.138, 0.017, 0.215, 1.008, 0.467,
+]
+
+FRECUENCIAS_INGLES = [
+    8.167, 1.492, 2.782, 4.253, 12.702, 2.228, 2.015, 6.094, 6.966,
+    0.153, 0.772, 4.025, 2.406, 6.749, 7.507, 1.929, 0.095, 5.987,
+    6.327, 9.056, 2.758, 0.978, 2.360, 0.150, 1.974, 0.074,
+]
+
+IDIOMAS = {
+    "es": FRECUENCIAS_ESPANOL,
+    "en": FRECUENCIAS_INGLES,
+}
+
+# Longitud máxima de clave Vigenère que se prueba por defecto
+MAX_LONGITUD_CLAVE = 20
+
+# Para estimar la longitud de la clave basta una muestra de letras
+MUESTRA_LONGITUD_CLAVE = 200000
+
+
+# ============================================================
+# Histogramas
+# ============================================================
+
+def _solo_letras(texto):
+    """Texto -> bytes con solo sus letras, en minúscula ('Ab c!' -> b'abc')."""
+    datos = texto.encode("utf-8", "surrogatepass")
+    return datos.translate(_A_MINUSCULA, _NO_LETRAS_BYTES)
+
+
+def _histograma(letras):
+    """Letras (bytes) -> lista de 26 conteos (A..Z) con FrequencyCounter."""
+    return list(FrequencyCounter().update(letras).conteos)
+
+
+def conteos_desde_tabla(tabla):
+    """
+    Tabla de analisis_frecuencia [(letra, conteo, porcentaje), ...]
+    -> lista de 26 conteos en orden A..Z.
+    """
+    conteos = [0] * 26
+    for letra, conteo, _ in tabla:
+        conteos[_letra_a_indice(letra)] = conteo
+    return conteos
+
+
+# ============================================================
+# Estadísticos
+# ============================================================
+
+def _frecuencias_idioma(idioma):
+    if idioma not in IDIOMAS:
+        raise ValueError(f"Idioma no soportado: {idioma}. Usa: {', '.join(IDIOMAS)}")
+    return IDIOMAS[idioma]
+
+
+def chi_cuadrado(conteos, frecuencias):
+    """Chi-cuadrado de 26 conteos contra frecuencias de referencia (en %)."""
+    total = sum(conteos)
+    if total == 0:
+        return 0.0
+
+    suma_ref = sum(frecuencias)
+    chi = 0.0
+    for observado, ref in zip(conteos, frecuencias):
+        esperado = total * ref / suma_ref
+        chi += (observado - esperado) ** 2 / esperado
+    return chi
+
+
+def indice_coincidencia(conteos):
+    """Probabilidad de que dos letras tomadas al azar sean iguales."""
+    n = sum(conteos)
+    if n < 2:
+        return 0.0
+    return sum(c * (c - 1) for c in conteos) / (n * (n - 1))
+
+
+def puntuar_desplazamientos(conteos, idioma="es"):
+    """
+    Chi-cuadrado de cada desplazamiento César (0..25), de mejor a peor.
+    Retorna lista de (desplazamiento, chi_cuadrado).
+
+    Descifrar con desplazamiento k lleva la letra (i + k) a la i, así que
+    el histograma descifrado es el original rotado k posiciones.
+    """
+    frecuencias = _frecuencias_idioma(idioma)
+    puntajes = []
+    for k in range(26):
+        rotado = conteos[k:] + conteos[:k]
+        puntajes.append((k, chi_cuadrado(rotado, frecuencias)))
+    puntajes.sort(key=lambda x: x[1])
+    return puntajes
+
+
+# ============================================================
+# 1) César
+# ============================================================
+
+def romper_cesar(mensaje_cifrado, idioma="es"):
+    """
+    Encuentra el desplazamiento César más probable.
+
+    Retorna: (desplazamiento, mensaje_descifrado)
+    """
+    conteos = _histograma(_solo_letras(mensaje_cifrado))
+    k = puntuar_desplazamientos(conteos, idioma)[0][0]
+    return k, cesar_descifrar(mensaje_cifrado, k)
+
+
+# ============================================================
+# 2) Vigenère
+# ============================================================
+
+def estimar_longitud_clave(mensaje_cifrado, max_longitud=MAX_LONGITUD_CLAVE):
+    """
+    Estima la longitud de la clave Vigenère con el índice de coincidencia.
+
+    Para cada longitud L se separan las letras en L columnas (la letra j va
+    a la columna j % L, igual que la clave). Con la L correcta cada columna
+    es un César y su IC se parece al del idioma (~0.07); si no, se parece
+    al de letras al azar (~0.038).
+
+    Retorna: lista de (longitud, ic_promedio), de mayor a menor IC.
+    """
+    letras = _solo_letras(mensaje_cifrado)[:MUESTRA_LONGITUD_CLAVE]
+    if len(letras) < 2:
+        raise ValueError("El mensaje no tiene suficientes letras para el análisis")
+
+    resultados = []
+    for L in range(1, min(max_longitud, len(letras) // 2 or 1) + 1):
+        ics = [indice_coincidencia(_histograma(letras[r::L])) for r in range(L)]
+        resultados.append((L, sum(ics) / L))
+
+    resultados.sort(key=lambda x: x[1], reverse=True)
+    return resultados
+
+
+def _elegir_longitud(puntajes):
+    """
+    Los múltiplos de la longitud real también dan IC alto; se elige la
+    longitud más corta cuyo IC está cerca del mejor.
+    """
+    mejor = puntajes[0][1]
+    candidatas = [L for L, ic in puntajes if ic >= 0.9 * mejor]
+    return min(candidatas)
+
+
+def romper_vigenere(mensaje_cifrado, idioma="es", longitud=None, max_longitud=MAX_LONGITUD_CLAVE):
+    """
+    Recupera la clave Vigenère y descifra el mensaje.
+    Si no se pasa longitud, se estima con estimar_longitud_clave.
+
+    Retorna: (clave, mensaje_descifrado)
+    """
+    if longitud is None:
+        longitud = _elegir_longitud(estimar_longitud_clave(mensaje_cifrado, max_longitud))
+
+    letras = _solo_letras(mensaje_cifrado)
+    if len(letras) == 0:
+        raise ValueError("El mensaje no tiene letras para el análisis")
+
+    # cada columna es un César independiente
+    clave = ""
+    for r in range(longitud):
+        conteos = _histograma(letras[r::longitud])
+        k = puntuar_desplazamientos(conteos, idioma)[0][0]
+        clave += _indice_a_letra(k, mayuscula=True)
+
+    return clave, vigenere_descifrar(mensaje_cifrado, clave)
+
+
+if __name__ == "__main__":
+    from cifrados_historicos import cesar_cifrar, vigenere_cifrar
+
+    texto = (
+        "El cifrado de Vigenere fue considerado durante siglos como indescifrable. "
+        "Sin embargo, con suficiente texto es posible encontrar la longitud de la "
+        "clave y luego romper cada columna como si fuera un cifrado Cesar, usando "
+        "las frecuencias de las letras del idioma espanol. "
+    ) * 4
+
+    c = cesar_cifrar(texto, 7)
+    k, p = romper_cesar(c)
+    print("César -> desplazamiento encontrado:", k)
+    print("Descifrado:", p[:60], "...")
+
+    c = vigenere_cifrar(texto, "CLAVE")
+    print("\nLongitudes candidatas:", estimar_longitud_clave(c)[:3])
+    clave, p = romper_vigenere(c)
+    print("Vigenère -> clave encontrada:", clave)
+    print("Descifrado:", p[:60], "...")
@@ -0,0 +1,389 @@
+# instrumentacion.py
+# Contadores por etapa para la cadena ASCII -> BINARIO -> XOR -> BASE64.
+#
+# Desactivada no cuesta nada: las funciones de binario, base64, xor y
+# stream_cipher_ascii quedan intactas. Al activarla, cada punto de entrada se
+# reemplaza por una envoltura que mide llamadas, bytes de entrada y
+# nanosegundos, y se restaura el original al desactivarla.
+#
+# Uso:
+#   import instrumentacion
+#
+#   with instrumentacion.instrumentar():
+#       cifrar_ascii_llave_dinamica_a_base64(mensaje, "K", "0001")
+#   print(instrumentacion.exportar_prometheus())
+#
+#   with instrumentacion.perfilar() as perfil:   # cProfile + tracemalloc
+#       ...
+#   perfil.imprimir()
+#
+#   python instrumentacion.py        -> tabla por etapa de un cifrado de ejemplo
+#
+# Las referencias se reemplazan en los módulos de MODULOS_PROYECTO. Código
+# externo que hizo "from stream_cipher_ascii import f" antes de activar
+# conserva la f original: para medirla, llamar stream_cipher_ascii.f(...).
+
+import cProfile
+import importlib
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+
+# puntos de entrada medidos, por módulo
+ETAPAS = {
+    "binario": [
+        "texto_a_bytes",
+        "bytes_a_texto",
+        "bytes_a_binario",
+        "binario_a_bytes",
+        "texto_a_ascii_binario",
+        "ascii_binario_a_texto",
+    ],
+    "base64": [
+        "bytes_a_base64",
+        "base64_a_bytes",
+        "binario_a_base64",
+        "base64_a_binario",
+        "ascii_a_base64",
+        "base64_a_ascii",
+    ],
+    "xor": [
+        "xor_binario",
+        "xor_bytes",
+    ],
+    "stream_cipher_ascii": [
+        "generar_llave_dinamica_ascii",
+        "_generar_llave_dinamica_bytes",
+        "_aplicar_llave",
+        "cifrar_ascii_llave_fija_a_base64",
+        "descifrar_base64_con_llave_fija",
+        "cifrar_ascii_llave_dinamica_a_base64",
+        "descifrar_base64_con_llave_dinamica",
+        "descifrar_rango_base64_con_llave_fija",
+        "descifrar_rango_base64_con_llave_dinamica",
+        "cifrar_lote_llave_fija_a_base64",
+        "descifrar_lote_base64_con_llave_fija",
+        "cifrar_lote_llave_dinamica_a_base64",
+        "descifrar_lote_base64_con_llave_dinamica",
+    ],
+}
+
+# módulos del proyecto que importan funciones con "from x import f": también
+# hay que reemplazar esas referencias para que las llamadas internas se midan
+MODULOS_PROYECTO = [
+    "binario",
+    "base64",
+    "xor",
+    "stream_cipher_ascii",
+    "stream_cipher_async",
+    "cifrado_archivos",
+    "benchmarks",
+]
+
+
+# ============================================================
+# Registro de contadores
+# ============================================================
+
+class _Etapa:
+    __slots__ = ("llamadas", "bytes", "ns", "ns_propios")
+
+    def __init__(self):
+        self.llamadas = 0
+        self.bytes = 0
+        self.ns = 0          # tiempo total, incluye etapas anidadas
+        self.ns_propios = 0  # sin las etapas medidas que llamó
+
+    def como_dict(self):
+        return {
+            "llamadas": self.llamadas,
+            "bytes": self.bytes,
+            "ns": self.ns,
+            "ns_propios": self.ns_propios,
+        }
+
+
+_etapas = {}
+_lock = threading.Lock()
+_local = threading.local()   # pila de tiempos de etapas hijas por hilo
+_hooks = []
+_originales = {}             # (modulo, nombre) -> función original
+
+
+def _registrar(etapa, n_bytes, ns, ns_propios):
+    with _lock:
+        e = _etapas.get(etapa)
+        if e is None:
+            e = _etapas[etapa] = _Etapa()
+        e.llamadas += 1
+        e.bytes += n_bytes
+        e.ns += ns
+        e.ns_propios += ns_propios
+
+    for hook in _hooks:
+        hook(etapa, n_bytes, ns)
+
+
+def _tamano_entrada(args):
+    """
+    len() del primer argumento (caracteres o bytes); si es un entero, la
+    longitud pedida (generar_llave_dinamica_ascii). 0 en otro caso.
+    """
+    if not args:
+        return 0
+    if isinstance(args[0], int):
+        return args[0]
+    try:
+        return len(args[0])
+    except TypeError:
+        return 0
+
+
+def _envolver(etapa, funcion):
+    @wraps(funcion)
+    def medida(*args, **kwargs):
+        pila = getattr(_local, "pila", None)
+        if pila is None:
+            pila = _local.pila = []
+        pila.append(0)
+        inicio = time.perf_counter_ns()
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            ns = time.perf_counter_ns() - inicio
+            hijas = pila.pop()
+            if pila:
+                pila[-1] += ns
+            _registrar(etapa, _tamano_entrada(args), ns, ns - hijas)
+
+    return medida
+
+
+# ============================================================
+# Activar / desactivar
+# ============================================================
+
+def activa():
+    """True si los puntos de entrada están instrumentados."""
+    return bool(_originales)
+
+
+def activar():
+    """
+    Reemplaza los puntos de entrada de ETAPAS por versiones medidas, en su
+    módulo y en cada módulo del proyecto que los haya importado por nombre.
+    Llamarla dos veces no envuelve dos veces.
+    """
+    if _originales:
+        return
+
+    reemplazos = {}
+    for nombre_modulo, funciones in ETAPAS.items():
+        modulo = importlib.import_module(nombre_modulo)
+        for nombre in funciones:
+            original = getattr(modulo, nombre)
+            reemplazos[id(original)] = (original, _envolver(f"{nombre_modulo}.{nombre}", original))
+
+    for nombre_modulo in MODULOS_PROYECTO:
+        modulo = sys.modules.get(nombre_modulo)
+        if modulo is None:
+            continue
+        for nombre, valor in list(vars(modulo).items()):
+            par = reemplazos.get(id(valor))
+            if par is not None and par[0] is valor:
+                _originales[(nombre_modulo, nombre)] = valor
+                setattr(modulo, nombre, par[1])
+
+
+def desactivar():
+    """Restaura las funciones originales (los contadores se conservan)."""
+    for (nombre_modulo, nombre), original in _originales.items():
+        setattr(sys.modules[nombre_modulo], nombre, original)
+    _originales.clear()
+
+
+def reiniciar():
+    """Pone todos los contadores en cero."""
+    with _lock:
+        _etapas.clear()
+
+
+@contextmanager
+def instrumentar(reiniciar_contadores=True):
+    """
+    Activa la instrumentación dentro del bloque.
+
+    with instrumentar():
+        ...
+    estadisticas()
+    """
+    ya_activa = activa()
+    if reiniciar_contadores:
+        reiniciar()
+    activar()
+    try:
+        yield
+    finally:
+        if not ya_activa:
+            desactivar()
+
+
+# ============================================================
+# Hooks
+# ============================================================
+# Un hook es una función hook(etapa, n_bytes, ns) que se llama después de
+# cada llamada medida, para reenviar los datos a otro sistema de métricas.
+# Se ejecuta en el hilo de la llamada: debe ser rápido y no lanzar errores.
+
+def agregar_hook(hook):
+    if hook not in _hooks:
+        _hooks.append(hook)
+    return hook
+
+
+def quitar_hook(hook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+# ============================================================
+# Exportar
+# ============================================================
+
+def estadisticas():
+    """{etapa: {"llamadas", "bytes", "ns", "ns_propios"}}, ordenado por etapa."""
+    with _lock:
+        return {etapa: _etapas[etapa].como_dict() for etapa in sorted(_etapas)}
+
+
+def exportar_json(indent=2):
+    return json.dumps(estadisticas(), indent=indent, ensure_ascii=False)
+
+
+def exportar_prometheus(prefijo="codec"):
+    """Contadores en formato de texto de Prometheus (tiempos en segundos)."""
+    datos = estadisticas()
+    metricas = [
+        ("llamadas_total", "Llamadas por etapa", lambda d: d["llamadas"]),
+        ("bytes_total", "Tamaño de entrada acumulado (bytes o caracteres)", lambda d: d["bytes"]),
+        ("segundos_total", "Tiempo acumulado, incluye etapas anidadas", lambda d: d["ns"] / 1e9),
+        ("segundos_propios_total", "Tiempo acumulado sin etapas anidadas", lambda d: d["ns_propios"] / 1e9),
+    ]
+
+    lineas = []
+    for sufijo, ayuda, valor in metricas:
+        nombre = f"{prefijo}_{sufijo}"
+        lineas.append(f"# HELP {nombre} {ayuda}")
+        lineas.append(f"# TYPE {nombre} counter")
+        for etapa, d in datos.items():
+            lineas.append(f'{nombre}{{etapa="{etapa}"}} {valor(d)}')
+    return "\n".join(lineas) + "\n"
+
+
+def imprimir_tabla(datos=None):
+    """Etapas ordenadas por tiempo propio, de mayor a menor."""
+    if datos is None:
+        datos = estadisticas()
+    total_propio = sum(d["ns_propios"] for d in datos.values()) or 1
+
+    print(f"{'Etapa':<58} | {'Llamadas':>8} | {'MB':>8} | {'Total ms':>9} | {'Propio ms':>9} | {'%':>5}")
+    print("-" * 111)
+    for etapa, d in sorted(datos.items(), key=lambda par: -par[1]["ns_propios"]):
+        print(f"{etapa:<58} | {d['llamadas']:>8} | {d['bytes'] / 2**20:8.2f} | "
+              f"{d['ns'] / 1e6:9.2f} | {d['ns_propios'] / 1e6:9.2f} | "
+              f"{100 * d['ns_propios'] / total_propio:5.1f}")
+
+
+# ============================================================
+# Perfil de un bloque (cProfile / tracemalloc)
+# ============================================================
+
+class Perfil:
+    """Resultado de perfilar(): estadísticas de cProfile y memoria."""
+
+    def __init__(self):
+        self.stats = None           # pstats.Stats (o None sin cprofile)
+        self.snapshot = None        # tracemalloc.Snapshot (o None sin memoria)
+        self.pico_bytes = None
+        self.segundos = None
+
+    def resumen_cprofile(self, orden="cumulative", limite=15):
+        if self.stats is None:
+            return ""
+        salida = io.StringIO()
+        self.stats.stream = salida
+        self.stats.sort_stats(orden).print_stats(limite)
+        return salida.getvalue()
+
+    def resumen_memoria(self, limite=10):
+        if self.snapshot is None:
+            return ""
+        lineas = [str(s) for s in self.snapshot.statistics("lineno")[:limite]]
+        return "\n".join(lineas)
+
+    def imprimir(self, limite=15):
+        print(f"Tiempo: {self.segundos:.4f} s")
+        if self.pico_bytes is not None:
+            print(f"Memoria pico: {self.pico_bytes / 2**20:.2f} MB")
+        if self.stats is not None:
+            print(self.resumen_cprofile(limite=limite))
+        if self.snapshot is not None:
+            print(self.resumen_memoria(limite=limite))
+
+
+@contextmanager
+def perfilar(cprofile=True, memoria=True):
+    """
+    Perfila el bloque con cProfile y/o tracemalloc.
+
+    with perfilar() as perfil:
+        cifrar_ascii_llave_fija_a_base64(mensaje, "CLAVE")
+    perfil.imprimir()
+
+    tracemalloc no se detiene si ya estaba activo antes del bloque.
+    """
+    perfil = Perfil()
+    traza_previa = tracemalloc.is_tracing()
+    if memoria and not traza_previa:
+        tracemalloc.start()
+    if memoria:
+        tracemalloc.reset_peak()
+
+    perfilador = cProfile.Profile() if cprofile else None
+    inicio = time.perf_counter()
+    if perfilador is not None:
+        perfilador.enable()
+    try:
+        yield perfil
+    finally:
+        if perfilador is not None:
+            perfilador.disable()
+        perfil.segundos = time.perf_counter() - inicio
+        if perfilador is not None:
+            perfil.stats = pstats.Stats(perfilador)
+        if memoria:
+            _, perfil.pico_bytes = tracemalloc.get_traced_memory()
+            perfil.snapshot = tracemalloc.take_snapshot()
+            if not traza_previa:
+                tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    import stream_cipher_ascii
+
+    mensaje = "Hola Mundo 123! Texto de prueba, con signos; y (parentesis).\n" * 4096
+
+    with instrumentar():
+        c = stream_cipher_ascii.cifrar_ascii_llave_dinamica_a_base64(mensaje, "MASTERKEY", "0001")
+        stream_cipher_ascii.descifrar_base64_con_llave_dinamica(c, "MASTERKEY", "0001")
+
+    print(f"Cifrar + descifrar {len(mensaje)} caracteres (llave dinámica)\n")
+    imprimir_tabla()
+    print()
+    print(exportar_prometheus())
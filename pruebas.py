@@ -1,18 +1,27 @@
+import binascii
+import hashlib
+import os
+import random
+import tempfile
+
 from binario import (
     texto_a_ascii_binario_lista,
     texto_a_ascii_binario,
-    ascii_binario_a_texto
+    ascii_binario_a_texto,
 )
 
 from base64 import (
     base64_a_binario,
     binario_a_base64,
     base64_a_ascii,
-    ascii_a_base64
+    ascii_a_base64,
 )
 
 from xor import xor_binario
 
+import stream_cipher_ascii
+from cifrados_historicos import FrequencyCounter, analisis_frecuencia_archivos
+
 
 def imprimir_titulo(titulo):
     print("\n" + "=" * 60)
@@ -102,11 +111,290 @@ def prueba_xor():
     print("Descifrado2 -> ASCII:", ascii_binario_a_texto(dec2, acepta_espacios=False))
 
 
+# ============================================================
+# Stream cipher de una pasada vs. referencia congelada
+# ============================================================
+# Referencias: el flujo original sobre el mensaje completo (texto -> bytes,
+# XOR, Base64), escrito aquí solo con la biblioteca estándar y sin usar las
+# funciones del repo, para que un cambio en ellas no cambie también lo
+# esperado. Las funciones de stream_cipher_ascii lo hacen por trozos y deben
+# dar la misma salida y el mismo error, en el mismo orden de prioridad
+# (mensaje/Base64 antes que llave).
+
+_REF_ASCII = (
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+    " \n\t.,;:!?()\"'-_/"
+)
+_REF_ALFABETO_LLAVE = _REF_ASCII.replace("\n", "").replace("\t", "")
+_REF_BASE64 = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+
+
+def _ref_texto_a_bytes(texto, estricto):
+    for c in texto:
+        if (c not in _REF_ASCII) if estricto else ord(c) > 255:
+            raise ValueError(f"Carácter no soportado: {c!r}")
+    return texto.encode("latin-1")
+
+
+def _ref_bytes_a_texto(datos, estricto):
+    for b in datos:
+        if estricto and chr(b) not in _REF_ASCII:
+            raise ValueError(f"Código ASCII no soportado: {b}")
+    return datos.decode("latin-1")
+
+
+def _ref_xor(datos, llave):
+    return bytes(b ^ llave[i % len(llave)] for i, b in enumerate(datos))
+
+
+def _ref_base64(datos):
+    return binascii.b2a_base64(datos, newline=False).decode("ascii")
+
+
+def _ref_base64_a_bytes(texto):
+    s = "".join(c for c in texto if c not in " \n\t\r")
+    if len(s) % 4 != 0:
+        raise ValueError("Base64 inválido: la longitud debe ser múltiplo de 4")
+    if "=" in s[:-4]:
+        raise ValueError("Base64 inválido: '=' solo puede aparecer en el último bloque")
+
+    salida = b""
+    for i in range(0, len(s), 4):
+        bloque = s[i:i + 4]
+        pad = bloque.count("=")
+        if pad > 2:
+            raise ValueError("Base64 inválido: padding incorrecto")
+        valor = 0
+        for c in bloque:
+            if c != "=" and c not in _REF_BASE64:
+                raise ValueError(f"Carácter Base64 inválido: {c}")
+            valor = (valor << 6) | max(_REF_BASE64.find(c), 0)
+        salida += valor.to_bytes(3, "big")[:3 - pad]
+    return salida
+
+
+def _ref_llave_dinamica(n, clave, nonce):
+    """Keystream original: hash de clave|nonce y LCG sobre el alfabeto de llave."""
+    if n <= 0:
+        raise ValueError("La longitud debe ser > 0")
+    estado = 0
+    for c in str(clave) + "|" + str(nonce):
+        estado = (estado * 131 + ord(c)) % 2**32
+    llave = bytearray()
+    for _ in range(n):
+        estado = (1664525 * estado + 1013904223) % 2**32
+        llave.append(ord(_REF_ALFABETO_LLAVE[estado % len(_REF_ALFABETO_LLAVE)]))
+    return bytes(llave)
+
+
+def _ref_cifrar_fija(mensaje, llave, estricto):
+    if len(mensaje) == 0:
+        return ""
+    if len(llave) == 0:
+        raise ValueError("La llave no puede ser vacía")
+    m_bytes = _ref_texto_a_bytes(mensaje, estricto)
+    k_bytes = _ref_texto_a_bytes(llave[:len(mensaje)], estricto)
+    return _ref_base64(_ref_xor(m_bytes, k_bytes))
+
+
+def _ref_descifrar_fija(cipher, llave, estricto):
+    if len(cipher) == 0:
+        return ""
+    c_bytes = _ref_base64_a_bytes(cipher)
+    if len(llave) == 0:
+        raise ValueError("La llave no puede ser vacía")
+    if len(c_bytes) == 0:
+        raise ValueError("Las entradas no pueden estar vacías")
+    k_bytes = _ref_texto_a_bytes(llave[:len(c_bytes)], estricto)
+    return _ref_bytes_a_texto(_ref_xor(c_bytes, k_bytes), estricto)
+
+
+def _ref_cifrar_dinamica(mensaje, clave, nonce, estricto):
+    if len(mensaje) == 0:
+        return ""
+    m_bytes = _ref_texto_a_bytes(mensaje, estricto)
+    return _ref_base64(_ref_xor(m_bytes, _ref_llave_dinamica(len(m_bytes), clave, nonce)))
+
+
+def _ref_descifrar_dinamica(cipher, clave, nonce, estricto):
+    if len(cipher) == 0:
+        return ""
+    c_bytes = _ref_base64_a_bytes(cipher)
+    k_bytes = _ref_llave_dinamica(len(c_bytes), clave, nonce)
+    return _ref_bytes_a_texto(_ref_xor(c_bytes, k_bytes), estricto)
+
+
+def _resultado(funcion, *args):
+    """Salida o (tipo de error, mensaje), para comparar también los errores."""
+    try:
+        return funcion(*args)
+    except ValueError as e:
+        return ("ValueError", str(e))
+
+
+def _alterar(texto, rng):
+    """Inserta un carácter al azar (inválido, espacio, '=' o válido)."""
+    if not texto or rng.random() < 0.5:
+        return texto
+    i = rng.randrange(len(texto) + 1)
+    return texto[:i] + rng.choice("=*A \nĀ") + texto[i:]
+
+
+def prueba_stream_una_pasada(casos=3000, semilla=2026):
+    imprimir_titulo("5) Stream cipher de una pasada vs. referencia congelada")
+
+    rng = random.Random(semilla)
+    # trozos de 6 bytes: casi todo cruza varios trozos
+    tam_original = stream_cipher_ascii.TAM_TROZO_FUSIONADO
+    stream_cipher_ascii.TAM_TROZO_FUSIONADO = 6
+
+    fallas = 0
+    try:
+        for _ in range(casos):
+            mensaje = _alterar("".join(rng.choice("Hola é@!\n") for _ in range(rng.randrange(0, 30))), rng)
+            # llaves cortas (se repiten) y largas (una ventana distinta por trozo)
+            larga = "".join(rng.choice(_REF_ALFABETO_LLAVE) for _ in range(rng.randrange(6, 40)))
+            llave = rng.choice(["", "K", "CLAVE", "CLĀVE", "C@VE", larga, larga + "@"])
+            nonce = str(rng.randrange(5))
+            backend = rng.choice(stream_cipher_ascii.BACKENDS)
+            estricto = rng.random() < 0.3
+
+            cipher = _resultado(_ref_cifrar_fija, mensaje, rng.choice(["CLAVE", larga]), False)
+            cipher = _alterar(cipher if isinstance(cipher, str) else mensaje, rng)
+
+            pares = [
+                (_ref_cifrar_fija, stream_cipher_ascii.cifrar_ascii_llave_fija_a_base64,
+                 (mensaje, llave)),
+                (_ref_descifrar_fija, stream_cipher_ascii.descifrar_base64_con_llave_fija,
+                 (cipher, llave)),
+                (_ref_cifrar_dinamica, stream_cipher_ascii.cifrar_ascii_llave_dinamica_a_base64,
+                 (mensaje, "MASTERKEY", nonce)),
+                (_ref_descifrar_dinamica, stream_cipher_ascii.descifrar_base64_con_llave_dinamica,
+                 (cipher, "MASTERKEY", nonce)),
+            ]
+            for referencia, funcion, args in pares:
+                esperado = _resultado(referencia, *args, estricto)
+                obtenido = _resultado(funcion, *args, backend, estricto)
+                if esperado != obtenido:
+                    fallas += 1
+                    print(f"DIFERENCIA {funcion.__name__}{args!r}: {esperado!r} != {obtenido!r}")
+    finally:
+        stream_cipher_ascii.TAM_TROZO_FUSIONADO = tam_original
+
+    print(f"{casos} casos al azar, {fallas} diferencias")
+    if fallas:
+        raise AssertionError("El cifrado de una pasada no coincide con la referencia")
+
+
+# Vectores conocidos: SHA-256 del Base64 que da la versión original (sin
+# trozos) para un mensaje de dos trozos completos y uno parcial
+_VECTORES_CONOCIDOS = {
+    "llave corta": "1a3be8860350dc56399761ace91cb9ec9f78f822d98cb1a11abe55f0924af522",
+    "llave larga": "bf2cff963dc6bfe9aa1d31c664118f6cf7476b0a3b69d11ccfeaed6a2575a5a3",
+    "llave dinámica": "c90de3c5209b89d28e099a834ef7ae44689e88a53aae6bd4dd7d24dc9b20086b",
+}
+
+
+def _texto_vector(n, paso):
+    alfabeto = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789 \n.,;:!?()-_/"
+    return "".join(alfabeto[(i * paso + i // 7) % len(alfabeto)] for i in range(n))
+
+
+def prueba_vectores_conocidos():
+    imprimir_titulo("6) Vectores conocidos con trozos de tamaño real")
+
+    n = 2 * stream_cipher_ascii.TAM_TROZO_FUSIONADO + 1000
+    mensaje = _texto_vector(n, 7)
+    casos = {
+        "llave corta": ("CLAVE",),
+        "llave larga": (_texto_vector(n, 11),),
+        "llave dinámica": ("MASTERKEY", "0001"),
+    }
+
+    fallas = 0
+    for nombre, args in casos.items():
+        if len(args) == 1:
+            cifrar = stream_cipher_ascii.cifrar_ascii_llave_fija_a_base64
+            descifrar = stream_cipher_ascii.descifrar_base64_con_llave_fija
+        else:
+            cifrar = stream_cipher_ascii.cifrar_ascii_llave_dinamica_a_base64
+            descifrar = stream_cipher_ascii.descifrar_base64_con_llave_dinamica
+        cipher = cifrar(mensaje, *args)
+        huella = hashlib.sha256(cipher.encode("ascii")).hexdigest()
+        ok = huella == _VECTORES_CONOCIDOS[nombre] and descifrar(cipher, *args) == mensaje
+        fallas += not ok
+        print(f"{nombre}: {len(mensaje)} bytes -> {'OK' if ok else 'DIFERENTE'}")
+
+    if fallas:
+        raise AssertionError("El cifrado no coincide con los vectores conocidos")
+
+
+def prueba_llave_larga(n_trozos=50):
+    imprimir_titulo("7) Llave tan larga como el mensaje: solo la ventana de cada trozo")
+
+    # cada trozo debe recibir a lo sumo su propio largo de llave; copiar la
+    # llave entera por trozo hace el cifrado cuadrático en el largo
+    tam_original = stream_cipher_ascii.TAM_TROZO_FUSIONADO
+    ventana_original = stream_cipher_ascii._ventana_llave
+    tam = stream_cipher_ascii.TAM_TROZO_FUSIONADO = 6
+    mayor = 0
+
+    def ventana_medida(k_bytes, inicio, fin):
+        nonlocal mayor
+        k = ventana_original(k_bytes, inicio, fin)
+        mayor = max(mayor, len(k))
+        return k
+
+    stream_cipher_ascii._ventana_llave = ventana_medida
+    try:
+        mensaje = "Hola mundo, texto de prueba!\n" * (n_trozos * tam // 29 + 1)
+        llave = "".join(chr(33 + (7 * i) % 90) for i in range(len(mensaje)))
+        cipher = stream_cipher_ascii.cifrar_ascii_llave_fija_a_base64(mensaje, llave)
+        descifrado = stream_cipher_ascii.descifrar_base64_con_llave_fija(cipher, llave)
+    finally:
+        stream_cipher_ascii.TAM_TROZO_FUSIONADO = tam_original
+        stream_cipher_ascii._ventana_llave = ventana_original
+
+    print(f"{len(mensaje)} bytes, llave de {len(llave)}: ventana máxima {mayor} bytes")
+    if descifrado != mensaje or mayor > tam:
+        raise AssertionError("La llave larga no se recorre por ventanas del trozo")
+
+
+def prueba_frecuencias_por_shards(semilla=2026):
+    imprimir_titulo("8) Frecuencias por shards vs. texto completo")
+
+    # shards y archivos chicos: muchos bigramas/trigramas cruzan un borde
+    rng = random.Random(semilla)
+    partes = ["".join(rng.choice("Hola mundo, é!\n") for _ in range(3000)) for _ in range(3)]
+    fallas = 0
+    with tempfile.TemporaryDirectory() as carpeta:
+        rutas = []
+        for i, parte in enumerate(partes):
+            rutas.append(os.path.join(carpeta, f"parte{i}.txt"))
+            with open(rutas[-1], "w", encoding="utf-8") as f:
+                f.write(parte)
+
+        for n in (1, 2, 3):
+            esperado = FrequencyCounter(n).update("".join(partes)).tabla()
+            for workers in (1, 2):
+                obtenido = analisis_frecuencia_archivos(rutas, workers=workers, tam_shard=777, n=n)
+                ok = obtenido == esperado
+                fallas += not ok
+                print(f"n={n}, workers={workers}: {'OK' if ok else 'DIFERENTE'}")
+
+    if fallas:
+        raise AssertionError("Los n-gramas por shards no coinciden con el texto completo")
+
+
 def main():
     prueba_ascii_binario()
     prueba_base64_binario()
     prueba_ascii_base64_via_binario()
     prueba_xor()
+    prueba_stream_una_pasada()
+    prueba_vectores_conocidos()
+    prueba_llave_larga()
+    prueba_frecuencias_por_shards()
 
     imprimir_titulo("✅ Fin de pruebas")
 
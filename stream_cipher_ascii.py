@@ -7,37 +7,97 @@
 # Nota: El XOR se aplica SIEMPRE sobre binario (bytes).
 # La salida se devuelve como Base64 para que sea imprimible/transportable.
 
-from binario import texto_a_ascii_binario, ascii_binario_a_texto
-from xor import xor_binario
-from base64 import binario_a_base64, base64_a_binario
-from binario import ASCII_TABLE 
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from binario import texto_a_bytes, bytes_a_texto
+from xor import xor_bytes, _expandir_clave
+from base64 import bytes_a_base64, base64_a_bytes, limpiar_base64, _bytes_decodificados
+from binario import ASCII_TABLE
+from buffer_salida import BufferSalida
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
 
 ALFABETO_LLAVE = []
 for ch in ASCII_TABLE:
     if ch not in ['\n', '\t']:
         ALFABETO_LLAVE.append(ch)
 
+# mismo alfabeto como códigos de byte (para generar la llave en bytes)
+ALFABETO_LLAVE_BYTES = bytes(ASCII_TABLE[ch] for ch in ALFABETO_LLAVE)
+
+# Backend para expandir la llave y aplicar XOR:
+# - "python": xor.xor_bytes (siempre disponible, por defecto)
+# - "numpy": arreglos numpy.uint8 (si NumPy está instalado)
+# Se elige al importar con la variable de entorno STREAM_CIPHER_BACKEND
+# o por llamada con el parámetro backend=. Tener NumPy instalado no cambia
+# el backend: solo se usa si se pide.
+BACKENDS = ["python", "numpy"]
+BACKEND_POR_DEFECTO = os.environ.get("STREAM_CIPHER_BACKEND", "python")
+if BACKEND_POR_DEFECTO not in BACKENDS:
+    raise ValueError(
+        f"STREAM_CIPHER_BACKEND inválido: {BACKEND_POR_DEFECTO!r}. Usa 'python' o 'numpy'"
+    )
+
+# bytes por trozo en el XOR con NumPy
+TAM_TROZO_NUMPY = 1024 * 1024
+
+# bytes de mensaje por trozo en el cifrado/descifrado de una pasada
+# (múltiplo de 3: cada trozo cierra sus grupos Base64)
+TAM_TROZO_FUSIONADO = 3 * 64 * 1024
+
+# tope por defecto del caché de keystreams dinámicos (ver activar_cache_keystream)
+TAM_CACHE_KEYSTREAM = 16 * 1024 * 1024
+
 
 
-def _hash_ascii_simple(texto):
+def _hash_ascii_simple(texto, h=0):
     """
     Mezcla simple para obtener semilla (NO criptográfico).
     Suficiente para ejercicio didáctico de keystream.
+
+    h permite continuar un hash ya calculado:
+    _hash_ascii_simple(a + b) == _hash_ascii_simple(b, _hash_ascii_simple(a))
     """
-    h = 0
     for c in texto:
         h = (h * 131 + ord(c)) % (2**32)
     return h
 
 
+LCG_A = 1664525
+LCG_C = 1013904223
+LCG_MOD = 2**32
+
+
 def _lcg_next(x):
     """
     PRNG LCG: x_{n+1} = (a*x_n + c) mod 2^32
     (didáctico, no seguro para uso real)
     """
-    a = 1664525
-    c = 1013904223
-    return (a * x + c) % (2**32)
+    return (LCG_A * x + LCG_C) % LCG_MOD
+
+
+def _lcg_saltar(x, n):
+    """
+    Aplica _lcg_next n veces en O(log n).
+    Cada paso es la función afín x -> a*x + c; se eleva a la n componiendo
+    por cuadrados: (a, c) compuesto consigo mismo = (a*a, a*c + c).
+    """
+    a_total, c_total = 1, 0
+    a, c = LCG_A, LCG_C
+    while n > 0:
+        if n & 1:
+            a_total = (a * a_total) % LCG_MOD
+            c_total = (a * c_total + c) % LCG_MOD
+        c = (a * c + c) % LCG_MOD
+        a = (a * a) % LCG_MOD
+        n >>= 1
+    return (a_total * x + c_total) % LCG_MOD
 
 
 # ============================================================
@@ -53,130 +113,911 @@ def generar_llave_dinamica_ascii(longitud, semilla="seed", nonce="0"):
     if longitud <= 0:
         raise ValueError("La longitud debe ser > 0")
 
+    return _generar_llave_dinamica_bytes(longitud, semilla, nonce).decode("latin-1")
+
+
+def _generar_llave_dinamica_bytes(longitud, semilla, nonce):
+    """Misma llave que generar_llave_dinamica_ascii, como bytes."""
     state = _hash_ascii_simple(str(semilla) + "|" + str(nonce))
+    cache = _cache_keystream
+    if cache is not None:
+        return cache.obtener(state, 0, longitud)
+    return _llave_desde_estado(state, longitud)
+
 
-    llave = ""
-    for _ in range(longitud):
+def _llave_desde_estado(state, longitud):
+    """Keystream de longitud bytes a partir del estado inicial del LCG."""
+    alfabeto = ALFABETO_LLAVE_BYTES
+    n_alfabeto = len(alfabeto)
+    llave = bytearray(longitud)
+    for i in range(longitud):
         state = _lcg_next(state)
-        idx = state % len(ALFABETO_LLAVE)
-        llave += ALFABETO_LLAVE[idx]
+        llave[i] = alfabeto[state % n_alfabeto]
 
-    return llave
+    return bytes(llave)
 
 
-def _repetir_llave(llave, longitud_objetivo):
-    """Repite cíclicamente la llave hasta cubrir longitud_objetivo."""
-    if len(llave) == 0:
-        raise ValueError("La llave no puede ser vacía")
+class KeystreamDinamico:
+    """
+    Keystream de (semilla, nonce) con acceso aleatorio.
+    El estado del LCG en cualquier posición n se calcula en O(log n)
+    con _lcg_saltar, sin generar el prefijo.
+
+    ks = KeystreamDinamico("MASTERKEY", "0001")
+    ks[0:12] == generar_llave_dinamica_ascii(12, "MASTERKEY", "0001")
+    ks[1000000:1000010]   # solo genera esos 10 caracteres
+    """
+
+    def __init__(self, semilla="seed", nonce="0"):
+        self.semilla = semilla
+        self.nonce = nonce
+        self._estado_inicial = _hash_ascii_simple(str(semilla) + "|" + str(nonce))
+
+    def estado_en(self, posicion):
+        """Estado del LCG justo antes de generar el carácter en posicion."""
+        if posicion < 0:
+            raise ValueError("La posición debe ser >= 0")
+        return _lcg_saltar(self._estado_inicial, posicion)
+
+    def bytes_en(self, inicio, fin):
+        """Keystream [inicio, fin) como bytes."""
+        if inicio < 0 or fin < inicio:
+            raise ValueError("Rango inválido: se requiere 0 <= inicio <= fin")
+        cache = _cache_keystream
+        if cache is not None:
+            return cache.obtener(self._estado_inicial, inicio, fin)
+        return _llave_desde_estado(self.estado_en(inicio), fin - inicio)
+
+    def __getitem__(self, indice):
+        """
+        ks[i] -> un carácter, ks[a:b] (o ks[a:b:paso]) -> string.
+        El keystream no tiene fin: no se aceptan índices negativos ni
+        slices sin límite superior.
+        """
+        if isinstance(indice, slice):
+            inicio = 0 if indice.start is None else indice.start
+            fin = indice.stop
+            if fin is None or inicio < 0 or fin < 0:
+                raise IndexError("El keystream requiere límites >= 0 y un final explícito")
+            if fin <= inicio:
+                return ""
+            llave = self.bytes_en(inicio, fin).decode("latin-1")
+            if indice.step is not None and indice.step != 1:
+                llave = llave[::indice.step]
+            return llave
+
+        if indice < 0:
+            raise IndexError("El keystream no acepta índices negativos")
+        return self.bytes_en(indice, indice + 1).decode("latin-1")
+
+
+# ============================================================
+# Caché de keystreams dinámicos (opcional)
+# ============================================================
+# Reintentos, varios lectores del mismo mensaje o auditorías vuelven a
+# descifrar con el mismo (clave_maestra, nonce). Con el caché activo, el
+# prefijo de keystream ya generado se reutiliza y, si se pide más largo, se
+# extiende desde donde quedó en vez de generarse de nuevo.
+#
+# La llave de cada entrada es el estado inicial del LCG, es decir el hash de
+# "semilla|nonce": dos pares con el mismo hash generan el mismo keystream.
+# El tope es en bytes de keystream guardados, no en número de entradas.
+
+class CacheKeystream:
+    """
+    LRU de prefijos de keystream dinámico, limitado a max_bytes.
+
+    cache = CacheKeystream(1024 * 1024)
+    cache.obtener(estado, 0, 100)     # fallo: genera y guarda 100 bytes
+    cache.obtener(estado, 0, 50)      # acierto: slice del prefijo guardado
+    cache.obtener(estado, 0, 200)     # extensión: genera solo los 100 que faltan
+    cache.estadisticas()
+    """
+
+    def __init__(self, max_bytes=TAM_CACHE_KEYSTREAM):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes debe ser > 0")
+        self.max_bytes = max_bytes
+        self._entradas = OrderedDict()   # estado inicial -> prefijo (bytes)
+        self._bytes_usados = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.extensiones = 0
+        self.desalojos = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def obtener(self, estado, inicio, fin):
+        """
+        Keystream [inicio, fin) del estado inicial dado.
+
+        Solo se guardan prefijos: si inicio cae más allá de lo ya generado
+        (acceso aleatorio lejano) o fin supera max_bytes, el rango se calcula
+        aparte con _lcg_saltar y no entra al caché.
+        """
+        if fin <= inicio:
+            return b""
+
+        # el keystream se genera fuera del lock: un fallo grande no frena
+        # los aciertos de otros hilos (solo la búsqueda y la inserción lo toman)
+        with self._lock:
+            llave = self._entradas.get(estado)
+            largo = 0 if llave is None else len(llave)
+
+            if fin <= largo:
+                self.aciertos += 1
+                self._entradas.move_to_end(estado)
+                if inicio == 0 and fin == largo:
+                    return llave
+                return llave[inicio:fin]
+
+            lejano = inicio > largo or fin > self.max_bytes
+            if lejano or llave is None:
+                self.fallos += 1
+            else:
+                self.extensiones += 1
+
+        if lejano:
+            return _llave_desde_estado(_lcg_saltar(estado, inicio), fin - inicio)
+
+        if llave is None:
+            llave = _llave_desde_estado(estado, fin)
+        else:
+            llave = llave + _llave_desde_estado(_lcg_saltar(estado, largo), fin - largo)
+
+        with self._lock:
+            # otro hilo pudo extender, reemplazar o desalojar la entrada mientras tanto
+            actual = self._entradas.get(estado)
+            largo_actual = 0 if actual is None else len(actual)
+            if largo_actual < len(llave):
+                self._guardar(estado, llave, largo_actual)
+
+        if inicio == 0:
+            return llave
+        return llave[inicio:fin]
+
+    def _guardar(self, estado, llave, largo_anterior):
+        self._entradas[estado] = llave
+        self._entradas.move_to_end(estado)
+        self._bytes_usados += len(llave) - largo_anterior
+        while self._bytes_usados > self.max_bytes:
+            _, desalojada = self._entradas.popitem(last=False)
+            self._bytes_usados -= len(desalojada)
+            self.desalojos += 1
+
+    def limpiar(self):
+        """Vacía el caché (los contadores se conservan)."""
+        with self._lock:
+            self._entradas.clear()
+            self._bytes_usados = 0
+
+    def estadisticas(self):
+        """Contadores y ocupación actual como dict."""
+        with self._lock:
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "extensiones": self.extensiones,
+                "desalojos": self.desalojos,
+                "entradas": len(self._entradas),
+                "bytes_usados": self._bytes_usados,
+                "max_bytes": self.max_bytes,
+            }
+
+
+# caché global usado por las funciones de llave dinámica (None = desactivado)
+_cache_keystream = None
+
+
+def activar_cache_keystream(max_bytes=TAM_CACHE_KEYSTREAM):
+    """
+    Activa el caché de keystreams dinámicos para todo el módulo y lo
+    devuelve (reemplaza al anterior, si había uno). La salida de cifrado y
+    descifrado no cambia; solo se evita regenerar keystreams repetidos.
+    """
+    global _cache_keystream
+    _cache_keystream = CacheKeystream(max_bytes)
+    return _cache_keystream
+
+
+def desactivar_cache_keystream():
+    """Desactiva el caché y libera su memoria."""
+    global _cache_keystream
+    _cache_keystream = None
+
+
+def cache_keystream():
+    """Caché activo, o None si está desactivado."""
+    return _cache_keystream
+
+
+def _resolver_backend(backend):
+    """
+    None -> backend por defecto.
+    "numpy" sin NumPy instalado -> "python" (misma salida, solo más lento).
+    """
+    if backend is None:
+        backend = BACKEND_POR_DEFECTO
+
+    if backend not in BACKENDS:
+        raise ValueError("backend inválido. Usa 'python' o 'numpy'")
+
+    if backend == "numpy" and np is None:
+        return "python"
+    return backend
+
+
+def _aplicar_llave(datos, llave, backend=None):
+    """
+    XOR de datos con la llave (repetida cíclicamente si es más corta).
+    Ambos backends devuelven exactamente los mismos bytes.
+    """
+    if _resolver_backend(backend) == "numpy":
+        return _aplicar_llave_numpy(datos, llave)
+
+    return xor_bytes(datos, llave, modo_clave="repetir")
+
+
+def _aplicar_llave_numpy(datos, llave):
+    """
+    XOR con NumPy por trozos, escrito directo en la salida reservada.
+    Una llave corta se repite solo hasta el tamaño de un trozo (múltiplo
+    de la llave), no hasta el tamaño del mensaje.
+    """
+    d = np.frombuffer(datos, dtype=np.uint8)
+    k = np.frombuffer(llave, dtype=np.uint8)
+    n = len(d)
+
+    if len(k) == n:
+        paso = TAM_TROZO_NUMPY
+    else:
+        paso = max(1, TAM_TROZO_NUMPY // len(k)) * len(k)
+        # repetir como bytes (copia en C); np.resize es mucho más lento
+        k = np.frombuffer(_expandir_clave(bytes(llave), min(paso, n)), dtype=np.uint8)
+
+    salida = BufferSalida(n)
+    for i in range(0, n, paso):
+        trozo = d[i:i + paso]
+        clave = k[i:i + paso] if len(k) == n else k[:len(trozo)]
+        salida.escribir(memoryview(np.bitwise_xor(trozo, clave)))
+    return salida.valor()
+
+
+def _llave_fija_a_bytes(llave_fija_ascii, n_chars, estricto=False):
+    """
+    Llave fija ASCII -> bytes.
+    Solo se valida la parte de la llave que llega a usarse (n_chars).
+    """
+    return texto_a_bytes(llave_fija_ascii[:n_chars], estricto)
+
+
+# ============================================================
+# Pipeline de una pasada: trozo de mensaje -> XOR -> Base64
+# ============================================================
+# En lugar de convertir el mensaje completo a bytes, aplicar la llave y
+# luego codificar (tres copias del tamaño del mensaje más la salida), cada
+# trozo de TAM_TROZO_FUSIONADO bytes recorre las tres etapas y se agrega a
+# la salida. Lo único que crece con el mensaje es el resultado.
+#
+# La salida se arma en _juntar_texto con str += trozo, la única excepción
+# a BufferSalida en el proyecto: con una sola referencia al string, CPython
+# lo agranda en su lugar (realloc) en vez de copiarlo, así que la memoria
+# pico es el resultado más un par de trozos. Con BufferSalida serían dos
+# copias del resultado (las partes y el join). Fuera de CPython no se
+# cuenta con eso y se usa BufferSalida. benchmarks.LIMITES_REGRESION
+# detecta si el crecimiento en sitio deja de ocurrir.
+_STR_CRECE_EN_SITIO = sys.implementation.name == "cpython"
+
+def _rotar_llave(k_bytes, posicion):
+    """Llave fija rotada para que su posición 0 caiga en el byte posicion del mensaje."""
+    desfase = posicion % len(k_bytes)
+    if desfase == 0:
+        return k_bytes
+    return k_bytes[desfase:] + k_bytes[:desfase]
+
+
+def _ventana_llave(k_bytes, inicio, fin):
+    """
+    Llave fija (k_bytes repetida) para los bytes [inicio, fin) del mensaje.
+    Solo se copia la ventana del rango: con una llave tan larga como el
+    mensaje, copiarla entera en cada trozo haría el recorrido cuadrático.
+    Si la llave es más corta que el rango se devuelve rotada, sin repetir
+    (_aplicar_llave la repite).
+    """
+    largo = len(k_bytes)
+    desfase = inicio % largo
+    n = fin - inicio
+    if largo <= n:
+        return _rotar_llave(k_bytes, desfase)
+    if desfase + n <= largo:
+        return k_bytes[desfase:desfase + n]
+    return k_bytes[desfase:] + k_bytes[:desfase + n - largo]
+
+
+def _fuente_llave_dinamica(clave_maestra, nonce, n_bytes):
+    """llave(inicio, fin) -> keystream dinámico [inicio, fin)."""
+    cache = _cache_keystream
+    if cache is not None and n_bytes <= cache.max_bytes:
+        # si cabe en la caché se guarda de todos modos: pedirlo una vez
+        # evita extender la entrada trozo por trozo. Si no cabe, pedirlo
+        # entero solo materializaría n_bytes que la caché no puede guardar.
+        k_bytes = memoryview(_generar_llave_dinamica_bytes(n_bytes, clave_maestra, nonce))
+        return lambda inicio, fin: k_bytes[inicio:fin]
+    return KeystreamDinamico(clave_maestra, nonce).bytes_en
 
-    out = ""
-    i = 0
-    while len(out) < longitud_objetivo:
-        out += llave[i]
-        i += 1
-        if i == len(llave):
-            i = 0
-    return out
+
+def _juntar_texto(trozos):
+    """Une los trozos de texto (str) de un iterable en un solo str."""
+    if not _STR_CRECE_EN_SITIO:
+        salida = BufferSalida(texto=True)
+        for trozo in trozos:
+            salida.escribir(trozo)
+        return salida.texto()
+
+    salida = ""
+    for trozo in trozos:
+        # sin otra referencia a salida, CPython la agranda en su lugar
+        salida += trozo
+    return salida
+
+
+def _cifrar_una_pasada(mensaje_ascii, llave, backend, estricto=False):
+    """
+    ASCII -> BYTES -> XOR -> BASE64 por trozos.
+    llave(inicio, fin) devuelve la llave del rango (si es más corta se repite).
+    """
+    n = len(mensaje_ascii)
+
+    def trozos():
+        for i in range(0, n, TAM_TROZO_FUSIONADO):
+            fin = min(i + TAM_TROZO_FUSIONADO, n)
+            c_bytes = _aplicar_llave(texto_a_bytes(mensaje_ascii[i:fin], estricto), llave(i, fin), backend)
+            yield bytes_a_base64(c_bytes)
+
+    return _juntar_texto(trozos())
+
+
+def _validar_base64_compacto(cipher_base64):
+    """
+    Limpia y valida la estructura del Base64 completo antes de recorrerlo
+    por trozos, con los mismos errores que base64_a_bytes.
+    """
+    s = limpiar_base64(cipher_base64)
+    if len(s) % 4 != 0:
+        raise ValueError("Base64 inválido: la longitud debe ser múltiplo de 4")
+    # un '=' al final de un trozo intermedio pasaría como padding
+    if s.find("=", 0, len(s) - 4) != -1:
+        raise ValueError("Base64 inválido: '=' solo puede aparecer en el último bloque")
+    return s
+
+
+def _largo_descifrado(s):
+    """
+    Bytes de mensaje de un Base64 ya validado por _validar_base64_compacto
+    (no vacío). Lo usan la versión síncrona y la async para dimensionar la
+    llave y la salida con la misma cuenta del padding.
+    """
+    return _bytes_decodificados(len(s), s[-4:])
+
+
+def _descifrar_una_pasada(s, llave, backend, estricto=False):
+    """BASE64 (ya limpio) -> BYTES -> XOR -> ASCII por trozos."""
+    chars_trozo = TAM_TROZO_FUSIONADO // 3 * 4
+
+    def trozos():
+        for j in range(0, len(s), chars_trozo):
+            c_bytes = base64_a_bytes(s[j:j + chars_trozo])
+            inicio = j // 4 * 3
+            m_bytes = _aplicar_llave(c_bytes, llave(inicio, inicio + len(c_bytes)), backend)
+            yield bytes_a_texto(m_bytes, estricto)
+
+    return _juntar_texto(trozos())
 
 
 # ============================================================
 # 2) Cipher con llave k fija (salida Base64)
 # ============================================================
-def cifrar_ascii_llave_fija_a_base64(mensaje_ascii, llave_fija_ascii):
+def cifrar_ascii_llave_fija_a_base64(mensaje_ascii, llave_fija_ascii, backend=None,
+                                     estricto=False):
     """
     Cifra un mensaje ASCII usando una llave ASCII fija.
     Si la llave es más corta, se repite.
 
-    Flujo:
-    ASCII -> BIN -> XOR -> BIN(cipher) -> BASE64 (imprimible)
+    Flujo (por trozos, en una pasada):
+    ASCII -> BYTES -> XOR -> BYTES(cipher) -> BASE64 (imprimible)
+
+    backend: "python", "numpy" o None (BACKEND_POR_DEFECTO).
+    estricto: True limita mensaje y llave a ASCII_TABLE (ver binario.texto_a_bytes).
     """
     if len(mensaje_ascii) == 0:
         return ""
 
-    llave_expandida = _repetir_llave(llave_fija_ascii, len(mensaje_ascii))
-
-    m_bin = texto_a_ascii_binario(mensaje_ascii)
-    k_bin = texto_a_ascii_binario(llave_expandida)
+    if len(llave_fija_ascii) == 0:
+        raise ValueError("La llave no puede ser vacía")
 
-    c_bin = xor_binario(m_bin, k_bin, modo_clave="estricto")
-    cipher_b64 = binario_a_base64(c_bin)
-    return cipher_b64
+    try:
+        k_bytes = _llave_fija_a_bytes(llave_fija_ascii, len(mensaje_ascii), estricto)
+    except ValueError:
+        # un carácter inválido del mensaje se reporta antes que uno de la llave
+        texto_a_bytes(mensaje_ascii, estricto)
+        raise
+    return _cifrar_una_pasada(mensaje_ascii,
+                              lambda inicio, fin: _ventana_llave(k_bytes, inicio, fin), backend,
+                              estricto)
 
 
-def descifrar_base64_con_llave_fija(cipher_base64, llave_fija_ascii):
+def descifrar_base64_con_llave_fija(cipher_base64, llave_fija_ascii, backend=None,
+                                    estricto=False):
     """
     Descifra un cipher Base64 usando la misma llave fija ASCII.
     (descifrar = XOR con misma llave)
 
-    Flujo:
-    BASE64 -> BIN(cipher) -> XOR -> BIN(plain) -> ASCII
+    Flujo (por trozos, en una pasada):
+    BASE64 -> BYTES(cipher) -> XOR -> BYTES(plain) -> ASCII
+
+    estricto: False acepta cualquier byte en el resultado, así que una llave
+    equivocada devuelve texto basura. True exige que cada byte esté en
+    ASCII_INV ("Código ASCII no soportado"), como antes del rango completo.
     """
     if len(cipher_base64) == 0:
         return ""
 
-    c_bin = base64_a_binario(cipher_base64)
+    s = _validar_base64_compacto(cipher_base64)
 
-    # reconstruimos cuántos caracteres tenía el mensaje (1 char = 1 byte = 8 bits)
-    n_chars = len(c_bin) // 8
-    llave_expandida = _repetir_llave(llave_fija_ascii, n_chars)
+    # 1 char = 1 byte
+    n_chars = _largo_descifrado(s) if s else 0
+    try:
+        if len(llave_fija_ascii) == 0:
+            raise ValueError("La llave no puede ser vacía")
+        k_bytes = _llave_fija_a_bytes(llave_fija_ascii, n_chars, estricto)
+    except ValueError:
+        # los errores del Base64 se reportan antes que los de la llave
+        base64_a_bytes(s)
+        raise
 
-    k_bin = texto_a_ascii_binario(llave_expandida)
-    m_bin = xor_binario(c_bin, k_bin, modo_clave="estricto")
+    if n_chars == 0:
+        raise ValueError("Las entradas no pueden estar vacías")
 
-    # aquí sí esperamos texto "normal" => usamos la conversión estándar
-    mensaje = ascii_binario_a_texto(m_bin, acepta_espacios=False)
-    return mensaje
+    return _descifrar_una_pasada(s, lambda inicio, fin: _ventana_llave(k_bytes, inicio, fin),
+                                 backend, estricto)
 
 
 # ============================================================
 # 3) Cipher con llave k dinámica (salida Base64)
 # ============================================================
-def cifrar_ascii_llave_dinamica_a_base64(mensaje_ascii, clave_maestra, nonce):
+def cifrar_ascii_llave_dinamica_a_base64(mensaje_ascii, clave_maestra, nonce, backend=None,
+                                         estricto=False):
     """
     Cifra usando una llave/keystream dinámica del tamaño exacto del mensaje.
     La llave se genera con (clave_maestra + nonce).
+    estricto: igual que en cifrar_ascii_llave_fija_a_base64.
 
     IMPORTANTE: no reutilizar nonce con la misma clave_maestra.
     """
     if len(mensaje_ascii) == 0:
         return ""
 
-    llave_dinamica = generar_llave_dinamica_ascii(
-        longitud=len(mensaje_ascii),
-        semilla=clave_maestra,
-        nonce=nonce
-    )
-
-    m_bin = texto_a_ascii_binario(mensaje_ascii)
-    k_bin = texto_a_ascii_binario(llave_dinamica)
+    llave = _fuente_llave_dinamica(clave_maestra, nonce, len(mensaje_ascii))
+    return _cifrar_una_pasada(mensaje_ascii, llave, backend, estricto)
 
-    c_bin = xor_binario(m_bin, k_bin, modo_clave="estricto")
-    cipher_b64 = binario_a_base64(c_bin)
-    return cipher_b64
 
-
-def descifrar_base64_con_llave_dinamica(cipher_base64, clave_maestra, nonce):
+def descifrar_base64_con_llave_dinamica(cipher_base64, clave_maestra, nonce, backend=None,
+                                        estricto=False):
     """
     Descifra un cipher Base64 usando (clave_maestra + nonce) para regenerar
     exactamente la misma llave dinámica.
+    estricto: igual que en descifrar_base64_con_llave_fija.
     """
     if len(cipher_base64) == 0:
         return ""
 
-    c_bin = base64_a_binario(cipher_base64)
-    n_chars = len(c_bin) // 8
+    s = _validar_base64_compacto(cipher_base64)
+    if len(s) == 0:
+        raise ValueError("La longitud debe ser > 0")
 
-    llave_dinamica = generar_llave_dinamica_ascii(
-        longitud=n_chars,
-        semilla=clave_maestra,
-        nonce=nonce
-    )
+    llave = _fuente_llave_dinamica(clave_maestra, nonce, len(s) // 4 * 3)
+    return _descifrar_una_pasada(s, llave, backend, estricto)
+
+
+# ============================================================
+# Descifrado parcial: solo los bytes [inicio, fin) del mensaje
+# ============================================================
+# Cada grupo de 4 caracteres Base64 son 3 bytes del mensaje, así que el
+# rango se traduce directo a los grupos que lo contienen. Requiere el cipher
+# compacto (sin espacios/saltos), que es como lo devuelven las funciones de
+# cifrado. Acepta str o cualquier objeto con len() y slicing que devuelva
+# bytes (p. ej. un mmap del archivo).
+
+def _longitud_mensaje(cipher_base64):
+    """Bytes de mensaje en un cipher Base64 compacto, mirando solo el final."""
+    n = len(cipher_base64)
+    if n % 4 != 0:
+        raise ValueError("Base64 inválido: la longitud debe ser múltiplo de 4")
+    if n == 0:
+        return 0
+
+    final = cipher_base64[n - 2:n]
+    if not isinstance(final, str):
+        final = bytes(final).decode("latin-1")
+    return n // 4 * 3 - final.count("=")
+
+
+def _descifrar_grupos(cipher_base64, inicio, fin):
+    """
+    Decodifica solo los grupos Base64 que cubren [inicio, fin) del mensaje.
+    Retorna los bytes del cipher en ese rango.
+    """
+    g_inicio = inicio // 3
+    g_fin = (fin + 2) // 3
+    trozo = cipher_base64[4 * g_inicio:4 * g_fin]
+    if not isinstance(trozo, str):
+        trozo = bytes(trozo).decode("latin-1")
+
+    # '=' solo es válido si el trozo incluye el último bloque del cipher
+    if 4 * g_fin < len(cipher_base64) and "=" in trozo:
+        raise ValueError("Base64 inválido: '=' solo puede aparecer en el último bloque")
+
+    c_bytes = base64_a_bytes(trozo)
+    desde = inicio - 3 * g_inicio
+    return c_bytes[desde:desde + (fin - inicio)]
+
+
+def _normalizar_rango(cipher_base64, inicio, fin):
+    """Valida el rango y lo recorta a la longitud del mensaje."""
+    if inicio < 0 or (fin is not None and fin < inicio):
+        raise ValueError("Rango inválido: se requiere 0 <= inicio <= fin")
+
+    total = _longitud_mensaje(cipher_base64)
+    if fin is None or fin > total:
+        fin = total
+    return min(inicio, fin), fin, total
+
+
+def descifrar_rango_base64_con_llave_fija(cipher_base64, llave_fija_ascii, inicio, fin=None,
+                                          backend=None, estricto=False):
+    """
+    Descifra solo los caracteres [inicio, fin) del mensaje.
+    Equivale a descifrar_base64_con_llave_fija(cipher, llave)[inicio:fin],
+    pero decodifica únicamente los grupos Base64 necesarios.
+    """
+    if len(llave_fija_ascii) == 0:
+        raise ValueError("La llave no puede ser vacía")
+
+    inicio, fin, total = _normalizar_rango(cipher_base64, inicio, fin)
+    if fin == inicio:
+        return ""
+
+    c_bytes = _descifrar_grupos(cipher_base64, inicio, fin)
+
+    k_bytes = _ventana_llave(_llave_fija_a_bytes(llave_fija_ascii, total, estricto), inicio, fin)
+
+    return bytes_a_texto(_aplicar_llave(c_bytes, k_bytes, backend), estricto)
+
+
+def descifrar_rango_base64_con_llave_dinamica(cipher_base64, clave_maestra, nonce, inicio,
+                                              fin=None, backend=None, estricto=False):
+    """
+    Descifra solo los caracteres [inicio, fin) del mensaje.
+    Equivale a descifrar_base64_con_llave_dinamica(cipher, clave, nonce)[inicio:fin];
+    la llave de ese tramo sale de KeystreamDinamico sin generar el prefijo.
+    """
+    inicio, fin, _ = _normalizar_rango(cipher_base64, inicio, fin)
+    if fin == inicio:
+        return ""
+
+    c_bytes = _descifrar_grupos(cipher_base64, inicio, fin)
+    k_bytes = KeystreamDinamico(clave_maestra, nonce).bytes_en(inicio, fin)
+
+    return bytes_a_texto(_aplicar_llave(c_bytes, k_bytes, backend), estricto)
+
+
+# ============================================================
+# 4) Lotes: muchos mensajes con la misma llave
+# ============================================================
+# La preparación de la llave se hace una sola vez por lote y todos los
+# mensajes se empaquetan en un único buffer para un solo XOR.
+
+def _empaquetar(partes, alinear=False):
+    """
+    Lista de bytes -> (buffer único, lista de (inicio, fin)).
+    alinear=True rellena cada parte con ceros hasta múltiplo de 3, para que
+    cada mensaje empiece en un grupo Base64 propio.
+    """
+    rangos = []
+    inicio = 0
+    for p in partes:
+        rangos.append((inicio, inicio + len(p)))
+        inicio += len(p)
+        if alinear:
+            inicio += -len(p) % 3
+
+    # el tamaño total ya se conoce: se reserva una vez y el relleno queda en 0
+    salida = BufferSalida(inicio)
+    for p, (a, _) in zip(partes, rangos):
+        salida.saltar(a - len(salida))
+        salida.escribir(p)
+    salida.saltar(inicio - len(salida))
+    return salida.valor(), rangos
+
+
+def _base64_por_rango(c_bytes, rangos):
+    """
+    Un Base64 (con su propio padding) por cada rango de un buffer alineado.
+    Se codifica todo el buffer de una vez y luego se corta: el relleno con
+    ceros da los mismos caracteres que el padding, solo cambian los '='.
+    """
+    b64 = bytes_a_base64(c_bytes)
+    salida = []
+    for a, b in rangos:
+        n = b - a
+        inicio = a // 3 * 4
+        fin = inicio + (n + 2) // 3 * 4
+        if n % 3 == 1:
+            salida.append(b64[inicio:fin - 2] + "==")
+        elif n % 3 == 2:
+            salida.append(b64[inicio:fin - 1] + "=")
+        else:
+            salida.append(b64[inicio:fin])
+    return salida
+
+
+def _texto_por_rango(m_bytes, rangos, estricto=False):
+    """Valida el buffer completo una vez y lo corta en mensajes."""
+    texto = bytes_a_texto(m_bytes, estricto)
+    return [texto[a:b] for a, b in rangos]
+
+
+def _llave_fija_para_lote(llave_fija_ascii, rangos, estricto=False):
+    """
+    Llave fija expandida para cada mensaje del lote (lista de bytes).
+    Cada mensaje empieza desde el inicio de la llave (igual que cifrar uno solo).
+    """
+    largo_max = max([b - a for a, b in rangos], default=0)
+    if largo_max == 0:
+        return []
+
+    k_bytes = _llave_fija_a_bytes(llave_fija_ascii, largo_max, estricto)
+    repeticiones = largo_max // len(k_bytes) + 1
+    expandida = (k_bytes * repeticiones)[:largo_max]
+    return [expandida[:b - a] for a, b in rangos]
+
+
+def cifrar_lote_llave_fija_a_base64(mensajes_ascii, llave_fija_ascii, backend=None,
+                                    estricto=False):
+    """
+    Cifra muchos mensajes con la misma llave fija.
+    Equivale a [cifrar_ascii_llave_fija_a_base64(m, llave) for m in mensajes].
+
+    mensajes_ascii: lista o iterable de strings.
+    Retorna: lista de cipher Base64 (mismo orden).
+    """
+    mensajes = list(mensajes_ascii)
+    if not mensajes:
+        return []
+
+    if len(llave_fija_ascii) == 0:
+        raise ValueError("La llave no puede ser vacía")
+
+    m_bytes, rangos = _empaquetar([texto_a_bytes(m, estricto) for m in mensajes], alinear=True)
+    if len(m_bytes) == 0:
+        return ["" for _ in mensajes]
+
+    # la llave se empaqueta igual que los mensajes (relleno 0 ^ 0 = 0)
+    k_bytes = _empaquetar(_llave_fija_para_lote(llave_fija_ascii, rangos, estricto),
+                          alinear=True)[0]
+    c_bytes = _aplicar_llave(m_bytes, k_bytes, backend)
+    return _base64_por_rango(c_bytes, rangos)
+
+
+def descifrar_lote_base64_con_llave_fija(ciphers_base64, llave_fija_ascii, backend=None,
+                                         estricto=False):
+    """
+    Descifra muchos cipher Base64 con la misma llave fija.
+    Retorna: lista de mensajes ASCII (mismo orden).
+    """
+    ciphers = list(ciphers_base64)
+    if not ciphers:
+        return []
+
+    if len(llave_fija_ascii) == 0:
+        raise ValueError("La llave no puede ser vacía")
+
+    partes = []
+    for c in ciphers:
+        c_bytes = base64_a_bytes(c)
+        if len(c) > 0 and len(c_bytes) == 0:
+            raise ValueError("Las entradas no pueden estar vacías")
+        partes.append(c_bytes)
+
+    c_bytes, rangos = _empaquetar(partes)
+    if len(c_bytes) == 0:
+        return ["" for _ in ciphers]
+
+    k_bytes = _empaquetar(_llave_fija_para_lote(llave_fija_ascii, rangos, estricto))[0]
+    m_bytes = _aplicar_llave(c_bytes, k_bytes, backend)
+    return _texto_por_rango(m_bytes, rangos, estricto)
+
+
+def _llave_dinamica_para_lote(clave_maestra, nonces, rangos):
+    """
+    Keystream de cada mensaje (lista de bytes).
+    El hash de "clave_maestra|" se calcula una vez y se continúa con cada nonce.
+    """
+    if len(nonces) != len(rangos):
+        raise ValueError("Debe haber un nonce por mensaje")
+
+    h_clave = _hash_ascii_simple(str(clave_maestra) + "|")
+    cache = _cache_keystream
+    partes = []
+    for nonce, (a, b) in zip(nonces, rangos):
+        state = _hash_ascii_simple(str(nonce), h_clave)
+        if cache is not None:
+            partes.append(cache.obtener(state, 0, b - a))
+        else:
+            partes.append(_llave_desde_estado(state, b - a))
+    return partes
+
+
+def cifrar_lote_llave_dinamica_a_base64(mensajes_ascii, clave_maestra, nonces, backend=None,
+                                        estricto=False):
+    """
+    Cifra muchos mensajes con la misma clave_maestra y un nonce por mensaje.
+    Equivale a [cifrar_ascii_llave_dinamica_a_base64(m, clave_maestra, n)
+                for m, n in zip(mensajes, nonces)].
+    """
+    mensajes = list(mensajes_ascii)
+    nonces = list(nonces)
+    if len(nonces) != len(mensajes):
+        raise ValueError("Debe haber un nonce por mensaje")
+    if not mensajes:
+        return []
+
+    m_bytes, rangos = _empaquetar([texto_a_bytes(m, estricto) for m in mensajes], alinear=True)
+    if len(m_bytes) == 0:
+        return ["" for _ in mensajes]
+
+    k_bytes = _empaquetar(_llave_dinamica_para_lote(clave_maestra, nonces, rangos), alinear=True)[0]
+    c_bytes = _aplicar_llave(m_bytes, k_bytes, backend)
+    return _base64_por_rango(c_bytes, rangos)
+
+
+def descifrar_lote_base64_con_llave_dinamica(ciphers_base64, clave_maestra, nonces, backend=None,
+                                             estricto=False):
+    """
+    Descifra muchos cipher Base64 con la misma clave_maestra y su nonce.
+    Retorna: lista de mensajes ASCII (mismo orden).
+    """
+    ciphers = list(ciphers_base64)
+    nonces = list(nonces)
+    if len(nonces) != len(ciphers):
+        raise ValueError("Debe haber un nonce por mensaje")
+    if not ciphers:
+        return []
+
+    partes = []
+    for c in ciphers:
+        c_bytes = base64_a_bytes(c)
+        if len(c) > 0 and len(c_bytes) == 0:
+            raise ValueError("La longitud debe ser > 0")
+        partes.append(c_bytes)
+
+    c_bytes, rangos = _empaquetar(partes)
+    if len(c_bytes) == 0:
+        return ["" for _ in ciphers]
+
+    k_bytes = _empaquetar(_llave_dinamica_para_lote(clave_maestra, nonces, rangos))[0]
+    m_bytes = _aplicar_llave(c_bytes, k_bytes, backend)
+    return _texto_por_rango(m_bytes, rangos, estricto)
+
+
+# ============================================================
+# 5) Paralelo: mensajes grandes en varios procesos
+# ============================================================
+# El mensaje se corta en trozos de tamaño múltiplo de 3 (así el Base64 de
+# cada trozo no lleva padding intermedio y se pueden concatenar). Cada
+# proceso recibe el estado del LCG en la posición de su trozo
+# (KeystreamDinamico.estado_en).
+#
+# Crear un ProcessPoolExecutor cuesta arrancar los procesos (decenas de ms),
+# que en mensajes medianos es más que el cifrado. Quien cifra muchos
+# mensajes pasa su propio pool con executor= y se reutiliza entre llamadas.
+
+TAM_TROZO_PARALELO = 3 * 256 * 1024
+
+
+def _cifrar_trozo_dinamico(args):
+    """Trabajo de un proceso: (bytes del trozo, estado LCG en su inicio) -> Base64."""
+    m_bytes, state, backend = args
+    k_bytes = _llave_desde_estado(state, len(m_bytes))
+    return bytes_a_base64(_aplicar_llave(m_bytes, k_bytes, backend))
+
+
+def _descifrar_trozo_dinamico(args):
+    """Trabajo de un proceso: (Base64 del trozo, estado LCG en su inicio) -> bytes."""
+    c_base64, state, backend = args
+    c_bytes = base64_a_bytes(c_base64)
+    k_bytes = _llave_desde_estado(state, len(c_bytes))
+    return _aplicar_llave(c_bytes, k_bytes, backend)
+
+
+def _ejecutar_en_procesos(funcion, tareas, workers, executor=None):
+    """
+    Ejecuta funcion sobre cada tarea y devuelve los resultados en orden.
+    Con executor se usa ese pool (workers se ignora); si no, se crea uno
+    solo para esta llamada.
+    """
+    if len(tareas) == 1 or (executor is None and workers == 1):
+        return [funcion(t) for t in tareas]
+
+    if executor is not None:
+        return list(executor.map(funcion, tareas))
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(funcion, tareas))
+
+
+def _validar_trozo(tam_trozo, multiplo):
+    if tam_trozo <= 0 or tam_trozo % multiplo != 0:
+        raise ValueError(f"tam_trozo debe ser un múltiplo positivo de {multiplo}")
+
+
+def cifrar_ascii_llave_dinamica_a_base64_paralelo(mensaje_ascii, clave_maestra, nonce,
+                                                   workers=None, tam_trozo=TAM_TROZO_PARALELO,
+                                                   backend=None, estricto=False, executor=None):
+    """
+    Igual que cifrar_ascii_llave_dinamica_a_base64 pero repartiendo el trabajo
+    en un pool de procesos (concurrent.futures).
+
+    - workers: número de procesos (None = núcleos disponibles)
+    - tam_trozo: bytes por tarea (múltiplo de 3)
+    - executor: pool ya creado (p. ej. ProcessPoolExecutor) para reutilizarlo
+      entre llamadas; None crea uno por llamada
+
+    La salida es idéntica a la versión serial.
+    """
+    _validar_trozo(tam_trozo, 3)
+    if len(mensaje_ascii) == 0:
+        return ""
+
+    m_bytes = texto_a_bytes(mensaje_ascii, estricto)
+    ks = KeystreamDinamico(clave_maestra, nonce)
+
+    vista = memoryview(m_bytes)
+    tareas = [(bytes(vista[i:i + tam_trozo]), ks.estado_en(i), backend)
+              for i in range(0, len(m_bytes), tam_trozo)]
+
+    return "".join(_ejecutar_en_procesos(_cifrar_trozo_dinamico, tareas, workers, executor))
+
+
+def descifrar_base64_con_llave_dinamica_paralelo(cipher_base64, clave_maestra, nonce,
+                                                 workers=None, tam_trozo=TAM_TROZO_PARALELO,
+                                                 backend=None, estricto=False, executor=None):
+    """
+    Igual que descifrar_base64_con_llave_dinamica pero en un pool de procesos.
+    tam_trozo se expresa en bytes de mensaje (múltiplo de 3).
+    executor: igual que en cifrar_ascii_llave_dinamica_a_base64_paralelo.
+    """
+    _validar_trozo(tam_trozo, 3)
+    if len(cipher_base64) == 0:
+        return ""
+
+    s = _validar_base64_compacto(cipher_base64)
+    if len(s) == 0:
+        raise ValueError("La longitud debe ser > 0")
+
+    ks = KeystreamDinamico(clave_maestra, nonce)
 
-    k_bin = texto_a_ascii_binario(llave_dinamica)
-    m_bin = xor_binario(c_bin, k_bin, modo_clave="estricto")
+    # tam_trozo bytes <-> tam_trozo // 3 * 4 caracteres Base64
+    chars_trozo = tam_trozo // 3 * 4
+    tareas = [(s[j:j + chars_trozo], ks.estado_en(j // 4 * 3), backend)
+              for j in range(0, len(s), chars_trozo)]
 
-    mensaje = ascii_binario_a_texto(m_bin, acepta_espacios=False)
-    return mensaje
+    partes = _ejecutar_en_procesos(_descifrar_trozo_dinamico, tareas, workers, executor)
+    return bytes_a_texto(b"".join(partes), estricto)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,479 @@
+# stream_cipher_async.py
+# API asyncio para stream_cipher_ascii.
+#
+# Las funciones de stream_cipher_ascii son CPU puro: con mensajes grandes
+# bloquean el event loop mientras corren. Aquí el trabajo se hace por
+# trozos (múltiplos de 3 bytes, así el Base64 de cada trozo se concatena
+# sin padding intermedio) y entre trozo y trozo se cede el loop. Con un
+# executor, los trozos grandes se mandan a otro hilo/proceso y el loop
+# queda libre mientras se calculan.
+#
+# - *_async: mismas entradas y salida que las funciones síncronas
+# - cifrar_flujo_* / descifrar_flujo_*: StreamReader -> StreamWriter
+# - iniciar_servidor / prueba_carga: servidor TCP local de prueba y
+#   medición de latencias (p50/p90/p99) con clientes concurrentes
+#
+# Uso:
+#   python stream_cipher_async.py                      -> prueba de carga (3 modos)
+#   python stream_cipher_async.py --clientes 50 --peticiones 10
+
+import argparse
+import asyncio
+import time
+
+from base64 import Base64Decoder, bytes_a_base64, base64_a_bytes
+from binario import texto_a_bytes, bytes_a_texto
+from buffer_salida import BufferSalida
+from stream_cipher_ascii import (
+    KeystreamDinamico,
+    _aplicar_llave,
+    _cifrar_trozo_dinamico,
+    _descifrar_trozo_dinamico,
+    _largo_descifrado,
+    _llave_desde_estado,
+    _llave_fija_a_bytes,
+    _validar_base64_compacto,
+    _validar_trozo,
+    _ventana_llave,
+    cifrar_ascii_llave_dinamica_a_base64,
+    descifrar_base64_con_llave_dinamica,
+)
+
+# bytes de mensaje por trozo: cada trozo ocupa el loop unos pocos ms
+TAM_TROZO_ASYNC = 3 * 4 * 1024
+
+# con executor, solo los trozos de al menos este tamaño salen del loop
+# (para trozos chicos el costo de enviarlos es mayor que el trabajo)
+UMBRAL_EXECUTOR = 3 * 1024
+
+
+# ============================================================
+# Trabajo por trozo (funciones de módulo: se pueden enviar a procesos)
+# ============================================================
+
+def _cifrar_trozo_fijo(args):
+    """(bytes del trozo, ventana de llave del trozo) -> Base64."""
+    m_bytes, k_bytes, backend = args
+    return bytes_a_base64(_aplicar_llave(m_bytes, k_bytes, backend))
+
+
+def _descifrar_trozo_fijo(args):
+    """(Base64 del trozo, ventana de llave del trozo) -> bytes."""
+    c_base64, k_bytes, backend = args
+    return _aplicar_llave(base64_a_bytes(c_base64), k_bytes, backend)
+
+
+def _xor_trozo_fijo(args):
+    """(bytes, ventana de llave del trozo) -> bytes."""
+    datos, k_bytes, backend = args
+    return _aplicar_llave(datos, k_bytes, backend)
+
+
+def _xor_trozo_dinamico(args):
+    """(bytes, estado LCG en su inicio) -> bytes."""
+    datos, state, backend = args
+    return _aplicar_llave(datos, _llave_desde_estado(state, len(datos)), backend)
+
+
+async def _correr(funcion, args, n_bytes, executor):
+    """
+    Ejecuta funcion(args) sin acaparar el loop:
+    - con executor y un trozo grande: en el executor (el loop sigue libre)
+    - si no: en el loop, y luego se le cede el turno a las demás tareas
+    """
+    if executor is not None and n_bytes >= UMBRAL_EXECUTOR:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, funcion, args)
+
+    resultado = funcion(args)
+    await asyncio.sleep(0)
+    return resultado
+
+
+# ============================================================
+# 1) Mensaje completo (str) -> str
+# ============================================================
+
+async def cifrar_ascii_llave_fija_a_base64_async(mensaje_ascii, llave_fija_ascii,
+                                                 tam_trozo=TAM_TROZO_ASYNC, executor=None,
+                                                 backend=None, estricto=False):
+    """
+    Igual que cifrar_ascii_llave_fija_a_base64, cediendo el loop entre trozos.
+    executor: concurrent.futures.Executor opcional para los trozos grandes.
+    """
+    _validar_trozo(tam_trozo, 3)
+    if len(mensaje_ascii) == 0:
+        return ""
+    if len(llave_fija_ascii) == 0:
+        raise ValueError("La llave no puede ser vacía")
+
+    m_bytes = texto_a_bytes(mensaje_ascii, estricto)
+    k_bytes = _llave_fija_a_bytes(llave_fija_ascii, len(mensaje_ascii), estricto)
+
+    salida = BufferSalida(texto=True)
+    for i in range(0, len(m_bytes), tam_trozo):
+        trozo = m_bytes[i:i + tam_trozo]
+        args = (trozo, _ventana_llave(k_bytes, i, i + len(trozo)), backend)
+        salida.escribir(await _correr(_cifrar_trozo_fijo, args, len(trozo), executor))
+    return salida.texto()
+
+
+async def descifrar_base64_con_llave_fija_async(cipher_base64, llave_fija_ascii,
+                                                tam_trozo=TAM_TROZO_ASYNC, executor=None,
+                                                backend=None, estricto=False):
+    """Igual que descifrar_base64_con_llave_fija, cediendo el loop entre trozos."""
+    _validar_trozo(tam_trozo, 3)
+    if len(cipher_base64) == 0:
+        return ""
+
+    s = _validar_base64_compacto(cipher_base64)
+    if len(llave_fija_ascii) == 0:
+        # igual que la versión síncrona: un Base64 inválido se reporta primero
+        base64_a_bytes(s)
+        raise ValueError("La llave no puede ser vacía")
+    if len(s) == 0:
+        raise ValueError("Las entradas no pueden estar vacías")
+
+    n_chars = _largo_descifrado(s)
+    k_bytes = _llave_fija_a_bytes(llave_fija_ascii, n_chars, estricto)
+
+    # tam_trozo bytes <-> tam_trozo // 3 * 4 caracteres Base64
+    chars_trozo = tam_trozo // 3 * 4
+    salida = BufferSalida(n_chars)
+    for j in range(0, len(s), chars_trozo):
+        # solo la ventana de llave del trozo: es lo que viaja al executor
+        inicio = j // 4 * 3
+        k_trozo = _ventana_llave(k_bytes, inicio, min(inicio + tam_trozo, n_chars))
+        args = (s[j:j + chars_trozo], k_trozo, backend)
+        salida.escribir(await _correr(_descifrar_trozo_fijo, args, chars_trozo, executor))
+    return bytes_a_texto(salida.valor(), estricto)
+
+
+async def cifrar_ascii_llave_dinamica_a_base64_async(mensaje_ascii, clave_maestra, nonce,
+                                                     tam_trozo=TAM_TROZO_ASYNC, executor=None,
+                                                     backend=None, estricto=False):
+    """
+    Igual que cifrar_ascii_llave_dinamica_a_base64, cediendo el loop entre
+    trozos. Cada trozo arranca el keystream en su posición
+    (KeystreamDinamico.estado_en), así que la salida es idéntica.
+    """
+    _validar_trozo(tam_trozo, 3)
+    if len(mensaje_ascii) == 0:
+        return ""
+
+    m_bytes = texto_a_bytes(mensaje_ascii, estricto)
+    ks = KeystreamDinamico(clave_maestra, nonce)
+
+    salida = BufferSalida(texto=True)
+    for i in range(0, len(m_bytes), tam_trozo):
+        trozo = m_bytes[i:i + tam_trozo]
+        args = (trozo, ks.estado_en(i), backend)
+        salida.escribir(await _correr(_cifrar_trozo_dinamico, args, len(trozo), executor))
+    return salida.texto()
+
+
+async def descifrar_base64_con_llave_dinamica_async(cipher_base64, clave_maestra, nonce,
+                                                    tam_trozo=TAM_TROZO_ASYNC, executor=None,
+                                                    backend=None, estricto=False):
+    """Igual que descifrar_base64_con_llave_dinamica, cediendo el loop entre trozos."""
+    _validar_trozo(tam_trozo, 3)
+    if len(cipher_base64) == 0:
+        return ""
+
+    s = _validar_base64_compacto(cipher_base64)
+    if len(s) == 0:
+        raise ValueError("La longitud debe ser > 0")
+
+    ks = KeystreamDinamico(clave_maestra, nonce)
+    chars_trozo = tam_trozo // 3 * 4
+    salida = BufferSalida(_largo_descifrado(s))
+    for j in range(0, len(s), chars_trozo):
+        args = (s[j:j + chars_trozo], ks.estado_en(j // 4 * 3), backend)
+        salida.escribir(await _correr(_descifrar_trozo_dinamico, args, chars_trozo, executor))
+    return bytes_a_texto(salida.valor(), estricto)
+
+
+# ============================================================
+# 2) Pipelines StreamReader -> StreamWriter
+# ============================================================
+# Cifrar: bytes en claro -> Base64 (sin saltos).
+# Descifrar: Base64 (se aceptan saltos de línea) -> bytes en claro.
+# Retornan los bytes de mensaje procesados.
+
+async def _cifrar_flujo(reader, writer, tarea, tam_trozo, executor):
+    """tarea(posicion, trozo) -> (funcion, args) que produce el Base64 del trozo."""
+    _validar_trozo(tam_trozo, 3)
+    procesados = 0
+    while True:
+        try:
+            trozo = await reader.readexactly(tam_trozo)
+            fin = False
+        except asyncio.IncompleteReadError as e:
+            # último trozo (incompleto): su Base64 lleva el padding
+            trozo = e.partial
+            fin = True
+
+        if trozo:
+            funcion, args = tarea(procesados, trozo)
+            b64 = await _correr(funcion, args, len(trozo), executor)
+            writer.write(b64.encode("latin-1"))
+            await writer.drain()
+            procesados += len(trozo)
+
+        if fin:
+            return procesados
+
+
+async def _descifrar_flujo(reader, writer, tarea, tam_trozo, executor):
+    """tarea(posicion, c_bytes) -> (funcion, args) que produce el texto en claro."""
+    _validar_trozo(tam_trozo, 3)
+    dec = Base64Decoder()
+    procesados = 0
+    while True:
+        texto = await reader.read(tam_trozo // 3 * 4)
+        if not texto:
+            break
+
+        c_bytes = dec.update(texto.decode("latin-1"))
+        if c_bytes:
+            funcion, args = tarea(procesados, c_bytes)
+            writer.write(await _correr(funcion, args, len(c_bytes), executor))
+            await writer.drain()
+            procesados += len(c_bytes)
+
+    dec.finalize()
+    return procesados
+
+
+async def cifrar_flujo_llave_fija(reader, writer, llave_fija_ascii, tam_trozo=TAM_TROZO_ASYNC,
+                                  executor=None, backend=None):
+    """Lee bytes de reader y escribe su cipher Base64 (llave fija) en writer."""
+    if len(llave_fija_ascii) == 0:
+        raise ValueError("La llave no puede ser vacía")
+    k_bytes = texto_a_bytes(llave_fija_ascii)
+
+    def tarea(posicion, trozo):
+        k_trozo = _ventana_llave(k_bytes, posicion, posicion + len(trozo))
+        return _cifrar_trozo_fijo, (trozo, k_trozo, backend)
+
+    return await _cifrar_flujo(reader, writer, tarea, tam_trozo, executor)
+
+
+async def descifrar_flujo_llave_fija(reader, writer, llave_fija_ascii, tam_trozo=TAM_TROZO_ASYNC,
+                                     executor=None, backend=None):
+    """Lee Base64 de reader y escribe los bytes en claro (llave fija) en writer."""
+    if len(llave_fija_ascii) == 0:
+        raise ValueError("La llave no puede ser vacía")
+    k_bytes = texto_a_bytes(llave_fija_ascii)
+
+    def tarea(posicion, c_bytes):
+        k_trozo = _ventana_llave(k_bytes, posicion, posicion + len(c_bytes))
+        return _xor_trozo_fijo, (c_bytes, k_trozo, backend)
+
+    return await _descifrar_flujo(reader, writer, tarea, tam_trozo, executor)
+
+
+async def cifrar_flujo_llave_dinamica(reader, writer, clave_maestra, nonce,
+                                      tam_trozo=TAM_TROZO_ASYNC, executor=None, backend=None):
+    """Lee bytes de reader y escribe su cipher Base64 (llave dinámica) en writer."""
+    ks = KeystreamDinamico(clave_maestra, nonce)
+
+    def tarea(posicion, trozo):
+        return _cifrar_trozo_dinamico, (trozo, ks.estado_en(posicion), backend)
+
+    return await _cifrar_flujo(reader, writer, tarea, tam_trozo, executor)
+
+
+async def descifrar_flujo_llave_dinamica(reader, writer, clave_maestra, nonce,
+                                         tam_trozo=TAM_TROZO_ASYNC, executor=None, backend=None):
+    """Lee Base64 de reader y escribe los bytes en claro (llave dinámica) en writer."""
+    ks = KeystreamDinamico(clave_maestra, nonce)
+
+    def tarea(posicion, c_bytes):
+        return _xor_trozo_dinamico, (c_bytes, ks.estado_en(posicion), backend)
+
+    return await _descifrar_flujo(reader, writer, tarea, tam_trozo, executor)
+
+
+# ============================================================
+# 3) Servidor TCP local de prueba
+# ============================================================
+# Protocolo (una petición por conexión):
+#   cliente -> "CIFRAR <nonce>\n" o "DESCIFRAR <nonce>\n", luego el cuerpo
+#              y cierra su lado de escritura (write_eof)
+#   servidor -> la respuesta completa y cierra la conexión
+#
+# modo="async": pipelines de este módulo (por trozos)
+# modo="bloqueante": lee todo el cuerpo y llama a la función síncrona,
+#                    como un servicio que envuelve stream_cipher_ascii directo
+
+MODOS_SERVIDOR = ["async", "bloqueante"]
+
+
+async def _atender(reader, writer, clave_maestra, modo, executor, tam_trozo):
+    try:
+        encabezado = (await reader.readline()).decode("latin-1").split()
+        if len(encabezado) != 2 or encabezado[0] not in ("CIFRAR", "DESCIFRAR"):
+            writer.write(b"ERROR encabezado invalido\n")
+            return
+
+        accion, nonce = encabezado
+        if modo == "bloqueante":
+            cuerpo = (await reader.read()).decode("latin-1")
+            if accion == "CIFRAR":
+                respuesta = cifrar_ascii_llave_dinamica_a_base64(cuerpo, clave_maestra, nonce)
+                writer.write(respuesta.encode("latin-1"))
+            else:
+                respuesta = descifrar_base64_con_llave_dinamica(cuerpo, clave_maestra, nonce)
+                writer.write(texto_a_bytes(respuesta))
+        elif accion == "CIFRAR":
+            await cifrar_flujo_llave_dinamica(reader, writer, clave_maestra, nonce,
+                                              tam_trozo, executor)
+        else:
+            await descifrar_flujo_llave_dinamica(reader, writer, clave_maestra, nonce,
+                                                 tam_trozo, executor)
+        await writer.drain()
+    except ValueError as e:
+        writer.write(f"ERROR {e}\n".encode("utf-8"))
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def iniciar_servidor(clave_maestra, host="127.0.0.1", puerto=0, modo="async",
+                           executor=None, tam_trozo=TAM_TROZO_ASYNC):
+    """
+    Inicia el servidor de prueba y devuelve el asyncio.Server.
+    puerto=0 elige un puerto libre: servidor.sockets[0].getsockname()[1].
+
+    Un ProcessPoolExecutor debe usar el contexto "forkserver" o "spawn":
+    con "fork" los procesos heredan los sockets abiertos.
+    """
+    if modo not in MODOS_SERVIDOR:
+        raise ValueError("modo inválido. Usa 'async' o 'bloqueante'")
+
+    async def atender(reader, writer):
+        await _atender(reader, writer, clave_maestra, modo, executor, tam_trozo)
+
+    return await asyncio.start_server(atender, host, puerto)
+
+
+async def pedir(host, puerto, accion, nonce, cuerpo):
+    """Cliente del servidor de prueba: envía una petición y retorna la respuesta (bytes)."""
+    reader, writer = await asyncio.open_connection(host, puerto)
+
+    async def enviar():
+        writer.write(f"{accion} {nonce}\n".encode("latin-1"))
+        writer.write(cuerpo)
+        writer.write_eof()
+        await writer.drain()
+
+    # el servidor responde mientras todavía recibe: leer a la vez que se
+    # envía, o con cuerpos grandes ambos lados se quedan esperando en drain()
+    envio = asyncio.create_task(enviar())
+    respuesta = await reader.read()
+    await envio
+    writer.close()
+    await writer.wait_closed()
+    return respuesta
+
+
+# ============================================================
+# 4) Prueba de carga
+# ============================================================
+
+# cuerpos de distintos tamaños: los chicos son los que más sufren cuando
+# uno grande bloquea el loop
+TAMANOS_CUERPO = [1024, 16 * 1024, 256 * 1024]
+
+
+async def prueba_carga(clientes=20, peticiones=5, modo="async", executor=None,
+                       tamanos=TAMANOS_CUERPO, clave_maestra="MASTERKEY"):
+    """
+    Levanta el servidor local y lanza clientes concurrentes; cada cliente
+    hace peticiones CIFRAR alternando los tamaños de cuerpo.
+
+    Retorna dict con latencias (ms) p50/p90/p99 de todas las peticiones y de
+    las del cuerpo más chico, y el máximo retraso observado del event loop.
+    """
+    from benchmarks import percentil
+
+    servidor = await iniciar_servidor(clave_maestra, modo=modo, executor=executor)
+    host, puerto = servidor.sockets[0].getsockname()[:2]
+    cuerpos = {tam: (b"Hola Mundo 123! " * (tam // 16 + 1))[:tam] for tam in tamanos}
+
+    latencias = []          # (tamaño, segundos)
+    retraso_max = 0.0
+    activo = True
+
+    async def vigilar_loop():
+        # un tick cada 1 ms: cuánto tarda de más en despertar = loop bloqueado
+        nonlocal retraso_max
+        while activo:
+            inicio = time.perf_counter()
+            await asyncio.sleep(0.001)
+            retraso_max = max(retraso_max, time.perf_counter() - inicio - 0.001)
+
+    async def cliente(n):
+        for i in range(peticiones):
+            tam = tamanos[(n + i) % len(tamanos)]
+            inicio = time.perf_counter()
+            respuesta = await pedir(host, puerto, "CIFRAR", f"{n}-{i}", cuerpos[tam])
+            latencias.append((tam, time.perf_counter() - inicio))
+            if respuesta.startswith(b"ERROR"):
+                raise RuntimeError(respuesta.decode("utf-8"))
+
+    vigilante = asyncio.create_task(vigilar_loop())
+    try:
+        await asyncio.gather(*(cliente(n) for n in range(clientes)))
+    finally:
+        activo = False
+        await vigilante
+        servidor.close()
+        await servidor.wait_closed()
+
+    todas = sorted(s for _, s in latencias)
+    chicas = sorted(s for tam, s in latencias if tam == min(tamanos))
+    return {
+        "peticiones": len(todas),
+        "p50_ms": percentil(todas, 50) * 1000,
+        "p90_ms": percentil(todas, 90) * 1000,
+        "p99_ms": percentil(todas, 99) * 1000,
+        "p99_chicas_ms": percentil(chicas, 99) * 1000,
+        "retraso_loop_max_ms": retraso_max * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga del servidor de cifrado asyncio")
+    parser.add_argument("--clientes", type=int, default=20)
+    parser.add_argument("--peticiones", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # los procesos no deben nacer con fork desde este proceso: heredarían
+    # los sockets abiertos del servidor y las conexiones nunca llegarían a EOF
+    metodo = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    contexto = multiprocessing.get_context(metodo)
+
+    print(f"{args.clientes} clientes x {args.peticiones} peticiones, "
+          f"cuerpos de {', '.join(str(t) for t in TAMANOS_CUERPO)} bytes\n")
+    print(f"{'Modo':<18} | {'p50 ms':>8} | {'p90 ms':>8} | {'p99 ms':>8} | "
+          f"{'p99 chicas':>10} | {'Loop bloqueado máx ms':>21}")
+    print("-" * 88)
+
+    with ProcessPoolExecutor(mp_context=contexto) as executor:
+        for nombre, modo, ex in [
+            ("bloqueante", "bloqueante", None),
+            ("async", "async", None),
+            ("async + executor", "async", executor),
+        ]:
+            r = asyncio.run(prueba_carga(args.clientes, args.peticiones, modo, ex))
+            print(f"{nombre:<18} | {r['p50_ms']:8.1f} | {r['p90_ms']:8.1f} | {r['p99_ms']:8.1f} | "
+                  f"{r['p99_chicas_ms']:10.1f} | {r['retraso_loop_max_ms']:21.1f}")
+
+
+if __name__ == "__main__":
+    main()
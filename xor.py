@@ -1,16 +1,17 @@
-from binario import es_binario
+from binario import es_binario, limpiar_separadores_binario
+from buffer_salida import BufferSalida, vista_bytes, vista_destino
+
+MODOS_CLAVE = ["estricto", "repetir"]
+
+# xor_bytes trabaja por trozos de este tamaño (redondeado a múltiplo de la
+# clave): los enteros intermedios quedan acotados y la clave repetida se
+# arma una sola vez para un trozo, no para todo el mensaje
+TAM_TROZO_XOR = 64 * 1024
+
 
 def _limpiar_binario(s):
     """Deja solo 0 y 1; permite espacios y saltos como separadores."""
-    compacto = ""
-    for c in s:
-        if c == '0' or c == '1':
-            compacto += c
-        elif c in [' ', '\n', '\t', '\r']:
-            continue
-        else:
-            raise ValueError(f"Carácter inválido en binario: {repr(c)}")
-    return compacto
+    return limpiar_separadores_binario(s)
 
 
 def xor_bits(bit_a, bit_b):
@@ -39,29 +40,97 @@ def xor_binario(binario_a, binario_b, modo_clave="estricto"):
     if not es_binario(a) or not es_binario(b):
         raise ValueError("Las entradas deben ser binarios válidos (solo 0 y 1)")
 
-    if modo_clave not in ["estricto", "repetir"]:
+    if modo_clave not in MODOS_CLAVE:
         raise ValueError("modo_clave inválido. Usa 'estricto' o 'repetir'")
 
-    if modo_clave == "estricto":
-        if len(a) != len(b):
-            raise ValueError("Los binarios deben tener la misma longitud (modo estricto)")
-        clave = b
+    if modo_clave == "estricto" and len(a) != len(b):
+        raise ValueError("Los binarios deben tener la misma longitud (modo estricto)")
+
+    # XOR de enteros grandes: Python lo hace por palabras de máquina
+    clave = _expandir_clave(b, len(a))
+    valor = int(a, 2) ^ int(clave, 2)
+    return format(valor, "0" + str(len(a)) + "b")
+
+
+# ============================================================
+# Motor de XOR sobre bytes
+# ============================================================
+
+def _expandir_clave(clave, longitud):
+    """
+    Repite la clave (str o bytes) cíclicamente hasta longitud, con slicing.
+    Si ya tiene esa longitud se devuelve tal cual.
+    """
+    if len(clave) == longitud:
+        return clave
+    repeticiones = longitud // len(clave) + 1
+    return (clave * repeticiones)[:longitud]
+
+
+def xor_bytes(datos_a, datos_b, modo_clave="estricto"):
+    """
+    Aplica XOR byte a byte entre dos buffers (bytes, bytearray, memoryview,
+    mmap, ...). Mismos modos que xor_binario ("estricto" / "repetir").
+
+    Devuelve bytes.
+    """
+    a, b = _validar_xor_bytes(datos_a, datos_b, modo_clave)
+
+    salida = BufferSalida(len(a))
+    for trozo in _xor_trozos(a, b):
+        salida.escribir(trozo)
+    return salida.valor()
+
+
+def xor_bytes_into(destino, datos_a, datos_b, modo_clave="estricto"):
+    """
+    Igual que xor_bytes, pero escribe el resultado en destino, un
+    bytearray/memoryview/mmap reservado por quien llama. Retorna len(datos_a).
+
+    destino puede ser datos_a mismo: XOR en sitio.
+    """
+    a, b = _validar_xor_bytes(datos_a, datos_b, modo_clave)
+    salida = vista_destino(destino, len(a))
+
+    pos = 0
+    for trozo in _xor_trozos(a, b):
+        salida[pos:pos + len(trozo)] = trozo
+        pos += len(trozo)
+    return pos
+
+
+def _validar_xor_bytes(datos_a, datos_b, modo_clave):
+    """Valida las entradas y las devuelve como memoryview de bytes."""
+    a = vista_bytes(datos_a)
+    b = vista_bytes(datos_b)
+
+    if len(a) == 0 or len(b) == 0:
+        raise ValueError("Las entradas no pueden estar vacías")
+
+    if modo_clave not in MODOS_CLAVE:
+        raise ValueError("modo_clave inválido. Usa 'estricto' o 'repetir'")
+
+    if modo_clave == "estricto" and len(a) != len(b):
+        raise ValueError("Los datos deben tener la misma longitud (modo estricto)")
+    return a, b
+
+
+def _xor_trozos(a, b):
+    """Genera a XOR b (b repetida si es más corta) por trozos, como bytes."""
+    n = len(a)
+    if len(b) == n:
+        # clave de la misma longitud: un trozo alineado de cada lado
+        paso = TAM_TROZO_XOR
     else:
-        # Repetimos la clave hasta igualar longitud de a
-        clave = ""
-        i = 0
-        while len(clave) < len(a):
-            clave += b[i]
-            i += 1
-            if i == len(b):
-                i = 0
-
-    # XOR manual
-    resultado = ""
-    for i in range(len(a)):
-        resultado += xor_bits(a[i], clave[i])
-
-    return resultado
+        # el trozo es múltiplo de la clave: todos usan la misma clave repetida
+        paso = max(1, TAM_TROZO_XOR // len(b)) * len(b)
+        b = _expandir_clave(bytes(b), min(paso, n))
+
+    for i in range(0, n, paso):
+        trozo = a[i:i + paso]
+        clave = b[i:i + paso] if len(b) == n else b[:len(trozo)]
+        valor = int.from_bytes(trozo, "big") ^ int.from_bytes(clave, "big")
+        yield valor.to_bytes(len(trozo), "big")
 
 
 if __name__ == "__main__":